@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark: writing a chain snapshot and reopening it memory-mapped.
+
+Usage (from repo root):
+    PYTHONPATH=src python benchmarks/bench_snapshot.py [--contracts 20000000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import psutil
+
+from options_analysis import OptsAnalysis
+from options_analysis.chain import OptionsChain
+from options_analysis.snapshot import SnapshotStore
+from options_analysis.sources.base import OptionsSourceResult
+
+
+def _chain(n: int, n_expiries: int) -> OptionsChain:
+    rng = np.random.default_rng(0)
+    expiries = [f"{d:02d}/{m:02d}/2030" for m in range(1, 13) for d in range(1, 29)][:n_expiries]
+    return OptionsChain(
+        expiries,
+        rng.integers(0, n_expiries, n),
+        rng.integers(0, 2, n),
+        np.round(rng.uniform(1, 1000, n), 1),
+        rng.integers(0, 5000, n),
+        rng.integers(0, 50000, n),
+        iv=rng.uniform(0.1, 1.0, n),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=20_000_000)
+    parser.add_argument("--expiries", type=int, default=200)
+    args = parser.parse_args()
+
+    chain = _chain(args.contracts, args.expiries)
+    result = OptionsSourceResult(ticker="BENCH", dates=chain.expiries, big_dict={}, chain=chain)
+    proc = psutil.Process(os.getpid())
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        path = SnapshotStore(root).save(result)
+        size = sum(f.stat().st_size for f in path.iterdir())
+        print(f"save:  {time.perf_counter() - start:8.3f} s  ({size / 1e9:.2f} GB on disk)")
+        del chain, result
+
+        rss = proc.memory_info().rss
+        start = time.perf_counter()
+        opts = OptsAnalysis()
+        opts.BuildFromSnapshot(root, "BENCH")
+        print(f"open:  {(time.perf_counter() - start) * 1e3:8.2f} ms")
+        start = time.perf_counter()
+        opts.GetOptsDF("Both", opts.GetExpirationDates()[:2])
+        print(f"2-expiry GetOptsDF: {(time.perf_counter() - start) * 1e3:8.2f} ms")
+        print(f"RSS growth: {(proc.memory_info().rss - rss) / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
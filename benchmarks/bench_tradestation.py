@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark: single-pass TradeStation loader (full and chunked) vs the per-block loader.
+
+Usage (from repo root):
+    PYTHONPATH=src python benchmarks/bench_tradestation.py [--expiries 100] [--strikes 2000]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from generators import write_ts_export
+
+from options_analysis.schema import MISSING_TOKENS, parse_numeric
+from options_analysis.sources.base import build_source_result
+from options_analysis.sources.tradestation import _read_cells, load_tradestation_file
+
+
+def _legacy_load(path: Path) -> Any:
+    """The per-block loader before the single-pass rewrite, kept here for comparison."""
+    cells = _read_cells(path)
+    rows = ([str(x).replace(" ", "") for x in row] for row in cells)
+    header, first_row = next((i, n) for i, n in enumerate(rows) if "Strike" in n)
+    strike_cols = [i for i, name in enumerate(first_row) if name.lower() == "strike"]
+    calls_end, puts_start = strike_cols[0] + 1, strike_cols[-1]
+    body = cells[header + 1 :]
+    first_cell = pd.Series(body[:, 0], dtype=object)
+    is_label = (
+        first_cell.notna().to_numpy()
+        & np.isnan(parse_numeric(first_cell)[0])
+        & ~first_cell.astype(str).str.strip().isin(MISSING_TOKENS | {"Pos"}).to_numpy()
+    )
+    indexes = list(np.flatnonzero(is_label))
+    dates = [str(body[i, 0]).split("\t")[0].strip() for i in indexes]
+    big_dict = {}
+    for i, date in enumerate(dates):
+        end = indexes[i + 1] if i + 1 < len(indexes) else len(body)
+        block = body[indexes[i] + 1 : end]
+        calls = pd.DataFrame(block[:, :calls_end], columns=first_row[:calls_end])
+        puts = pd.DataFrame(block[:, puts_start:], columns=first_row[puts_start:])
+        big_dict[date] = {
+            "calls": calls.drop("Pos", axis=1, errors="ignore"),
+            "puts": puts.drop("Pos", axis=1, errors="ignore"),
+        }
+    return build_source_result(path.stem, dates, big_dict)
+
+
+def _measure(fn: Callable[[], Any]) -> tuple[Any, float, float]:
+    """
+    Result, seconds and peak traced allocation (MB). Timing and tracing are separate runs
+    because tracemalloc slows the allocation-heavy legacy path far more than the others.
+    """
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--expiries", type=int, default=100)
+    parser.add_argument("--strikes", type=int, default=2000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.csv"
+        write_ts_export(path, args.expiries, args.strikes)
+        size = path.stat().st_size / 1e6
+        print(f"Export: {args.expiries} expiries x {args.strikes} strikes, {size:.1f} MB")
+        runs = {
+            "per-block (legacy)": lambda: _legacy_load(path),
+            "single pass": lambda: load_tradestation_file(path),
+            f"chunked ({args.chunksize:,} rows)": lambda: load_tradestation_file(
+                path, chunksize=args.chunksize
+            ),
+        }
+        chains = []
+        for name, fn in runs.items():
+            result, seconds, peak = _measure(fn)
+            chains.append(result["chain"])
+            print(f"{name:24s} {seconds:7.2f} s   peak {peak:7.1f} MB")
+        for chain in chains[1:]:
+            for column in ("expiry", "side", "strike", "volume", "open_int", "bid", "ask"):
+                np.testing.assert_array_equal(getattr(chain, column), getattr(chains[0], column))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Benchmark: fast Yahoo options-table extraction vs the BeautifulSoup parse.
+
+Runs on the saved pages in tests/fixtures/yahoo/ and checks both paths agree.
+
+Usage (from repo root):
+    PYTHONPATH=src python benchmarks/bench_yahoo_parse.py [--repeat 20]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from options_analysis.sources.yahoo_scrape import _fast_tables, _soup_tables
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "yahoo"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    def best(fn: object, content: bytes) -> float:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn(content)  # type: ignore[operator]
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    for path in sorted(FIXTURES.glob("*.html")):
+        content = path.read_bytes()
+        fast = _fast_tables(content)
+        soup = _soup_tables(content)
+        if fast is None:
+            print(f"{path.name:28s} {len(content) / 1e3:7.1f} kB  fast path declined (fallback)")
+            continue
+        for side in ("calls", "puts"):
+            pd.testing.assert_frame_equal(fast[side], soup[side])
+        t_fast = best(_fast_tables, content)
+        t_soup = best(_soup_tables, content)
+        rows = sum(len(df) for df in fast.values())
+        print(
+            f"{path.name:28s} {len(content) / 1e3:7.1f} kB  {rows} rows  "
+            f"soup {t_soup * 1e3:7.2f} ms  fast {t_fast * 1e3:6.2f} ms  "
+            f"({t_soup / t_fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
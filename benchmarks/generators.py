@@ -0,0 +1,102 @@
+"""Deterministic synthetic inputs for the benchmarks: option chains, TradeStation exports and
+intraday bar files. The same arguments and seed always produce the same data."""
+
+import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TS_HEADER = "Pos,Bid,Ask,Volume,Open Int,Strike,Strike,Bid,Ask,Volume,Open Int,Pos"
+BAR_COLUMNS = ["Date", "Time", "Open", "High", "Low", "Close", "Vol"]
+FIRST_EXPIRY = datetime.date(2030, 1, 4)
+FIRST_SESSION = datetime.date(2030, 1, 2)
+
+
+def strike_grid(n_strikes: int) -> np.ndarray:
+    """The strike grid every synthetic expiry lists: 50.0, 50.5, ..."""
+    return np.round(np.linspace(50.0, 50.0 + 0.5 * (n_strikes - 1), n_strikes), 2)
+
+
+def expiry_labels(n_expiries: int) -> list[str]:
+    """Weekly expirations as dd/mm/yyyy labels, so date-aware paths see real expiries."""
+    return [
+        (FIRST_EXPIRY + datetime.timedelta(weeks=i)).strftime("%d/%m/%Y") for i in range(n_expiries)
+    ]
+
+
+def synthetic_big_dict(
+    n_expiries: int, n_strikes: int, seed: int = 0
+) -> tuple[list[str], dict[str, dict[str, pd.DataFrame]]]:
+    """Chain of ``n_expiries`` x ``n_strikes`` calls and puts with random volume / OI."""
+    rng = np.random.default_rng(seed)
+    strikes = strike_grid(n_strikes)
+    dates = expiry_labels(n_expiries)
+    big_dict: dict[str, dict[str, pd.DataFrame]] = {}
+    for date in dates:
+        big_dict[date] = {
+            side: pd.DataFrame(
+                {
+                    "Strike": strikes,
+                    "Volume": rng.integers(0, 5_000, n_strikes),
+                    "OpenInt": rng.integers(0, 20_000, n_strikes),
+                }
+            )
+            for side in ("calls", "puts")
+        }
+    return dates, big_dict
+
+
+def write_ts_export(path: Path, n_expiries: int, n_strikes: int, seed: int = 0) -> None:
+    """TradeStation options export: one labelled block per expiry, same strike grid each."""
+    rng = np.random.default_rng(seed)
+    strikes = strike_grid(n_strikes)
+    with path.open("w") as f:
+        f.write(TS_HEADER + "\n")
+        for i in range(n_expiries):
+            f.write(f"Exp {i:04d}\t({i} days)" + "," * 11 + "\n")
+            bid = np.round(rng.uniform(0, 20, (n_strikes, 2)), 2)
+            vol = rng.integers(0, 5_000, (n_strikes, 2))
+            oi = rng.integers(0, 20_000, (n_strikes, 2))
+            rows = [
+                f",{bid[j, 0]},{bid[j, 0] + 0.05:.2f},{vol[j, 0]},{oi[j, 0]},{k},{k},"
+                f"{bid[j, 1]},{bid[j, 1] + 0.05:.2f},{vol[j, 1]},{oi[j, 1]},"
+                for j, k in enumerate(strikes)
+            ]
+            f.write("\n".join(rows) + "\n")
+
+
+def intraday_bars(
+    n_days: int, n_bars: int, seed: int = 0, start_price: float = 100.0
+) -> pd.DataFrame:
+    """
+    One-minute bars (TradeStation chart export layout, mm/dd/yyyy dates) over ``n_days``
+    weekdays of ``n_bars`` bars each, from a random walk. Prices and volume are never zero,
+    since StockData drops rows with a zero in any column.
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(FIRST_SESSION, periods=n_days)
+    times = pd.date_range("09:30", periods=n_bars, freq="1min").strftime("%H:%M")
+    n = n_days * n_bars
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, 5e-4, n)))
+    opens = np.concatenate([[start_price], close[:-1]])
+    spread = np.abs(rng.normal(0.0, 5e-4, n)) * close
+    return pd.DataFrame(
+        {
+            "Date": np.repeat(days.strftime("%m/%d/%Y"), n_bars),
+            "Time": np.tile(times, n_days),
+            "Open": np.round(opens, 2),
+            "High": np.round(np.maximum(opens, close) + spread, 2),
+            "Low": np.round(np.minimum(opens, close) - spread, 2),
+            "Close": np.round(close, 2),
+            "Vol": rng.integers(1, 50_000, n),
+        },
+        columns=BAR_COLUMNS,
+    )
+
+
+def write_intraday_bars(folder: Path, ticker: str, n_days: int, n_bars: int, seed: int = 0) -> Path:
+    """Write ``intraday_bars`` as ``<folder>/<ticker>_1min.csv`` (the StockData file layout)."""
+    path = folder / f"{ticker}_1min.csv"
+    intraday_bars(n_days, n_bars, seed=seed).to_csv(path, index=False)
+    return path
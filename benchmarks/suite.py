@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Benchmark suite: hot paths at several input sizes, with a JSON history and regression check.
+
+Each case times its hot path (best of --repeat runs) on deterministic synthetic inputs from
+generators.py and records the peak traced allocation in a separate run. Results are
+appended to the history file and compared with the latest earlier run on the same machine;
+a case slower or bigger than that by more than --threshold is flagged and the suite exits
+with status 1.
+
+Usage (from repo root):
+    PYTHONPATH=src python benchmarks/suite.py [--sizes small,medium,large] [--cases get_opts_df]
+        [--repeat 3] [--threshold 0.2] [--history benchmarks/history.json] [--no-save]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from generators import synthetic_big_dict, write_intraday_bars, write_ts_export
+
+from options_analysis import OptsAnalysis
+from options_analysis.core import Values
+from options_analysis.sources.tradestation import load_tradestation_file
+from stock_data import StockData
+
+HISTORY = Path(__file__).resolve().parent / "history.json"
+SIZES = ("small", "medium", "large")
+# Changes below these are noise whatever the ratio (tiny cases at small sizes)
+NOISE_SECONDS = 1e-3
+NOISE_MB = 1.0
+
+Params = dict[str, int]
+Setup = Callable[[Path, Params], Callable[[], Any]]
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    sizes: dict[str, Params]
+    setup: Setup  # builds the inputs (untimed) and returns the timed call
+
+
+def _loaded(params: Params) -> OptsAnalysis:
+    dates, big_dict = synthetic_big_dict(params["expiries"], params["strikes"])
+    opts = OptsAnalysis()
+    opts.load_from_source({"ticker": "BENCH", "dates": dates, "big_dict": big_dict})
+    return opts
+
+
+def _uncached(opts: OptsAnalysis) -> None:
+    """Drop the result cache and the prefix-sum index, so the next query aggregates."""
+    opts.ClearCache()
+    opts._prefix = None
+
+
+def _get_opts_df(_: Path, params: Params) -> Callable[[], Any]:
+    opts = _loaded(params)
+    dates = opts.GetExpirationDates()
+
+    def run() -> Any:
+        _uncached(opts)
+        return opts.GetOptsDF(Values.Both, dates=dates)
+
+    return run
+
+
+def _get_opts_df_indexed(_: Path, params: Params) -> Callable[[], Any]:
+    opts = _loaded(params)
+    dates = opts.GetExpirationDates()
+    opts.GetPrefixIndex()
+
+    def run() -> Any:
+        # The prefix index outlives the cache: a query is two rows of the index
+        opts.ClearCache()
+        return opts.GetOptsDF(Values.Both, dates=dates)
+
+    return run
+
+
+def _plot_timeline(_: Path, params: Params) -> Callable[[], Any]:
+    import plotly.graph_objects as go
+
+    opts = _loaded(params)
+
+    def run() -> None:
+        _uncached(opts)
+        # Everything but rendering: stats, figure build; show() would open a browser
+        with mock.patch.object(go.Figure, "show"):
+            opts.PlotTimelineWithErrors(Values.Both)
+
+    return run
+
+
+def _load_tradestation(folder: Path, params: Params) -> Callable[[], Any]:
+    path = folder / "bench.csv"
+    write_ts_export(path, params["expiries"], params["strikes"])
+    return lambda: load_tradestation_file(path)
+
+
+def _write_bars(folder: Path, params: Params) -> None:
+    write_intraday_bars(folder, "BENCH", params["days"], params["bars"], seed=0)
+    write_intraday_bars(folder, "REF", params["days"], params["bars"], seed=1)
+
+
+def _stock_data_load(folder: Path, params: Params) -> Callable[[], Any]:
+    _write_bars(folder, params)
+    return lambda: StockData("BENCH", "REF", data_dir=folder)
+
+
+def _correlation(folder: Path, params: Params) -> Callable[[], Any]:
+    _write_bars(folder, params)
+    data = StockData("BENCH", "REF", data_dir=folder)
+
+    def run() -> Any:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return data.correlation_with_ref(date_analysis=False, plot=False)
+
+    return run
+
+
+CHAIN_SIZES = {
+    "small": {"expiries": 5, "strikes": 200},
+    "medium": {"expiries": 25, "strikes": 1000},
+    "large": {"expiries": 100, "strikes": 2000},
+}
+BAR_SIZES = {
+    "small": {"days": 20, "bars": 390},
+    "medium": {"days": 120, "bars": 390},
+    "large": {"days": 500, "bars": 390},
+}
+CASES = {
+    case.name: case
+    for case in (
+        Case("get_opts_df", CHAIN_SIZES, _get_opts_df),
+        Case("get_opts_df_indexed", CHAIN_SIZES, _get_opts_df_indexed),
+        Case("plot_timeline", CHAIN_SIZES, _plot_timeline),
+        Case("load_tradestation", CHAIN_SIZES, _load_tradestation),
+        Case("stock_data_load", BAR_SIZES, _stock_data_load),
+        Case("correlation_with_ref", BAR_SIZES, _correlation),
+    )
+}
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Best and median seconds over ``repeat`` runs, then peak traced MB in one more run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "peak_mb": peak,
+    }
+
+
+def run_case(case: Case, size: str, repeat: int) -> dict[str, Any]:
+    params = case.sizes[size]
+    with tempfile.TemporaryDirectory() as tmp:
+        fn = case.setup(Path(tmp), params)
+        return {"params": params, **measure(fn, repeat)}
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    history: list[dict[str, Any]] = json.loads(path.read_text(encoding="utf-8"))
+    return history
+
+
+def baseline(history: list[dict[str, Any]], machine: str, key: str) -> dict[str, Any] | None:
+    """The latest earlier result for ``key`` on this machine, with the same parameters."""
+    for run in reversed(history):
+        if run.get("machine") == machine and key in run.get("results", {}):
+            result: dict[str, Any] = run["results"][key]
+            return result
+    return None
+
+
+def regressions(result: dict[str, Any], base: dict[str, Any] | None, threshold: float) -> list[str]:
+    """Metrics of ``result`` worse than ``base`` by more than ``threshold`` (and the noise floor)."""
+    if base is None or base.get("params") != result["params"]:
+        return []
+    found = []
+    for metric, noise in (("seconds", NOISE_SECONDS), ("peak_mb", NOISE_MB)):
+        old, new = base[metric], result[metric]
+        if new > old * (1 + threshold) and new - old > noise:
+            found.append(f"{metric} {old:.4g} -> {new:.4g} (+{(new / old - 1) * 100:.0f}%)")
+    return found
+
+
+def _commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return out.stdout.strip()
+
+
+def _names(value: str, valid: tuple[str, ...] | list[str], what: str) -> list[str]:
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [n for n in names if n not in valid]
+    if unknown:
+        raise SystemExit(f"Unknown {what}: {', '.join(unknown)}; available: {', '.join(valid)}")
+    return names
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated case names")
+    parser.add_argument(
+        "--sizes", default="small,medium", help="comma-separated: " + ", ".join(SIZES)
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case and size")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)"
+    )
+    parser.add_argument("--history", type=Path, default=HISTORY)
+    parser.add_argument("--no-save", action="store_true", help="do not append to the history")
+    args = parser.parse_args()
+    cases = _names(args.cases, list(CASES), "cases")
+    sizes = _names(args.sizes, SIZES, "sizes")
+
+    history = load_history(args.history)
+    machine = f"{platform.node()}/{platform.machine()}/py{platform.python_version()}"
+    results: dict[str, Any] = {}
+    flagged = 0
+    print(f"{'case':34s} {'best':>10s} {'median':>10s} {'peak':>10s}")
+    for name in cases:
+        for size in sizes:
+            key = f"{name}[{size}]"
+            result = run_case(CASES[name], size, args.repeat)
+            results[key] = result
+            worse = regressions(result, baseline(history, machine, key), args.threshold)
+            flagged += bool(worse)
+            print(
+                f"{key:34s} {result['seconds'] * 1e3:8.1f} ms {result['median_seconds'] * 1e3:7.1f} ms"
+                f" {result['peak_mb']:7.1f} MB"
+                + ("   REGRESSION: " + "; ".join(worse) if worse else "")
+            )
+
+    if not args.no_save:
+        history.append(
+            {
+                "timestamp": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+                "commit": _commit(),
+                "machine": machine,
+                "repeat": args.repeat,
+                "results": results,
+            }
+        )
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        args.history.write_text(json.dumps(history, indent=1) + "\n", encoding="utf-8")
+        print(f"Appended to {args.history}")
+    if flagged:
+        print(f"{flagged} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,8 @@ from options_analysis import OptsAnalysis
 
 def main() -> None:
     opts = OptsAnalysis()
-    # Prefer yfinance (free, stable API)
-    opts.BuildFromYFinance("PLTR")
+    # Prefer yfinance (free, stable API); lazy: only the plotted expiry is downloaded
+    opts.BuildFromYFinance("PLTR", lazy=True)
     opts.PrintExpirationDates()
     exp_dates = opts.GetExpirationDates()
     if exp_dates:
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Example: summarize options for the CBOE weeklys universe in parallel (yfinance)."""
+
+import argparse
+from pathlib import Path
+
+from options_analysis.batch import read_symbols, run_batch
+
+
+def main() -> None:
+    data_dir = Path(__file__).resolve().parent.parent / "data"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", default=str(data_dir / "cboe_symbol_dir_weeklys.csv"))
+    parser.add_argument("--source", default="yfinance", choices=["yfinance", "web"])
+    parser.add_argument("--limit", type=int, default=None, help="only the first N symbols")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds per ticker")
+    parser.add_argument("--out", default=None, help="write the summary to this CSV")
+    parser.add_argument("--report", default=None, help="write strike histograms to this dir")
+    parser.add_argument("--combined", action="store_true", help="one report page for all")
+    args = parser.parse_args()
+
+    symbols = read_symbols(args.symbols)[: args.limit]
+    df = run_batch(
+        symbols,
+        source=args.source,
+        max_workers=args.workers,
+        timeout=args.timeout,
+        report_dir=args.report,
+        combined_report=args.combined,
+    )
+    print(df.to_string(index=False))
+    if args.out:
+        df.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ import requests
 from bs4 import BeautifulSoup
 from dateutil import parser as dateutil_parser
 
+from shared.http_cache import HttpCache, PageResponse, default_cache
+
 
 @dataclass
 class NewsItem:
@@ -18,14 +20,23 @@ class NewsItem:
 
 
 class FinvizScraper:
-    """Scrape finviz.com quote page for a ticker (params + news)."""
+    """
+    Scrape finviz.com quote page for a ticker (params + news). The page goes through the
+    HTTP ``cache`` (default: shared.http_cache.default_cache()).
+    """
 
-    def __init__(self, ticker: str) -> None:
+    def __init__(self, ticker: str, cache: HttpCache | None = None) -> None:
         if not ticker:
             raise ValueError("No ticker given")
         self.ticker = str(ticker).strip().upper().lstrip("0")
         url = f"https://finviz.com/quote.ashx?t={self.ticker}"
-        resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        headers = {"User-Agent": "Mozilla/5.0"}
+        cache = cache if cache is not None else default_cache()
+        resp: PageResponse
+        if cache is None:
+            resp = requests.get(url, headers=headers)
+        else:
+            resp = cache.get(url, "finviz", headers=headers)
         if not resp.ok:
             raise RuntimeError(f"Response Error - {resp.reason}")
         soup = BeautifulSoup(resp.content, "html.parser")
@@ -0,0 +1,38 @@
+"""Vectorized strike aggregation: reduce calls/puts by strike in a single pass."""
+
+import numpy as np
+import pandas as pd
+
+AGG_COLUMNS = ["calls", "puts", "all"]
+
+
+def aggregate_by_strike(
+    call_strikes: np.ndarray,
+    call_values: np.ndarray,
+    put_strikes: np.ndarray,
+    put_values: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Sum call and put values per strike.
+
+    Inputs are flat arrays covering every selected expiration (already concatenated).
+    Strikes are de-duplicated once with np.unique and each side is reduced with a
+    single np.bincount. Returns a frame indexed by sorted strike with calls/puts/all.
+    """
+    call_strikes = np.asarray(call_strikes, dtype=float)
+    put_strikes = np.asarray(put_strikes, dtype=float)
+    n_calls = call_strikes.size
+    if n_calls + put_strikes.size == 0:
+        return pd.DataFrame(columns=AGG_COLUMNS)
+    strikes, inverse = np.unique(np.concatenate([call_strikes, put_strikes]), return_inverse=True)
+    n = strikes.size
+    calls = np.bincount(
+        inverse[:n_calls], weights=np.asarray(call_values, dtype=float), minlength=n
+    )
+    puts = np.bincount(inverse[n_calls:], weights=np.asarray(put_values, dtype=float), minlength=n)
+    calls_i = np.rint(calls).astype(np.int64)
+    puts_i = np.rint(puts).astype(np.int64)
+    return pd.DataFrame(
+        {"calls": calls_i, "puts": puts_i, "all": calls_i + puts_i},
+        index=pd.Index(strikes, dtype=float),
+    )
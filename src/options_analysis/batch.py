@@ -0,0 +1,237 @@
+"""Batch analysis over many tickers with a bounded process pool."""
+
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from options_analysis.core import OptsAnalysis, Values, _normalize_val
+from options_analysis.report import StrikeStats, write_stats_reports
+from options_analysis.sources.base import OptionsSourceResult
+from options_analysis.sources.yahoo_scrape import load_yahoo_scrape
+from options_analysis.sources.yfinance_source import load_yfinance
+
+Loader = Callable[[str], OptionsSourceResult]
+
+# How often to check whether a submitted ticker has been picked up by a worker (seconds)
+_START_POLL = 0.05
+
+# Row key carrying the ticker's StrikeStats back from the worker when a report is requested
+STATS_KEY = "strikeStats"
+
+SUMMARY_COLUMNS = [
+    "ticker",
+    "status",
+    "error",
+    "seconds",
+    "expiries",
+    "contracts",
+    "calls",
+    "puts",
+    "all",
+    "putCallRatio",
+    "callsMean",
+    "callsStd",
+    "putsMean",
+    "putsStd",
+    "allMean",
+    "allStd",
+]
+
+
+def read_symbols(path: str | Path) -> list[str]:
+    """
+    Read ticker symbols from a CSV (e.g. data/cboe_symbol_dir_weeklys.csv, using the column
+    whose name contains 'symbol') or from a plain list with one symbol per line.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        df = pd.read_csv(path, skipinitialspace=True, dtype=str)
+        cols = [c for c in df.columns if "symbol" in str(c).lower()]
+        col = cols[0] if cols else df.columns[0]
+        symbols = df[col].dropna().str.strip()
+    else:
+        symbols = pd.Series(path.read_text().split())
+    return [s for s in dict.fromkeys(symbols.str.upper()) if s]
+
+
+def _resolve_loader(source: str | Loader) -> Loader:
+    if callable(source):
+        return source
+    if source == "yfinance":
+        return load_yfinance
+    if source == "web":
+        return partial(load_yahoo_scrape, verbose=False)
+    raise ValueError("source must be 'yfinance', 'web' or a callable ticker -> result")
+
+
+def summarize_ticker(opts: OptsAnalysis, val: Values | str = Values.Both) -> dict[str, Any]:
+    """Chain-wide totals, put/call ratio and weighted strike mean/std for a loaded ticker."""
+    v = _normalize_val(val) or Values.Both
+    dates = opts.GetExpirationDates()
+    row: dict[str, Any] = {
+        "ticker": opts.Ticker,
+        "expiries": len(dates),
+        "contracts": len(opts.Chain),
+    }
+    stats = opts.GetStrikeStats(v, dates=dates) if dates else None
+    for side in ("calls", "puts", "all"):
+        s = stats.sides[side] if stats is not None else None
+        row[side] = s.total if s is not None else 0
+        row[f"{side}Mean"] = s.mean if s is not None else np.nan
+        row[f"{side}Std"] = s.std if s is not None else np.nan
+    row["putCallRatio"] = row["puts"] / row["calls"] if row["calls"] else np.nan
+    if stats is not None:
+        row[STATS_KEY] = stats
+    return row
+
+
+def _terminate(pool: ProcessPoolExecutor) -> None:
+    """Shut a pool down without waiting for its tasks, killing its worker processes."""
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    for proc in processes:
+        proc.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proc in processes:
+        proc.join(timeout=5)
+
+
+def _analyze_ticker(loader: Loader, ticker: str, val: Values, keep_stats: bool) -> dict[str, Any]:
+    """Worker entry point: fetch/load one ticker and summarize it."""
+    opts = OptsAnalysis(cache_size=0)
+    opts.load_from_source(loader(ticker))
+    row = summarize_ticker(opts, val)
+    if not keep_stats:
+        row.pop(STATS_KEY, None)
+    return row
+
+
+def run_batch(
+    symbols: Iterable[str],
+    source: str | Loader = "yfinance",
+    val: Values | str = Values.Both,
+    max_workers: int = 4,
+    timeout: float | None = 120.0,
+    verbose: bool = True,
+    report_dir: str | Path | None = None,
+    combined_report: bool = False,
+) -> pd.DataFrame:
+    """
+    Analyze many tickers in parallel processes and return one summary row per ticker.
+
+    At most ``max_workers`` tickers run at once. Each ticker has ``timeout`` seconds from
+    the moment a worker starts it; a ticker that fails or times out gets an error row and
+    does not affect the rest of the batch. (A timed-out worker cannot be interrupted, so
+    the pool's workers are killed and the other tickers in flight rerun on a fresh pool.)
+    Rows keep the input order. Throughput is stored in ``df.attrs["tickers_per_minute"]``.
+
+    No figures are built unless ``report_dir`` is given; then the strike histograms of all
+    successful tickers are written there as static HTML (see report.write_stats_reports),
+    one page per ticker or a single page with ``combined_report=True``.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    v = _normalize_val(val)
+    if v is None:
+        raise ValueError("Value must be Volume, OpenInt, or Both")
+    loader = _resolve_loader(source)
+    tickers = list(dict.fromkeys(str(s).strip().upper() for s in symbols if str(s).strip()))
+    results: dict[str, dict[str, Any]] = {}
+    strike_stats: dict[str, StrikeStats] = {}
+    queue = list(reversed(tickers))
+    start = time.perf_counter()
+
+    def record(
+        ticker: str, started: float, status: str, error: str = "", row: dict[str, Any] | None = None
+    ) -> None:
+        results[ticker] = {
+            **(row or {}),
+            "ticker": ticker,
+            "status": status,
+            "error": error,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        stats = results[ticker].pop(STATS_KEY, None)
+        if stats is not None:
+            strike_stats[ticker] = stats
+        if verbose:
+            done = len(results)
+            note = f" ({error})" if error else ""
+            print(f"[{done}/{len(tickers)}] {ticker}: {status}{note}")
+
+    pool = ProcessPoolExecutor(max_workers=max_workers)
+    # future -> (ticker, submit time); started: future -> when it was first seen running
+    running: dict[Future[dict[str, Any]], tuple[str, float]] = {}
+    started: dict[Future[dict[str, Any]], float] = {}
+    try:
+        while queue or running:
+            while queue and len(running) < max_workers:
+                ticker = queue.pop()
+                fut = pool.submit(_analyze_ticker, loader, ticker, v, report_dir is not None)
+                running[fut] = (ticker, time.perf_counter())
+            now = time.perf_counter()
+            for fut in running:
+                if fut not in started and fut.running():
+                    started[fut] = now
+            wait_for = None
+            if timeout:
+                deadlines = [started[f] + timeout - now for f in running if f in started]
+                if len(deadlines) < len(running):
+                    deadlines.append(_START_POLL)  # not picked up by a worker yet
+                wait_for = max(0.0, min(deadlines))
+            done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+            broken = False
+            for fut in done:
+                ticker, submitted = running.pop(fut)
+                began = started.pop(fut, submitted)
+                try:
+                    record(ticker, began, "ok", row=fut.result())
+                except BrokenProcessPool as e:
+                    broken = True
+                    record(ticker, began, "error", f"worker crashed: {e}")
+                except Exception as e:
+                    record(ticker, began, "error", f"{type(e).__name__}: {e}")
+            now = time.perf_counter()
+            expired = [
+                f for f in running if timeout and f in started and now - started[f] >= timeout
+            ]
+            for fut in expired:
+                ticker, _ = running.pop(fut)
+                record(ticker, started.pop(fut), "timeout", f"no result after {timeout:g}s")
+            if broken or expired:
+                # A crashed worker poisons the pool and a hung one cannot be interrupted:
+                # kill the workers and give the tickers still in flight a fresh pool
+                queue.extend(reversed([ticker for ticker, _ in running.values()]))
+                running.clear()
+                started.clear()
+                _terminate(pool)
+                pool = ProcessPoolExecutor(max_workers=max_workers)
+    finally:
+        if running:
+            _terminate(pool)
+        else:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    df = pd.DataFrame([results[t] for t in tickers if t in results], columns=SUMMARY_COLUMNS)
+    rate = 60.0 * len(df) / elapsed if elapsed > 0 else float("inf")
+    df.attrs["elapsed_seconds"] = elapsed
+    df.attrs["tickers_per_minute"] = rate
+    if report_dir is not None:
+        stats_in_order = [strike_stats[t] for t in tickers if t in strike_stats]
+        df.attrs["report_files"] = [
+            str(p) for p in write_stats_reports(stats_in_order, report_dir, combined_report)
+        ]
+    if verbose:
+        ok = int((df["status"] == "ok").sum())
+        print(
+            f"Batch done: {ok}/{len(df)} ok in {elapsed:.1f}s "
+            f"({rate:.1f} tickers/minute, {max_workers} workers)"
+        )
+    return df
@@ -0,0 +1,271 @@
+"""Columnar options chain: one contiguous table of contracts backed by typed NumPy arrays."""
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from options_analysis.schema import COLUMN_ALIASES, parse_numeric
+
+CALL = 0
+PUT = 1
+SIDES = ("calls", "puts")
+
+# Optional per-contract columns: attribute name -> canonical schema column
+OPTIONAL_COLUMNS = {"bid": "Bid", "ask": "Ask", "iv": "ImpVol"}
+# Every per-contract array a chain stores, in a fixed order
+COLUMNS = ("expiry", "side", "strike", "volume", "open_int", *OPTIONAL_COLUMNS)
+# Compact (float32) strikes are only used for strikes that are whole cents
+STRIKE_DECIMALS = 2
+
+
+def _column(frame: pd.DataFrame, name: str) -> NDArray[np.float64] | None:
+    """A canonical column as float64 (None if absent); sources already deliver it typed."""
+    for alias in COLUMN_ALIASES[name]:
+        if alias in frame.columns:
+            col = frame[alias]
+            if col.dtype.kind in "iufb":
+                return np.asarray(col.to_numpy(dtype=np.float64, na_value=np.nan))
+            # Hand-built frames that bypassed a source's normalization
+            return np.asarray(parse_numeric(col)[0], dtype=np.float64)
+    return None
+
+
+def _count_column(frame: pd.DataFrame, name: str) -> NDArray[np.int64]:
+    values = _column(frame, name)
+    if values is None:
+        return np.zeros(len(frame), dtype=np.int64)
+    return np.nan_to_num(values, nan=0.0).round().astype(np.int64)
+
+
+class OptionsChain:
+    """
+    Options chain stored as parallel arrays, one row per contract.
+
+    Rows are sorted by (expiry code, side, strike), so each expiration is one contiguous
+    slice given by ``expiry_offsets``; ``strike_order`` is the row permutation sorting the
+    whole table by strike. Expiry codes index into ``expiries`` (labels in source order).
+    """
+
+    expiries: list[str]
+    expiry: NDArray[np.int32]
+    side: NDArray[np.int8]
+    strike: NDArray[np.floating[Any]]  # float64, or float32 in compact chains
+    volume: NDArray[np.integer[Any]]
+    open_int: NDArray[np.integer[Any]]
+    bid: NDArray[np.floating[Any]] | None
+    ask: NDArray[np.floating[Any]] | None
+    iv: NDArray[np.floating[Any]] | None
+    expiry_offsets: NDArray[np.int64]
+
+    def __init__(
+        self,
+        expiries: list[str],
+        expiry: np.ndarray,
+        side: np.ndarray,
+        strike: np.ndarray,
+        volume: np.ndarray,
+        open_int: np.ndarray,
+        bid: np.ndarray | None = None,
+        ask: np.ndarray | None = None,
+        iv: np.ndarray | None = None,
+    ) -> None:
+        self.expiries = list(expiries)
+        expiry = np.asarray(expiry, dtype=np.int32)
+        side = np.asarray(side, dtype=np.int8)
+        strike = np.asarray(strike, dtype=np.float64)
+        order = np.lexsort((strike, side, expiry))
+        self.expiry = expiry[order]
+        self.side = side[order]
+        self.strike = strike[order]
+        self.volume = np.asarray(volume, dtype=np.int64)[order]
+        self.open_int = np.asarray(open_int, dtype=np.int64)[order]
+        self.bid = None if bid is None else np.asarray(bid, dtype=np.float64)[order]
+        self.ask = None if ask is None else np.asarray(ask, dtype=np.float64)[order]
+        self.iv = None if iv is None else np.asarray(iv, dtype=np.float64)[order]
+        self._index(None)
+
+    def _index(self, expiry_offsets: np.ndarray | None) -> None:
+        if expiry_offsets is None:
+            expiry_offsets = np.searchsorted(
+                self.expiry, np.arange(len(self.expiries) + 1, dtype=np.int32)
+            )
+        self.expiry_offsets = np.asarray(expiry_offsets, dtype=np.int64)
+        self._codes = {label: code for code, label in enumerate(self.expiries)}
+        self._strike_order: np.ndarray | None = None
+
+    @classmethod
+    def from_sorted(
+        cls,
+        expiries: list[str],
+        columns: Mapping[str, np.ndarray | None],
+        expiry_offsets: np.ndarray | None = None,
+    ) -> "OptionsChain":
+        """
+        Wrap arrays that are already in chain order without sorting or copying them, e.g.
+        memory-mapped columns of a snapshot. ``columns`` holds one array per name in COLUMNS
+        (optional ones may be missing or None).
+        """
+        chain = cls.__new__(cls)
+        chain.expiries = list(expiries)
+        for name in COLUMNS:
+            setattr(chain, name, columns.get(name))
+        chain._index(expiry_offsets)
+        return chain
+
+    @property
+    def mapped(self) -> bool:
+        """True if the columns are memory-mapped from disk rather than held in RAM."""
+        return isinstance(self.strike, np.memmap)
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """The stored per-contract arrays by name (optional ones only when present)."""
+        return {name: getattr(self, name) for name in COLUMNS if getattr(self, name) is not None}
+
+    @classmethod
+    def empty(cls, expiries: list[str] | None = None) -> "OptionsChain":
+        z = np.zeros(0)
+        return cls(expiries or [], z, z, z, z, z)
+
+    @classmethod
+    def from_big_dict(
+        cls,
+        dates: list[str],
+        big_dict: Mapping[str, Mapping[str, pd.DataFrame]],
+    ) -> "OptionsChain":
+        """Build from the legacy date -> {calls, puts} layout; missing dates stay empty."""
+        cols: dict[str, list[np.ndarray]] = {
+            k: [] for k in ("expiry", "side", "strike", "volume", "open_int")
+        }
+        optional: dict[str, list[np.ndarray | None]] = {k: [] for k in OPTIONAL_COLUMNS}
+        for code, date in enumerate(dates):
+            if date not in big_dict:
+                continue
+            block = big_dict[date]
+            for side, name in enumerate(SIDES):
+                frame = block.get(name)
+                if frame is None or frame.empty:
+                    continue
+                strike = _column(frame, "Strike")
+                if strike is None:
+                    continue
+                valid = ~np.isnan(strike)  # rows without a strike are not contracts
+                n = int(valid.sum())
+                cols["expiry"].append(np.full(n, code, dtype=np.int32))
+                cols["side"].append(np.full(n, side, dtype=np.int8))
+                cols["strike"].append(strike[valid])
+                cols["volume"].append(_count_column(frame, "Volume")[valid])
+                cols["open_int"].append(_count_column(frame, "OpenInt")[valid])
+                for key, name in OPTIONAL_COLUMNS.items():
+                    arr = _column(frame, name)
+                    optional[key].append(None if arr is None else arr[valid])
+        if not cols["expiry"]:
+            return cls.empty(dates)
+        extra: dict[str, np.ndarray | None] = {}
+        for key, parts in optional.items():
+            if all(p is None for p in parts):
+                extra[key] = None
+                continue
+            extra[key] = np.concatenate(
+                [
+                    p if p is not None else np.full(len(s), np.nan)
+                    for p, s in zip(parts, cols["side"], strict=True)
+                ]
+            )
+        return cls(
+            dates,
+            np.concatenate(cols["expiry"]),
+            np.concatenate(cols["side"]),
+            np.concatenate(cols["strike"]),
+            np.concatenate(cols["volume"]),
+            np.concatenate(cols["open_int"]),
+            **extra,
+        )
+
+    def __len__(self) -> int:
+        return int(self.strike.size)
+
+    def strikes(self, rows: np.ndarray | slice | None = None) -> np.ndarray:
+        """Strikes of the given rows (all by default) as float64, also for compact chains."""
+        strike = self.strike if rows is None else self.strike[rows]
+        if strike.dtype == np.float64:
+            return strike
+        return np.round(strike.astype(np.float64), STRIKE_DECIMALS)
+
+    @property
+    def strike_order(self) -> np.ndarray:
+        """Row permutation that sorts the whole chain by strike (stable)."""
+        if self._strike_order is None:
+            self._strike_order = np.argsort(self.strike, kind="stable")
+        return self._strike_order
+
+    def code(self, date: str) -> int | None:
+        """Expiry code for a date label, or None if the chain does not have it."""
+        return self._codes.get(date)
+
+    def expiry_slice(self, code: int) -> slice:
+        return slice(int(self.expiry_offsets[code]), int(self.expiry_offsets[code + 1]))
+
+    def rows_for(self, dates: Iterable[str]) -> np.ndarray:
+        """Row indices of every contract expiring on the given dates (unknown dates skipped)."""
+        ranges = [
+            np.arange(self.expiry_offsets[c], self.expiry_offsets[c + 1])
+            for c in (self._codes.get(d) for d in dates)
+            if c is not None
+        ]
+        if not ranges:
+            return np.zeros(0, dtype=np.intp)
+        return np.concatenate(ranges)
+
+    def block(self, date: str) -> dict[str, pd.DataFrame]:
+        """One expiration as the legacy {calls, puts} DataFrames."""
+        code = self._codes.get(date)
+        rows = self.expiry_slice(code) if code is not None else slice(0, 0)
+        side = self.side[rows]
+        out: dict[str, pd.DataFrame] = {}
+        for side_code, name in enumerate(SIDES):
+            mask = side == side_code
+            data: dict[str, np.ndarray] = {
+                "Strike": self.strikes(rows)[mask],
+                "Volume": self.volume[rows][mask],
+                "OpenInt": self.open_int[rows][mask],
+            }
+            for key, col in OPTIONAL_COLUMNS.items():
+                arr = getattr(self, key)
+                if arr is not None:
+                    data[col] = arr[rows][mask]
+            out[name] = pd.DataFrame(data)
+        return out
+
+    def to_big_dict(self) -> dict[str, dict[str, pd.DataFrame]]:
+        """Legacy date -> {calls, puts} view of the expirations that have contracts."""
+        return {
+            date: self.block(date)
+            for code, date in enumerate(self.expiries)
+            if self.expiry_offsets[code + 1] > self.expiry_offsets[code]
+        }
+
+
+class ChainBlocks(Mapping[str, dict[str, pd.DataFrame]]):
+    """Read-only date -> {calls, puts} view of a chain; a block is built only when accessed."""
+
+    def __init__(self, chain: OptionsChain) -> None:
+        self._chain = chain
+        offsets = chain.expiry_offsets
+        self._dates = [
+            d for code, d in enumerate(chain.expiries) if offsets[code + 1] > offsets[code]
+        ]
+        self._present = set(self._dates)
+
+    def __getitem__(self, date: str) -> dict[str, pd.DataFrame]:
+        if date not in self._present:
+            raise KeyError(date)
+        return self._chain.block(date)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dates)
+
+    def __len__(self) -> int:
+        return len(self._dates)
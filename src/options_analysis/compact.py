@@ -0,0 +1,87 @@
+"""Compact in-memory form of loaded chains: narrower dtypes, categoricals, no empty columns."""
+
+import numpy as np
+import pandas as pd
+
+from options_analysis.chain import STRIKE_DECIMALS, OptionsChain
+from options_analysis.schema import MISSING_TOKENS
+
+_INT32_MAX = np.iinfo(np.int32).max
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.5
+
+
+def _float32_strikes(strike: np.ndarray) -> np.ndarray:
+    """float32 strikes if every strike is restored exactly from them, else the input."""
+    narrow = strike.astype(np.float32)
+    restored = np.round(narrow.astype(np.float64), STRIKE_DECIMALS)
+    return narrow if np.array_equal(restored, strike, equal_nan=True) else strike
+
+
+def _int32(values: np.ndarray, headroom: int = 1) -> np.ndarray:
+    """int32 if ``headroom`` such values can be added without overflow, else the input."""
+    if values.size == 0 or int(np.abs(values).max()) * headroom <= _INT32_MAX:
+        return values.astype(np.int32)
+    return values
+
+
+def compact_chain(chain: OptionsChain) -> OptionsChain:
+    """
+    The chain with float32 strikes (when they are whole cents), int32 volume and open
+    interest (when volume + open interest fits) and float32 bid / ask / IV, in the same
+    row order. Memory-mapped chains are left as they are.
+    """
+    if chain.mapped:
+        return chain
+    columns: dict[str, np.ndarray | None] = dict(chain.columns())
+    columns["strike"] = _float32_strikes(chain.strike)
+    for name in ("volume", "open_int"):
+        columns[name] = _int32(getattr(chain, name), headroom=2)
+    for name in ("bid", "ask", "iv"):
+        values = getattr(chain, name)
+        columns[name] = None if values is None else values.astype(np.float32)
+    return OptionsChain.from_sorted(chain.expiries, columns, chain.expiry_offsets)
+
+
+def _is_text(col: pd.Series) -> bool:
+    return bool(col.dtype == object or pd.api.types.is_string_dtype(col.dtype))
+
+
+def _all_missing(col: pd.Series) -> bool:
+    if _is_text(col):
+        return bool(col.isna().all() or col.astype(str).str.strip().isin(MISSING_TOKENS).all())
+    return bool(col.isna().all())
+
+
+def compact_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    A calls/puts frame with columns that hold no value dropped, float64 as float32,
+    int64 as int32 where it fits and repeated text (at most CATEGORY_RATIO distinct
+    values) as categoricals. Strike stays float64 here: it is what users look rows up by.
+    """
+    out: dict[str, pd.Series] = {}
+    for name in frame.columns:
+        col = frame[name]
+        if len(frame) and _all_missing(col):
+            continue
+        if col.dtype == np.float64 and name != "Strike":
+            col = col.astype(np.float32)
+        elif col.dtype == np.int64:
+            col = pd.Series(_int32(col.to_numpy()), index=col.index, name=name)
+        elif (
+            _is_text(col) and len(col) > 1 and col.nunique(dropna=True) <= CATEGORY_RATIO * len(col)
+        ):
+            col = col.astype("category")
+        out[str(name)] = col
+    return pd.DataFrame(out, index=frame.index)
+
+
+def compact_block(block: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """A {calls, puts} block with each frame compacted (see compact_frame)."""
+    return {side: compact_frame(frame) for side, frame in block.items()}
+
+
+def frame_bytes(frame: pd.DataFrame) -> dict[str, int]:
+    """Bytes per column of a frame, text included (deep)."""
+    usage = frame.memory_usage(index=False, deep=True)
+    return {str(name): int(n) for name, n in usage.items()}
@@ -1,17 +1,40 @@
 """Core options analysis: aggregation, stats, plots."""
 
-import contextlib
-import locale
+from collections.abc import Mapping
+from datetime import date, datetime
 from enum import Enum
+from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 
-from options_analysis.sources.base import OptionsSourceResult
+from options_analysis.aggregate import aggregate_by_strike
+from options_analysis.cache import AggregationCache
+from options_analysis.chain import CALL, ChainBlocks, OptionsChain
+from options_analysis.compact import compact_block, compact_chain, frame_bytes
+from options_analysis.expiry import ExpiryIndex, parse_dte_range
+from options_analysis.exposure import gamma_flip, max_pain, strike_grid
+from options_analysis.file_cache import ParsedFileCache
+from options_analysis.greeks import chain_greeks
+from options_analysis.prefix import CumulativeIndex
+from options_analysis.report import (
+    StrikeStats,
+    expiration_label,
+    strike_figure,
+    strike_stats,
+    timeline_figure,
+)
+from options_analysis.snapshot import SnapshotStore
+from options_analysis.sources.base import OptionsSource, OptionsSourceResult
+from options_analysis.sources.fetch import FetchRecord
+from options_analysis.sources.lazy import LazyExpiries
+from options_analysis.sources.registry import create_source
 from options_analysis.sources.tradestation import load_tradestation_file
 from options_analysis.sources.yahoo_scrape import load_yahoo_scrape
 from options_analysis.sources.yfinance_source import load_yfinance
+from options_analysis.stats import segment_weighted_stats
+from shared.profiling import span
 
 
 class Values(Enum):
@@ -37,24 +60,38 @@ def _normalize_val(val: Values | str) -> Values | None:
     return None
 
 
-def _to_numeric_series(series: pd.Series) -> np.ndarray:
-    """Coerce option volume/OI column to int64 (handles commas, dashes, float strings)."""
-    if series.dtype.kind in "iu":
-        return np.asarray(series, dtype=np.int64)
-    # Use pd.to_numeric so "4.0" and "1,234" coerce to float, then int64
-    numeric = pd.to_numeric(
-        series.astype(str).str.replace(",", "").str.replace("-", "0"), errors="coerce"
-    )
-    return np.asarray(numeric.fillna(0), dtype=np.int64)
+def _chain_values(chain: OptionsChain, v: Values, rows: np.ndarray | slice) -> np.ndarray:
+    """Per-contract Volume, OpenInt or their sum for the given chain rows."""
+    if v == Values.Both:
+        return chain.volume[rows] + chain.open_int[rows]
+    if v == Values.Volume:
+        return chain.volume[rows]
+    return chain.open_int[rows]
 
 
 class OptsAnalysis:
     """Options chain analysis: load from multiple sources, aggregate by strike, plot."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = 128, compact: bool = False) -> None:
+        """
+        ``compact=True`` keeps loaded data in a smaller form: float32 strikes and prices and
+        int32 counts (see options_analysis.compact), with the source frames dropped once
+        the chain is built; BigDict then serves the chain's columns. With a lazy source the
+        fetched frames are kept but compacted (compact_frame) once they are in the chain.
+        Aggregates are unchanged; ``memory_report`` shows sizes.
+        """
+        self._compact = compact
         self._ticker = ""
         self._dates: list[str] = []
-        self._big_dict: dict[str, dict[str, pd.DataFrame]] = {}
+        self._big_dict: Mapping[str, dict[str, pd.DataFrame]] = {}
+        self._chain = OptionsChain.empty()
+        self._expiries = ExpiryIndex([])
+        self._prefix: CumulativeIndex | None = None
+        self._cache = AggregationCache(cache_size)
+        self._parse_failures: dict[str, int] = {}
+        self._lazy: LazyExpiries | None = None
+        self._compacted: set[str] = set()
+        self._fetch_log: list[FetchRecord] = []
 
     @property
     def Ticker(self) -> str:
@@ -69,20 +106,122 @@ class OptsAnalysis:
         return self._dates
 
     @property
-    def BigDict(self) -> dict[str, dict[str, pd.DataFrame]]:
+    def Expiries(self) -> ExpiryIndex:
+        """The expiration dates as a sorted date index (binary-search windows)."""
+        return self._expiries
+
+    @property
+    def BigDict(self) -> Mapping[str, dict[str, pd.DataFrame]]:
+        """Legacy date -> {calls, puts} view; derived from the chain if the source had none."""
+        if not self._big_dict and len(self._chain):
+            chain = self._chain
+            self._big_dict = ChainBlocks(chain) if self._compact else chain.to_big_dict()
         return self._big_dict
 
+    @property
+    def Chain(self) -> OptionsChain:
+        self._require(self._dates)
+        return self._chain
+
+    @property
+    def ParseFailures(self) -> dict[str, int]:
+        """Unparsable source entries per column, counted once when the source was loaded."""
+        if self._lazy is not None:
+            return dict(self._lazy.parse_failures)
+        return dict(self._parse_failures)
+
+    @property
+    def FetchLog(self) -> list[FetchRecord]:
+        """Per-expiry download records of the last web load (status, attempts, latency, error)."""
+        return list(self._fetch_log)
+
+    def _require(self, dates: list[str]) -> None:
+        """With a lazy source, fetch the dates not loaded yet and rebuild the chain."""
+        if self._lazy is None:
+            return
+        loaded = set(self._lazy.loaded)
+        missing = [d for d in dict.fromkeys(dates) if d in self._lazy and d not in loaded]
+        if not missing:
+            return
+        self._lazy.load(missing)
+        blocks = {d: self._lazy[d] for d in self._lazy.loaded}
+        chain = OptionsChain.from_big_dict(self._dates, blocks)
+        if self._compact:
+            with span("opts.compact"):
+                chain = compact_chain(chain)
+                # Folded into the chain: keep the fetched frames, but in their smaller form
+                fresh = [d for d in blocks if d not in self._compacted]
+                self._lazy.transform(fresh, compact_block)
+                self._compacted.update(fresh)
+        self._chain = chain
+        self._prefix = None  # cached results stay valid: loaded expiries never change
+
     def load_from_source(self, result: OptionsSourceResult) -> None:
-        """Load state from a source result (ticker, dates, big_dict)."""
+        """Load state from a source result (ticker, dates, big_dict and/or chain)."""
         self._ticker = result["ticker"]
         self._dates = result["dates"]
-        self._big_dict = result["big_dict"]
+        self._big_dict = result.get("big_dict") or {}
+        chain = result.get("chain")
+        # A lazy big_dict is only fetched for the dates a query actually needs
+        self._lazy = self._big_dict if isinstance(self._big_dict, LazyExpiries) else None
+        self._compacted = set()
+        if chain is None:
+            with span("opts.build_chain"):
+                chain = (
+                    OptionsChain.empty(self._dates)
+                    if self._lazy is not None
+                    else OptionsChain.from_big_dict(self._dates, self._big_dict)
+                )
+        if self._compact:
+            with span("opts.compact"):
+                chain = compact_chain(chain)
+                if self._lazy is None:
+                    # The chain holds the data; the source frames would be a second copy
+                    self._big_dict = ChainBlocks(chain)
+        self._chain = chain
+        self._expiries = ExpiryIndex(self._dates)
+        self._parse_failures = dict(result.get("parse_failures") or {})
+        self._fetch_log = list(result.get("fetch_log") or [])
+        self._prefix = None
+        self._cache.clear()
+
+    def BuildFromSource(self, source: OptionsSource | str, key: str, **kwargs: Any) -> None:
+        """
+        Load ``key`` (a ticker, or a file path for file sources) from any source: an
+        OptionsSource instance or a registered name such as "yfinance" or "yfinance+yahoo"
+        (first complete answer wins). kwargs go to the source factory when a name is given.
+        """
+        if not key:
+            raise ValueError("No ticker given")
+        if isinstance(source, str):
+            source = create_source(source, **kwargs)
+        with span("opts.fetch", source=source.name):
+            result = source.fetch(key)
+        self.load_from_source(result)
+
+    async def BuildFromSourceAsync(
+        self, source: OptionsSource | str, key: str, **kwargs: Any
+    ) -> None:
+        """BuildFromSource for async code: awaits the source's fetch_async."""
+        if not key:
+            raise ValueError("No ticker given")
+        if isinstance(source, str):
+            source = create_source(source, **kwargs)
+        self.load_from_source(await source.fetch_async(key))
 
-    def BuildFromTS(self, file_path: str | None = None) -> None:
-        """Load from TradeStation file (<ticker>.[xls, xlsx, csv])."""
+    def BuildFromTS(
+        self,
+        file_path: str | None = None,
+        chunksize: int | None = None,
+        cache: ParsedFileCache | None = None,
+    ) -> None:
+        """
+        Load from TradeStation file (<ticker>.[xls, xlsx, csv]); chunksize streams a CSV.
+        Parsed Excel files are cached (see load_tradestation_file).
+        """
         if not file_path:
             raise ValueError("No file given")
-        result = load_tradestation_file(file_path)
+        result = load_tradestation_file(file_path, chunksize=chunksize, cache=cache)
         self.load_from_source(result)
 
     def BuildFromWeb(self, ticker: str | None = None, verbose: bool = True) -> None:
@@ -92,13 +231,73 @@ class OptsAnalysis:
         result = load_yahoo_scrape(ticker, verbose=verbose)
         self.load_from_source(result)
 
-    def BuildFromYFinance(self, ticker: str | None = None) -> None:
-        """Load from yfinance (recommended free source)."""
+    def BuildFromYFinance(
+        self, ticker: str | None = None, lazy: bool = False, prefetch: int = 0
+    ) -> None:
+        """
+        Load from yfinance (recommended free source). ``lazy=True`` downloads each expiry
+        only when a query first needs it; ``prefetch`` warms the nearest N in the background.
+        """
         if not ticker:
             raise ValueError("No ticker given")
-        result = load_yfinance(ticker)
+        result = load_yfinance(ticker, lazy=lazy, prefetch=prefetch)
         self.load_from_source(result)
 
+    def BuildFromSnapshot(
+        self, root: str | Path, ticker: str, captured_at: datetime | None = None
+    ) -> None:
+        """Load a stored snapshot (latest by default); columns stay memory-mapped on disk."""
+        self.load_from_source(SnapshotStore(root).open(ticker, captured_at))
+
+    def SaveSnapshot(self, root: str | Path, captured_at: datetime | None = None) -> Path:
+        """
+        Store the loaded chain as a snapshot keyed by ticker and capture time. With a lazy
+        source every expiry not fetched yet is fetched first, so the snapshot is complete.
+        """
+        result = OptionsSourceResult(
+            ticker=self._ticker,
+            dates=self._dates,
+            big_dict={},
+            chain=self.Chain,
+            parse_failures=self.ParseFailures,
+        )
+        return SnapshotStore(root).save(result, captured_at)
+
+    def memory_report(self) -> pd.DataFrame:
+        """
+        Bytes held per expiry (rows) and per column: the chain arrays as "chain.<name>"
+        and the stored big_dict frames by column name (calls and puts added, text counted
+        deep). Views built on access (ChainBlocks) and lazy expiries not fetched yet hold
+        nothing. Includes a "total" column and a "total" row.
+        """
+        report: dict[str, dict[str, int]] = {label: {} for label in self._dates}
+        chain = self._chain
+        rows = np.diff(chain.expiry_offsets)
+        for name, values in chain.columns().items():
+            for label, n in zip(chain.expiries, rows, strict=True):
+                report[label][f"chain.{name}"] = int(n) * values.itemsize
+        stored = self._big_dict
+        if isinstance(stored, LazyExpiries):
+            stored = {d: stored[d] for d in stored.loaded}
+        elif isinstance(stored, ChainBlocks):
+            stored = {}
+        for label, block in stored.items():
+            row = report.setdefault(label, {})
+            for frame in block.values():
+                for column, n in frame_bytes(frame).items():
+                    row[column] = row.get(column, 0) + n
+        df = pd.DataFrame.from_dict(report, orient="index").fillna(0).astype(np.int64)
+        df["total"] = df.sum(axis=1)
+        df.loc["total"] = df.sum(axis=0)
+        return df
+
+    def CacheInfo(self) -> dict[str, int]:
+        """Aggregation cache hits, misses, current size and maxsize."""
+        return self._cache.info()
+
+    def ClearCache(self) -> None:
+        self._cache.clear()
+
     def GetExpirationDates(self) -> list[str]:
         return self._dates.copy()
 
@@ -118,103 +317,268 @@ class OptsAnalysis:
 
     def GetDatesStartEnd(
         self,
-        start_date: str | None = None,
-        end_date: str | None = None,
+        start_date: str | date | None = None,
+        end_date: str | date | None = None,
+        calendar: str | None = None,
     ) -> list[str]:
-        """Return list of expiration dates in [start_date, end_date]; empty if invalid."""
+        """
+        Expiration dates in [start_date, end_date], in expiry order; empty if invalid.
+        Bounds may be any expiration label or a date in any supported format (they need
+        not be expirations themselves). ``calendar`` keeps only "monthly", "weekly" or
+        "quarterly" expirations.
+        """
         if not self._dates:
             return []
-        start_date = start_date or self._dates[0]
-        if start_date not in self._dates:
+        index = self._expiries
+        if not index.complete:
+            # Some labels are not dates: positional window between two labels, as listed
+            return self._labels_between(start_date, end_date)
+        start = index.day(start_date) if start_date is not None else None
+        if start_date is not None and start is None:
+            print("Start Date given is not a date or an expiration:", start_date)
+            return []
+        end = index.day(end_date) if end_date is not None else None
+        if end_date is not None and end is None:
+            print("End Date given is not a date or an expiration:", end_date)
+            return []
+        if start is not None and end is not None and start > end:
+            print("End Date should be on or after Start Date")
+            return []
+        return index.between(start, end, calendar)
+
+    def _labels_between(
+        self, start_date: str | date | None, end_date: str | date | None
+    ) -> list[str]:
+        start_idx = 0 if start_date is None else self._expiries.position(str(start_date))
+        if start_idx is None:
             print("Start Date given not in available expiration dates:", self._dates)
             return []
-        start_idx = self._dates.index(start_date)
-        if end_date is None or self._dates.index(end_date) == len(self._dates) - 1:
+        if end_date is None:
             return self._dates[start_idx:]
-        if end_date not in self._dates:
+        end_idx = self._expiries.position(str(end_date))
+        if end_idx is None:
             print("End Date given not in available expiration dates:", self._dates)
             return []
-        end_idx = self._dates.index(end_date)
         if start_idx > end_idx:
             print("End Date should be on or after Start Date")
             return []
-        if start_idx == end_idx:
-            return self._dates[start_idx : start_idx + 1]
         return self._dates[start_idx : end_idx + 1]
 
+    def GetDatesByIndex(self, start: int = 0, stop: int | None = None) -> list[str]:
+        """Expiration dates by position, with slice semantics (e.g. stop=5 -> next 5)."""
+        return self._dates[start:stop]
+
+    def GetDatesByDTE(
+        self,
+        min_days: int | str = 0,
+        max_days: int | None = None,
+        today: date | None = None,
+        calendar: str | None = None,
+    ) -> list[str]:
+        """
+        Expiration dates whose days-to-expiry lies in [min_days, max_days], in expiry
+        order. ``min_days`` may also be a range such as "7-45 days" or "30+";
+        ``calendar`` keeps only "monthly", "weekly" or "quarterly" expirations.
+        """
+        if isinstance(min_days, str):
+            min_days, max_days = parse_dte_range(min_days)
+        return self._expiries.by_dte(min_days, max_days, today, calendar)
+
+    def GetPrefixIndex(self) -> CumulativeIndex:
+        """Cumulative volume/OI index over the loaded chain (built on first use)."""
+        if self._prefix is None:
+            self._prefix = CumulativeIndex(self._chain)
+        return self._prefix
+
     def GetOptsDF(
         self,
         val: Values | str = Values.Both,
         dates: list[str] | None = None,
     ) -> pd.DataFrame | None:
-        """Aggregate calls/puts by strike for the given dates. val = Volume, OpenInt, or Both."""
+        """
+        Aggregate calls/puts by strike for the given dates. val = Volume, OpenInt, or Both.
+        Results are memoized per (val, dates) until the next load.
+        """
         v = _normalize_val(val)
         if v is None:
             print("Value must be Volume, OpenInt, or Both")
             return None
         if not dates:
             return None
-        df = pd.DataFrame(columns=["calls", "puts", "all"])
-        for key in dates:
-            if key not in self._big_dict:
-                continue
-            block = self._big_dict[key]
-            calls_df = block["calls"]
-            puts_df = block["puts"]
-            strike_col = "Strike" if "Strike" in calls_df.columns else "strike"
-            if strike_col not in calls_df.columns:
-                continue
-            x_calls = np.asarray(calls_df[strike_col], dtype=float)
-            vol_c = (
-                calls_df["Volume"]
-                if "Volume" in calls_df.columns
-                else pd.Series(0, index=calls_df.index)
-            )
-            oi_c = (
-                calls_df["OpenInt"]
-                if "OpenInt" in calls_df.columns
-                else pd.Series(0, index=calls_df.index)
-            )
-            if v == Values.Both:
-                y_calls = _to_numeric_series(vol_c) + _to_numeric_series(oi_c)
-            elif v == Values.Volume:
-                y_calls = _to_numeric_series(vol_c)
-            else:
-                y_calls = _to_numeric_series(oi_c)
-
-            for idx, strike in enumerate(x_calls):
-                if strike in df.index:
-                    df.loc[strike, "calls"] += y_calls[idx]
-                    df.loc[strike, "all"] += y_calls[idx]
-                else:
-                    df.loc[strike] = [y_calls[idx], 0, y_calls[idx]]
-
-            x_puts = np.asarray(puts_df[strike_col], dtype=float)
-            vol_p = (
-                puts_df["Volume"]
-                if "Volume" in puts_df.columns
-                else pd.Series(0, index=puts_df.index)
+        key = (v, tuple(dates))
+        cached = self._cache.get(key)
+        if cached is None:
+            with span("opts.aggregate", expiries=len(dates)):
+                cached = self._aggregate(v, dates)
+            self._cache.put(key, cached)
+        # Callers may modify the frame they get back; keep the cached one pristine
+        return cached.copy()
+
+    def _aggregate(self, v: Values, dates: list[str]) -> pd.DataFrame:
+        self._require(dates)
+        codes = [c for c in (self._chain.code(d) for d in dates) if c is not None]
+        contiguous = len(codes) > 1 and codes == list(range(codes[0], codes[0] + len(codes)))
+        # Building the index reads every expiry; for memory-mapped snapshots only the
+        # queried expiries are touched unless it already exists
+        if contiguous and (self._prefix is not None or not self._chain.mapped):
+            # Contiguous window: two rows of the prefix-sum index instead of every expiry
+            return self.GetPrefixIndex().aggregate(
+                codes[0],
+                codes[-1] + 1,
+                volume=v != Values.OpenInt,
+                open_int=v != Values.Volume,
             )
-            oi_p = (
-                puts_df["OpenInt"]
-                if "OpenInt" in puts_df.columns
-                else pd.Series(0, index=puts_df.index)
+        rows = self._chain.rows_for(dates)
+        calls = self._chain.side[rows] == CALL
+        strikes = self._chain.strikes(rows)
+        values = _chain_values(self._chain, v, rows)
+        return aggregate_by_strike(strikes[calls], values[calls], strikes[~calls], values[~calls])
+
+    def GetGreeks(
+        self,
+        spot: float,
+        rate: float = 0.0,
+        div: float = 0.0,
+        now: datetime | None = None,
+        solve_iv: bool = False,
+    ) -> pd.DataFrame:
+        """Black-Scholes delta/gamma/vega/theta for every loaded contract (see greeks.chain_greeks)."""
+        return chain_greeks(self.Chain, spot, rate=rate, div=div, now=now, solve_iv=solve_iv)
+
+    def _window(
+        self,
+        start_date: str | None,
+        end_date: str | None,
+        dates: list[str] | None,
+        by_expiry: bool,
+    ) -> tuple[np.ndarray, np.ndarray, list[str]]:
+        """Chain rows of a date window, their segment ids and the segment labels."""
+        if dates is None:
+            dates = self.GetDatesStartEnd(start_date=start_date, end_date=end_date)
+        self._require(dates)
+        chain = self._chain
+        codes = [c for c in dict.fromkeys(chain.code(d) for d in dates) if c is not None]
+        rows = chain.rows_for([chain.expiries[c] for c in codes])
+        if not by_expiry:
+            return rows, np.zeros(rows.size, dtype=np.int64), ["window"]
+        seg_of_code = np.full(len(chain.expiries), -1, dtype=np.int64)
+        seg_of_code[codes] = np.arange(len(codes))
+        return rows, seg_of_code[chain.expiry[rows]], [chain.expiries[c] for c in codes]
+
+    def GetMaxPain(
+        self,
+        val: Values | str = Values.OpenInt,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        dates: list[str] | None = None,
+        by_expiry: bool = False,
+    ) -> float | pd.Series | None:
+        """
+        Settlement strike minimizing the total payout to option holders, weighted by val
+        (open interest by default). One value for the window, or a Series per expiration.
+        """
+        v = _normalize_val(val)
+        if v is None:
+            print("Value must be Volume, OpenInt, or Both")
+            return None
+        rows, seg, labels = self._window(start_date, end_date, dates, by_expiry)
+        if rows.size == 0:
+            return None
+        chain = self._chain
+        g_seg, g_strikes, g_calls, g_puts = strike_grid(
+            seg, chain.strikes(rows), chain.side[rows] == CALL, _chain_values(chain, v, rows)
+        )
+        _, pain = max_pain(g_seg, g_strikes, g_calls, g_puts)
+        if not by_expiry:
+            return float(pain[0])
+        return pd.Series(pain, index=[labels[i] for i in np.unique(g_seg)], name="maxPain")
+
+    def GetGEX(
+        self,
+        spot: float,
+        val: Values | str = Values.OpenInt,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        dates: list[str] | None = None,
+        by_expiry: bool = False,
+        rate: float = 0.0,
+        div: float = 0.0,
+        now: datetime | None = None,
+        contract_size: int = 100,
+    ) -> pd.DataFrame | None:
+        """
+        Dealer gamma exposure by strike: gamma * weight * contract_size * spot^2 * 1%,
+        i.e. dollars of delta per 1% move, with calls positive and puts negative (dealers
+        assumed long calls / short puts). Columns calls, puts, net; index strike, or
+        (expiry, strike) with by_expiry. Contracts without a usable IV contribute 0.
+        """
+        v = _normalize_val(val)
+        if v is None:
+            print("Value must be Volume, OpenInt, or Both")
+            return None
+        rows, seg, labels = self._window(start_date, end_date, dates, by_expiry)
+        if rows.size == 0:
+            return None
+        chain = self._chain
+        is_call = chain.side[rows] == CALL
+        gamma = chain_greeks(chain, spot, rate=rate, div=div, now=now, rows=rows)["gamma"]
+        gex = np.nan_to_num(gamma.to_numpy()) * _chain_values(chain, v, rows)
+        gex *= contract_size * spot * spot * 0.01
+        g_seg, g_strikes, g_calls, g_puts = strike_grid(
+            seg, chain.strikes(rows), is_call, np.where(is_call, gex, -gex)
+        )
+        if by_expiry:
+            index = pd.MultiIndex.from_arrays(
+                [np.asarray(labels, dtype=object)[g_seg], g_strikes], names=["expiry", "strike"]
             )
-            if v == Values.Both:
-                y_puts = _to_numeric_series(vol_p) + _to_numeric_series(oi_p)
-            elif v == Values.Volume:
-                y_puts = _to_numeric_series(vol_p)
-            else:
-                y_puts = _to_numeric_series(oi_p)
-
-            for idx, strike in enumerate(x_puts):
-                if strike in df.index:
-                    df.loc[strike, "puts"] += y_puts[idx]
-                    df.loc[strike, "all"] += y_puts[idx]
-                else:
-                    df.loc[strike] = [0, y_puts[idx], y_puts[idx]]
-
-        return df.sort_index() if not df.empty else df
+        else:
+            index = pd.Index(g_strikes, dtype=float, name="strike")
+        return pd.DataFrame(
+            {"calls": g_calls, "puts": g_puts, "net": g_calls + g_puts}, index=index
+        )
+
+    def GetGammaFlip(
+        self,
+        spot: float,
+        val: Values | str = Values.OpenInt,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        dates: list[str] | None = None,
+        by_expiry: bool = False,
+        rate: float = 0.0,
+        div: float = 0.0,
+        now: datetime | None = None,
+    ) -> float | pd.Series | None:
+        """Strike where cumulative net GEX (from the lowest strike up) turns non-negative."""
+        gex = self.GetGEX(spot, val, start_date, end_date, dates, by_expiry, rate, div, now)
+        if gex is None:
+            return None
+        if not by_expiry:
+            seg = np.zeros(len(gex), dtype=np.int64)
+            return float(gamma_flip(seg, gex.index.to_numpy(), gex["net"].to_numpy())[0])
+        labels = gex.index.get_level_values("expiry")
+        seg = pd.factorize(labels)[0]
+        flips = gamma_flip(
+            seg, gex.index.get_level_values("strike").to_numpy(), gex["net"].to_numpy()
+        )
+        return pd.Series(flips, index=pd.unique(labels), name="gammaFlip")
+
+    def GetStrikeStats(
+        self,
+        val: Values | str = Values.Both,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        dates: list[str] | None = None,
+    ) -> StrikeStats | None:
+        """Per-strike counts and weighted mean/std for a date window, without plotting."""
+        if dates is None:
+            dates = self.GetDatesStartEnd(start_date=start_date, end_date=end_date)
+        if not dates:
+            return None
+        opts_df = self.GetOptsDF(val=val, dates=dates)
+        if opts_df is None or opts_df.empty:
+            return None
+        return strike_stats(opts_df, self._ticker, self.GetValuesString(val), dates, self._dates)
 
     def StatsPlot(
         self,
@@ -223,149 +587,135 @@ class OptsAnalysis:
         val: Values | str = Values.Both,
         dates: list[str] | None = None,
         opts_df: pd.DataFrame | None = None,
-    ) -> None:
-        """Print weighted mean/std and optionally show bar chart."""
+    ) -> StrikeStats | None:
+        """Print weighted mean/std and optionally show bar chart; returns the stats."""
         if not dates or dates == []:
             print("Empty list of dates given")
-            return
+            return None
         if opts_df is None or opts_df.empty:
             print("No opts DataFrame given")
-            return
-        sum_calls = opts_df["calls"].sum()
-        sum_puts = opts_df["puts"].sum()
-        sum_overall = opts_df["all"].sum()
-        mean_calls = np.average(opts_df.index, weights=opts_df["calls"])
-        std_calls = np.sqrt(np.average((opts_df.index - mean_calls) ** 2, weights=opts_df["calls"]))
-        mean_puts = np.average(opts_df.index, weights=opts_df["puts"])
-        std_puts = np.sqrt(np.average((opts_df.index - mean_puts) ** 2, weights=opts_df["puts"]))
-        mean_all = np.average(opts_df.index, weights=opts_df["all"])
-        std_all = np.sqrt(np.average((opts_df.index - mean_all) ** 2, weights=opts_df["all"]))
-        per_calls = str(round(100 * float(sum_calls) / float(sum_overall), 2)) + "%"
-        per_puts = str(round(100 * float(sum_puts) / float(sum_overall), 2)) + "%"
-        print_stats_str = (
-            "---- " + self._ticker + " Options " + self.GetValuesString(val) + " Stats ----"
-        )
-        with contextlib.suppress(locale.Error):
-            locale.setlocale(locale.LC_ALL, "en_US")
-        str_calls = locale.format_string("%d", int(sum_calls), grouping=True)
-        str_puts = locale.format_string("%d", int(sum_puts), grouping=True)
-        str_overall = locale.format_string("%d", int(sum_overall), grouping=True)
-        w = max(len(str_calls), len(str_puts), len(str_overall))
-        str_calls = f"{str_calls:<{w}}"
-        str_puts = f"{str_puts:<{w}}"
-        str_overall = f"{str_overall:<{w}}"
-        str_mean_calls = f"{mean_calls:.2f}"
-        str_mean_puts = f"{mean_puts:.2f}"
-        str_mean_all = f"{mean_all:.2f}"
-        wm = max(len(str_mean_calls), len(str_mean_puts), len(str_mean_all))
-        str_mean_calls = f"{str_mean_calls:<{wm}}"
-        str_mean_puts = f"{str_mean_puts:<{wm}}"
-        str_mean_all = f"{str_mean_all:<{wm}}"
-        str_std_calls = f"{std_calls:.2f}"
-        str_std_puts = f"{std_puts:.2f}"
-        str_std_all = f"{std_all:.2f}"
-        ws = max(len(str_std_calls), len(str_std_puts), len(str_std_all))
-        str_std_calls = f"{str_std_calls:<{ws}}"
-        str_std_puts = f"{str_std_puts:<{ws}}"
-        str_std_all = f"{str_std_all:<{ws}}"
-        print_calls_str = (
-            "Calls:\t"
-            + str_calls
-            + " | Mean = "
-            + str_mean_calls
-            + " | STD = ±"
-            + str_std_calls
-            + " | "
-            + per_calls
-        )
-        print_puts_str = (
-            "Puts:\t"
-            + str_puts
-            + " | Mean = "
-            + str_mean_puts
-            + " | STD = ±"
-            + str_std_puts
-            + " | "
-            + per_puts
-        )
-        print_all_str = (
-            "All:\t" + str_overall + " | Mean = " + str_mean_all + " | STD = ±" + str_std_all
-        )
-        if dates[0] == self._dates[0] and dates[-1] == self._dates[-1]:
-            print_exp_str = "All Expiration Dates"
-        elif len(dates) == 1:
-            print_exp_str = "Expiring at " + dates[0]
-        else:
-            print_exp_str = "Expiring From " + dates[0] + " Up To " + dates[-1]
+            return None
+        result = strike_stats(opts_df, self._ticker, self.GetValuesString(val), dates, self._dates)
         if stats:
-            print(print_stats_str)
-            print("\t", print_all_str)
-            print("\t", print_calls_str)
-            print("\t", print_puts_str)
-            print("-" * len(print_stats_str))
+            print(result.format())
         if plot:
-            fig = go.Figure()
-            fig.add_trace(
-                go.Bar(
-                    x=opts_df.index,
-                    y=opts_df["calls"],
-                    name=print_calls_str.replace("\t", " ").replace(" |", ","),
-                    marker_color="rgba(0,0,255,0.5)",
-                )
-            )
-            fig.add_trace(
-                go.Bar(
-                    x=opts_df.index,
-                    y=opts_df["puts"],
-                    name=print_puts_str.replace("\t", " ").replace(" |", ","),
-                    marker_color="rgba(255,0,0,0.5)",
-                )
-            )
-            fig.add_trace(
-                go.Scatter(
-                    x=opts_df.index,
-                    y=opts_df["all"],
-                    mode="lines",
-                    name=print_all_str.replace("\t", " ").replace(" |", ","),
-                    line={"color": "black", "width": 2},
-                )
-            )
-            fig.update_layout(
-                title=f"{self._ticker} Options {self.GetValuesString(val)}, {print_exp_str}",
-                xaxis_title="Strike",
-                yaxis_title=f"{self.GetValuesString(val)} Count",
-                legend={
-                    "orientation": "h",
-                    "yanchor": "bottom",
-                    "y": 1.02,
-                    "xanchor": "left",
-                    "x": 0,
-                },
-                barmode="overlay",
-            )
-            fig.show()
+            with span("opts.render"):
+                strike_figure(result).show()
+        return result
 
     def PlotHistByDate(
         self,
         date: str,
         val: Values | str = Values.Both,
-    ) -> None:
-        opts_df = self.GetOptsDF(val=val, dates=[date])
-        if opts_df is not None and not opts_df.empty:
-            self.StatsPlot(val=val, stats=True, plot=True, dates=[date], opts_df=opts_df)
+        plot: bool = True,
+    ) -> StrikeStats | None:
+        result = self.GetStrikeStats(val=val, dates=[date])
+        if result is not None:
+            print(result.format())
+            if plot:
+                with span("opts.render"):
+                    strike_figure(result).show()
+        return result
 
     def PlotHist(
         self,
         val: Values | str = Values.Both,
         start_date: str | None = None,
         end_date: str | None = None,
-    ) -> None:
-        dates = self.GetDatesStartEnd(start_date=start_date, end_date=end_date)
+        plot: bool = True,
+    ) -> StrikeStats | None:
+        result = self.GetStrikeStats(val=val, start_date=start_date, end_date=end_date)
+        if result is not None:
+            print(result.format())
+            if plot:
+                with span("opts.render"):
+                    strike_figure(result).show()
+        return result
+
+    def GetTimelineStats(
+        self,
+        val: Values | str = Values.Both,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        dates: list[str] | None = None,
+        percentiles: tuple[float, ...] = (0.5,),
+    ) -> pd.DataFrame | None:
+        """
+        Per-expiration weighted strike stats for calls, puts and all options.
+
+        Columns: calls/puts/all (weighted mean strike), *Err (std), *Skew, *P50 etc.
+        (weighted percentiles), *Total and perCalls/perPuts (share of the total, %).
+        Expirations with no weight get NaN. Computed in one pass over the chain.
+        """
+        v = _normalize_val(val)
+        if v is None:
+            print("Value must be Volume, OpenInt, or Both")
+            return None
+        if dates is None:
+            dates = self.GetDatesStartEnd(start_date=start_date, end_date=end_date)
         if not dates:
-            return
-        opts_df = self.GetOptsDF(val=val, dates=dates)
-        if opts_df is not None and not opts_df.empty:
-            self.StatsPlot(val=val, stats=True, plot=True, dates=dates, opts_df=opts_df)
+            return None
+        key = ("timeline", v, tuple(dates), percentiles)
+        cached = self._cache.get(key)
+        if cached is None:
+            with span("opts.timeline_stats", expiries=len(dates)):
+                cached = self._timeline_stats(v, dates, percentiles)
+            self._cache.put(key, cached)
+        return cached.copy()
+
+    def _timeline_stats(
+        self, v: Values, dates: list[str], percentiles: tuple[float, ...]
+    ) -> pd.DataFrame:
+        self._require(dates)
+        chain = self._chain
+        # Expirations without contracts (e.g. failed downloads) are left out, as before
+        codes = [
+            c
+            for c in dict.fromkeys(chain.code(d) for d in dates)
+            if c is not None and chain.expiry_offsets[c + 1] > chain.expiry_offsets[c]
+        ]
+        seg_of_code = np.full(len(chain.expiries), -1, dtype=np.int64)
+        seg_of_code[codes] = np.arange(len(codes))
+        rows = chain.rows_for([chain.expiries[c] for c in codes])
+        seg = seg_of_code[chain.expiry[rows]]
+        strikes = chain.strikes(rows)
+        values = _chain_values(chain, v, rows)
+        calls = chain.side[rows] == CALL
+        # Calls and puts are strike-sorted per expiry already; "all" interleaves the sides
+        order = np.lexsort((strikes, seg))
+        parts = {
+            "calls": segment_weighted_stats(
+                seg[calls], len(codes), strikes[calls], values[calls], percentiles
+            ),
+            "puts": segment_weighted_stats(
+                seg[~calls], len(codes), strikes[~calls], values[~calls], percentiles
+            ),
+            "all": segment_weighted_stats(
+                seg[order], len(codes), strikes[order], values[order], percentiles
+            ),
+        }
+        total = parts["all"]["total"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = {
+                side: np.round(np.where(total > 0, 100 * parts[side]["total"] / total, 0.0), 2)
+                for side in ("calls", "puts")
+            }
+        columns: dict[str, np.ndarray] = {
+            "calls": parts["calls"]["mean"],
+            "callsErr": parts["calls"]["std"],
+            "perCalls": share["calls"],
+            "puts": parts["puts"]["mean"],
+            "putsErr": parts["puts"]["std"],
+            "perPuts": share["puts"],
+            "all": parts["all"]["mean"],
+            "allErr": parts["all"]["std"],
+        }
+        for side, part in parts.items():
+            columns[f"{side}Skew"] = part["skew"]
+            for q in percentiles:
+                columns[f"{side}P{round(q * 100):d}"] = part[f"p{round(q * 100):d}"]
+            columns[f"{side}Total"] = part["total"].astype(np.int64)
+        return pd.DataFrame(columns, index=pd.Index([chain.expiries[c] for c in codes]))
 
     def PlotTimelineWithErrors(
         self,
@@ -376,120 +726,8 @@ class OptsAnalysis:
         dates = self.GetDatesStartEnd(start_date=start_date, end_date=end_date)
         if not dates:
             return
-        v = _normalize_val(val)
-        if v is None:
+        df = self.GetTimelineStats(val=val, dates=dates)
+        if df is None:
             return
-        df = pd.DataFrame(
-            columns=["calls", "callsErr", "perCalls", "puts", "putsErr", "perPuts", "all", "allErr"]
-        )
-        for key in dates:
-            if key not in self._big_dict:
-                continue
-            block = self._big_dict[key]
-            calls_df = block["calls"]
-            puts_df = block["puts"]
-            strike_col = "Strike" if "Strike" in calls_df.columns else "strike"
-            x_calls = np.asarray(calls_df[strike_col], dtype=float)
-            vol_c = calls_df.get("Volume", pd.Series(0, index=calls_df.index))
-            oi_c = calls_df.get("OpenInt", pd.Series(0, index=calls_df.index))
-            if v == Values.Both:
-                y_calls = _to_numeric_series(vol_c) + _to_numeric_series(oi_c)
-            elif v == Values.Volume:
-                y_calls = _to_numeric_series(vol_c)
-            else:
-                y_calls = _to_numeric_series(oi_c)
-            mean_calls = np.average(x_calls, weights=y_calls)
-            std_calls = np.sqrt(np.average((x_calls - mean_calls) ** 2, weights=y_calls))
-            x_puts = np.asarray(puts_df[strike_col], dtype=float)
-            vol_p = puts_df.get("Volume", pd.Series(0, index=puts_df.index))
-            oi_p = puts_df.get("OpenInt", pd.Series(0, index=puts_df.index))
-            if v == Values.Both:
-                y_puts = _to_numeric_series(vol_p) + _to_numeric_series(oi_p)
-            elif v == Values.Volume:
-                y_puts = _to_numeric_series(vol_p)
-            else:
-                y_puts = _to_numeric_series(oi_p)
-            mean_puts = np.average(x_puts, weights=y_puts)
-            std_puts = np.sqrt(np.average((x_puts - mean_puts) ** 2, weights=y_puts))
-            df_all = pd.DataFrame(columns=["all"])
-            for idx, strike in enumerate(x_calls):
-                if strike in df_all.index:
-                    df_all.loc[strike] = df_all.loc[strike] + y_calls[idx]
-                else:
-                    df_all.loc[strike] = y_calls[idx]
-            for idx, strike in enumerate(x_puts):
-                if strike in df_all.index:
-                    df_all.loc[strike] = df_all.loc[strike] + y_puts[idx]
-                else:
-                    df_all.loc[strike] = y_puts[idx]
-            mean_all = np.average(df_all.index, weights=df_all["all"])
-            std_all = np.sqrt(np.average((df_all.index - mean_all) ** 2, weights=df_all["all"]))
-            total = float(df_all["all"].sum())
-            per_calls = round(100 * float(np.sum(y_calls)) / total, 2) if total else 0
-            per_puts = round(100 * float(np.sum(y_puts)) / total, 2) if total else 0
-            df.loc[key] = [
-                mean_calls,
-                std_calls,
-                per_calls,
-                mean_puts,
-                std_puts,
-                per_puts,
-                mean_all,
-                std_all,
-            ]
-        if dates[0] == self._dates[0] and dates[-1] == self._dates[-1]:
-            exp_str = "All Expiration Dates"
-        elif len(dates) == 1:
-            exp_str = "Expiring at " + dates[0]
-        else:
-            exp_str = "Expiring From " + dates[0] + " Up To " + dates[-1]
-        fig = go.Figure()
-        fig.add_trace(
-            go.Scatter(
-                x=df.index,
-                y=df["calls"],
-                error_y={"type": "data", "array": df["callsErr"], "visible": True},
-                mode="lines+markers",
-                name="Calls",
-                line={"dash": "dot", "color": "rgba(0,0,255,0.4)"},
-                marker={"size": 8},
-                text=[f"{y:.2f}, {z}%" for y, z in zip(df["calls"], df["perCalls"], strict=False)],
-                textposition="top right",
-            )
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=df.index,
-                y=df["puts"],
-                error_y={"type": "data", "array": df["putsErr"], "visible": True},
-                mode="lines+markers",
-                name="Puts",
-                line={"dash": "dot", "color": "rgba(255,0,0,0.4)"},
-                marker={"size": 8},
-                text=[f"{y:.2f}, {z}%" for y, z in zip(df["puts"], df["perPuts"], strict=False)],
-                textposition="top left",
-            )
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=df.index,
-                y=df["all"],
-                error_y={"type": "data", "array": df["allErr"], "visible": True},
-                mode="lines+markers",
-                name="All Options",
-                line={"color": "black", "width": 2},
-                marker={"size": 10},
-                text=[f"{y:.2f}" for y in df["all"]],
-                textposition="top center",
-            )
-        )
-        fig.update_traces(textfont_size=10)
-        fig.update_layout(
-            title=f"{self._ticker} Options Mean and STD spreads, {exp_str}",
-            xaxis_title="Expiration Dates",
-            yaxis_title="Mean and STD Count",
-            legend={"orientation": "h", "yanchor": "bottom", "y": 1.02, "xanchor": "left", "x": 0},
-            xaxis={"tickangle": -45},
-            showlegend=True,
-        )
-        fig.show()
+        with span("opts.render"):
+            timeline_figure(self._ticker, df, expiration_label(dates, self._dates)).show()
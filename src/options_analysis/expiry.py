@@ -0,0 +1,188 @@
+"""Expiration date labels: parsing the formats produced by the different sources."""
+
+import re
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+# yfinance/yahoo labels are dd/mm/yyyy, TradeStation exports use mm/dd/yy or "Jan 17 25"
+_FORMATS = ("%d/%m/%Y", "%m/%d/%y", "%Y-%m-%d", "%b %d %y", "%b %d %Y", "%B %d, %Y", "%b %d, %Y")
+# Query bounds that are not labels: the labels' own format first, then day-first, and
+# month-first only for text no day-first format reads (e.g. "01/20/25")
+_BOUND_FORMATS = (
+    "%d/%m/%Y",
+    "%d/%m/%y",
+    "%Y-%m-%d",
+    "%b %d %y",
+    "%b %d %Y",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%m/%d/%y",
+    "%m/%d/%Y",
+)
+CALENDARS = ("monthly", "weekly", "quarterly")
+_DTE_RANGE = re.compile(
+    r"^\s*(\d+)\s*(?:(-|–|—|\.\.|to)\s*(\d+)|(\+))?\s*(?:d|days?)?\s*$", re.IGNORECASE
+)
+_NAT = np.datetime64("NaT", "D")
+
+
+@lru_cache(maxsize=4096)
+def parse_expiry(label: str) -> date | None:
+    """Parse an expiration label into a date; None if it matches no known format."""
+    return _parse(str(label).strip(), _FORMATS)
+
+
+def _parse(text: str, formats: Sequence[str]) -> date | None:
+    for fmt in formats:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _label_format(label: str) -> str | None:
+    """The first of _FORMATS that parses ``label``, as parse_expiry would."""
+    text = str(label).strip()
+    return next((fmt for fmt in _FORMATS if _parse(text, (fmt,)) is not None), None)
+
+
+def parse_dte_range(text: str) -> tuple[int, int | None]:
+    """
+    Days-to-expiry range from text: "7-45", "7–45 days", "7..45", "7 to 45d", "30+"
+    (no upper bound) or "14" (exactly 14 days).
+    """
+    m = _DTE_RANGE.match(text)
+    if m is None:
+        raise ValueError(f"Not a days-to-expiry range: {text!r}")
+    low = int(m.group(1))
+    if m.group(4):
+        return low, None
+    high = int(m.group(3)) if m.group(3) else low
+    if high < low:
+        raise ValueError(f"Days-to-expiry range ends before it starts: {text!r}")
+    return low, high
+
+
+DateLike = str | date | datetime | np.datetime64
+
+
+class ExpiryIndex:
+    """
+    Expiration labels with their dates as a sorted ``datetime64[D]`` index, so date and
+    days-to-expiry windows are two binary searches whatever label format the source used.
+    Labels that are not dates are kept in ``labels`` but never match a date query.
+    Query results are in expiry order.
+    """
+
+    def __init__(self, labels: Sequence[str]) -> None:
+        self.labels = list(labels)
+        parsed = (parse_expiry(label) for label in self.labels)
+        self.days = np.array([_NAT if d is None else d for d in parsed], dtype="datetime64[D]")
+        dated = np.flatnonzero(~np.isnat(self.days))
+        self._order = dated[np.argsort(self.days[dated], kind="stable")]
+        self._sorted = self.days[self._order]
+        self._positions: dict[str, int] = {}
+        for i, label in enumerate(self.labels):
+            self._positions.setdefault(label, i)
+        self._calendars: dict[str, np.ndarray] = {}
+        label_format = _label_format(self.labels[self._order[0]]) if len(self._order) else None
+        self._bound_formats: tuple[str, ...] = _BOUND_FORMATS
+        if label_format is not None:
+            self._bound_formats = (label_format, *_BOUND_FORMATS)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def complete(self) -> bool:
+        """True if every label is a date."""
+        return len(self._order) == len(self.labels)
+
+    def position(self, label: str) -> int | None:
+        """Position of ``label`` in the original (source) order."""
+        return self._positions.get(label)
+
+    def day(self, value: DateLike) -> np.datetime64 | None:
+        """
+        The date of a label of this index, or of a date in a supported format. Text that
+        is not a label is read in the labels' own format first, then day first
+        ("03/04/25" is 3 April unless the labels are mm/dd/yy; "01/20/25" is 20 January).
+        """
+        if isinstance(value, str):
+            i = self._positions.get(value)
+            if i is not None and not np.isnat(self.days[i]):
+                return np.datetime64(self.days[i], "D")
+            parsed = _parse(value.strip(), self._bound_formats)
+            return None if parsed is None else np.datetime64(parsed, "D")
+        if isinstance(value, np.datetime64):
+            day = value.astype("datetime64[D]")
+        else:
+            day = np.datetime64(value.date() if isinstance(value, datetime) else value, "D")
+        return None if np.isnat(day) else day
+
+    def _bound(self, value: DateLike) -> np.datetime64:
+        day = self.day(value)
+        if day is None:
+            raise ValueError(f"Not a date: {value!r}")
+        return day
+
+    def calendar_mask(self, calendar: str) -> np.ndarray:
+        """
+        Boolean mask over ``labels``: "monthly" (the third Friday of the month, or the
+        Thursday before when that Friday is not listed, e.g. Good Friday), "quarterly"
+        (monthlies of Mar, Jun, Sep, Dec) or "weekly" (every other dated expiry).
+        """
+        if calendar not in CALENDARS:
+            raise ValueError(f"calendar must be one of {CALENDARS}")
+        mask = self._calendars.get(calendar)
+        if mask is None:
+            days = self.days
+            dated = ~np.isnat(days)
+            weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+            dom = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+            third_friday = dated & (weekday == 4) & (dom >= 15) & (dom <= 21)
+            listed = np.isin(days + np.timedelta64(1, "D"), days[dated])
+            thursday = dated & (weekday == 3) & (dom >= 14) & (dom <= 20) & ~listed
+            monthly = third_friday | thursday
+            month = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+            self._calendars = {
+                "monthly": monthly,
+                "quarterly": monthly & np.isin(month, (3, 6, 9, 12)),
+                "weekly": dated & ~monthly,
+            }
+            mask = self._calendars[calendar]
+        return mask
+
+    def between(
+        self,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+        calendar: str | None = None,
+    ) -> list[str]:
+        """Labels expiring in [start, end] (either bound may be None), in expiry order."""
+        lo = 0 if start is None else int(np.searchsorted(self._sorted, self._bound(start)))
+        hi = (
+            len(self._sorted)
+            if end is None
+            else int(np.searchsorted(self._sorted, self._bound(end), "right"))
+        )
+        rows = self._order[lo:hi]
+        if calendar is not None:
+            rows = rows[self.calendar_mask(calendar)[rows]]
+        return [self.labels[i] for i in rows]
+
+    def by_dte(
+        self,
+        min_days: int = 0,
+        max_days: int | None = None,
+        today: date | None = None,
+        calendar: str | None = None,
+    ) -> list[str]:
+        """Labels whose days-to-expiry from ``today`` lies in [min_days, max_days]."""
+        today = today or date.today()
+        end = None if max_days is None else today + timedelta(days=max_days)
+        return self.between(today + timedelta(days=min_days), end, calendar)
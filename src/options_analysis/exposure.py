@@ -0,0 +1,94 @@
+"""Max pain, gamma exposure and gamma flip from strike aggregates, via sorted prefix sums."""
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def segment_starts(seg: np.ndarray) -> np.ndarray:
+    """Index of the first row of every run of equal values in a sorted segment array."""
+    if seg.size == 0:
+        return np.zeros(0, dtype=np.intp)
+    return np.flatnonzero(np.r_[True, seg[1:] != seg[:-1]])
+
+
+def segmented_cumsum(seg: np.ndarray, x: np.ndarray) -> NDArray[np.float64]:
+    """Inclusive running sum of x that restarts at every new segment (seg sorted)."""
+    values = np.asarray(x, dtype=np.float64)
+    cum = np.cumsum(values)
+    starts = segment_starts(seg)
+    base = cum[starts] - values[starts]
+    out: NDArray[np.float64] = cum - np.repeat(base, np.diff(np.r_[starts, values.size]))
+    return out
+
+
+def max_pain(
+    seg: np.ndarray, strikes: np.ndarray, call_w: np.ndarray, put_w: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Option-holder payout at each listed strike, and the max-pain strike of every segment.
+
+    Rows are sorted by (seg, strike), one row per strike. Settling at strike S pays
+    sum(call_w * (S - K), K < S) + sum(put_w * (K - S), K > S); with running sums of w and
+    w * K both sides are O(1) per strike. Returns ``(payout per row, max-pain per segment)``
+    with segments in ascending order.
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    call_w = np.asarray(call_w, dtype=np.float64)
+    put_w = np.asarray(put_w, dtype=np.float64)
+    if strikes.size == 0:
+        return np.zeros(0), np.zeros(0)
+    starts = segment_starts(seg)
+    lengths = np.diff(np.r_[starts, strikes.size])
+    ends = starts + lengths - 1
+    calls_in = segmented_cumsum(seg, call_w)
+    calls_k_in = segmented_cumsum(seg, call_w * strikes)
+    puts_in = segmented_cumsum(seg, put_w)
+    puts_k_in = segmented_cumsum(seg, put_w * strikes)
+    # put sums over K >= S = segment total - sums over K < S
+    puts_ge = np.repeat(puts_in[ends], lengths) - puts_in + put_w
+    puts_k_ge = np.repeat(puts_k_in[ends], lengths) - puts_k_in + put_w * strikes
+    payout = (strikes * calls_in - calls_k_in) + (puts_k_ge - strikes * puts_ge)
+    order = np.lexsort((payout, seg))
+    return payout, strikes[order[starts]]
+
+
+def gamma_flip(seg: np.ndarray, strikes: np.ndarray, net_gex: np.ndarray) -> np.ndarray:
+    """
+    Strike where cumulative net gamma exposure (summed up from the lowest strike) first
+    turns from negative to non-negative, linearly interpolated; NaN if it never does.
+    Rows sorted by (seg, strike); returns one level per segment in ascending order.
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    starts = segment_starts(seg)
+    out = np.full(starts.size, np.nan)
+    if strikes.size < 2:
+        return out
+    cum = segmented_cumsum(seg, net_gex)
+    prev = cum[:-1]
+    cross = np.flatnonzero((prev < 0) & (cum[1:] >= 0) & (seg[1:] == seg[:-1])) + 1
+    if cross.size == 0:
+        return out
+    first = cross[np.r_[True, seg[cross][1:] != seg[cross][:-1]]]
+    frac = -cum[first - 1] / (cum[first] - cum[first - 1])
+    level = strikes[first - 1] + frac * (strikes[first] - strikes[first - 1])
+    out[np.searchsorted(seg[starts], seg[first])] = level
+    return out
+
+
+def strike_grid(
+    seg: np.ndarray, strikes: np.ndarray, is_call: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collapse contracts to one row per (segment, strike), sorted, with call and put sums.
+    Returns ``(seg, strike, calls, puts)`` for the grid rows.
+    """
+    order = np.lexsort((strikes, seg))
+    s, k = seg[order], strikes[order]
+    new = np.r_[True, (s[1:] != s[:-1]) | (k[1:] != k[:-1])] if s.size else np.zeros(0, bool)
+    group = np.cumsum(new) - 1
+    n = int(new.sum())
+    v = np.asarray(values, dtype=np.float64)[order]
+    c = is_call[order]
+    calls = np.bincount(group, weights=np.where(c, v, 0.0), minlength=n)
+    puts = np.bincount(group, weights=np.where(c, 0.0, v), minlength=n)
+    return s[new], k[new], calls, puts
@@ -0,0 +1,148 @@
+"""Cache of parsed local source files (e.g. TradeStation Excel exports), keyed by content."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from options_analysis.snapshot import read_result, write_result
+from options_analysis.sources.base import OptionsSourceResult
+
+_SOURCES = "sources"
+
+
+def file_digest(path: Path) -> str:
+    """Content hash of a file (BLAKE2b, read in blocks)."""
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()[:40]
+
+
+class ParsedFileCache:
+    """
+    Parsed, normalized results of local files under ``root``, in the snapshot format
+    (memory-mapped .npy columns), so a repeated load skips parsing entirely.
+
+    Entries are keyed by loader name, loader version and the file's content hash, so an
+    edited file or a changed loader never hits an old entry. Each source path also has a
+    small pointer (size, mtime, entry): while the file's size and mtime are unchanged the
+    file is not even re-hashed, and when its content changes the entry it pointed to is
+    deleted once no other path points to it. Copies of the same export at different
+    paths share one entry.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _pointer(self, path: Path) -> Path:
+        key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:32]
+        return self.root / _SOURCES / f"{key}.json"
+
+    @staticmethod
+    def _read_json(pointer: Path) -> dict[str, object] | None:
+        try:
+            data = json.loads(pointer.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _read_pointer(self, path: Path) -> dict[str, object] | None:
+        return self._read_json(self._pointer(path))
+
+    def _referenced(self, entry: str) -> bool:
+        """True if some source path still points to ``entry``."""
+        return any(
+            (data := self._read_json(pointer)) is not None and data.get("entry") == entry
+            for pointer in (self.root / _SOURCES).glob("*.json")
+        )
+
+    def _write_pointer(self, path: Path, stat: os.stat_result, entry: str) -> None:
+        pointer = self._pointer(path)
+        pointer.parent.mkdir(parents=True, exist_ok=True)
+        tmp = pointer.with_name(f"{pointer.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        info = {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        tmp.write_text(json.dumps({**info, "entry": entry}), encoding="utf-8")
+        os.replace(tmp, pointer)
+
+    def _open(self, entry: str) -> OptionsSourceResult | None:
+        try:
+            return read_result(self.root / entry)
+        except (OSError, ValueError, KeyError):
+            return None  # missing or unreadable entries are re-parsed
+
+    def load(
+        self,
+        path: str | Path,
+        loader: str,
+        version: int,
+        parse: Callable[[Path], OptionsSourceResult],
+    ) -> OptionsSourceResult:
+        """The cached result for ``path``, or ``parse(path)`` stored for next time."""
+        path = Path(path)
+        stat = path.stat()
+        prefix = f"{loader}-v{version}-"
+        pointer = self._read_pointer(path)
+        unchanged = (
+            pointer is not None
+            and pointer.get("size") == stat.st_size
+            and pointer.get("mtime_ns") == stat.st_mtime_ns
+            and str(pointer.get("entry", "")).startswith(prefix)
+        )
+        entry = str(pointer["entry"]) if unchanged and pointer else prefix + file_digest(path)
+        result = self._open(entry)
+        if result is None:
+            result = parse(path)
+            final = self.root / entry
+            tmp = self.root / f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.rmtree(tmp, ignore_errors=True)
+            shutil.rmtree(final, ignore_errors=True)  # unreadable leftovers
+            tmp.mkdir(parents=True)
+            write_result(tmp, result, source=str(path), loader=loader, loader_version=version)
+            try:
+                os.replace(tmp, final)
+            except OSError:  # another process stored the same entry first
+                shutil.rmtree(tmp, ignore_errors=True)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.hits += 1
+        if not unchanged:
+            self._write_pointer(path, stat, entry)
+            old = str(pointer.get("entry") or "") if pointer else ""
+            if old and old != entry and not self._referenced(old):
+                # The file changed (or the loader did): its previous entry is stale,
+                # unless a copy of the old file at another path still uses it
+                shutil.rmtree(self.root / old, ignore_errors=True)
+        return result
+
+
+_default: ParsedFileCache | None = None
+_default_config: tuple[str, str] | None = None
+_default_lock = threading.Lock()
+
+
+def default_file_cache() -> ParsedFileCache | None:
+    """
+    The process-wide cache used for Excel imports when none is passed, configured from
+    the environment: SOA_FILE_CACHE_DIR (default ~/.cache/stock-options-analysis/files)
+    and SOA_FILE_CACHE=off to disable it.
+    """
+    global _default, _default_config
+    config = (
+        os.environ.get("SOA_FILE_CACHE", "on").strip().lower(),
+        os.environ.get("SOA_FILE_CACHE_DIR", ""),
+    )
+    if config[0] in ("0", "off", "false", "no"):
+        return None
+    with _default_lock:
+        if _default is None or config != _default_config:
+            root = config[1] or Path.home() / ".cache" / "stock-options-analysis" / "files"
+            _default = ParsedFileCache(root)
+            _default_config = config
+        return _default
@@ -0,0 +1,315 @@
+"""Vectorized Black-Scholes prices, Greeks and implied volatility over whole chains."""
+
+from datetime import datetime, time
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from numpy.typing import NDArray
+
+from options_analysis.chain import CALL, SIDES, OptionsChain
+from options_analysis.expiry import parse_expiry
+
+ArrayLike = npt.ArrayLike
+FloatArray = NDArray[np.float64]
+BoolArray = NDArray[np.bool_]
+
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+# Options stop trading at the US close; time to expiry is measured to 16:00 local time
+_EXPIRY_TIME = time(16, 0)
+_SECONDS_PER_YEAR = 365.0 * 86400.0
+_CDF_NUM = (
+    3.52624965998911e-02,
+    0.700383064443688,
+    6.37396220353165,
+    33.912866078383,
+    112.079291497871,
+    221.213596169931,
+    220.206867912376,
+)
+_CDF_DEN = (
+    8.83883476483184e-02,
+    1.75566716318264,
+    16.064177579207,
+    86.7807322029461,
+    296.564248779674,
+    637.333633378831,
+    793.826512519948,
+    440.413735824752,
+)
+
+
+def norm_pdf(x: ArrayLike) -> FloatArray:
+    a = np.asarray(x, dtype=np.float64)
+    pdf: FloatArray = np.exp(-0.5 * a * a) / _SQRT_2PI
+    return pdf
+
+
+def norm_cdf(x: ArrayLike) -> FloatArray:
+    """Standard normal CDF to double precision (Hart 1968, as given by West 2005)."""
+    x = np.asarray(x, dtype=np.float64)
+    shape = x.shape
+    x = x.reshape(-1)
+    a = np.abs(x)
+    # Horner steps in place: this is the hot loop of the IV solver
+    num = np.full_like(a, _CDF_NUM[0])
+    for coef in _CDF_NUM[1:]:
+        num *= a
+        num += coef
+    den = np.full_like(a, _CDF_DEN[0])
+    for coef in _CDF_DEN[1:]:
+        den *= a
+        den += coef
+    e = np.square(a)
+    e *= -0.5
+    np.exp(e, out=e)
+    num *= e
+    num /= den
+    far = a >= 7.07106781186547
+    if far.any():
+        # Continued fraction for the far tail, where the rational form loses accuracy
+        af = a[far]
+        cf = af + 1.0 / (af + 2.0 / (af + 3.0 / (af + 4.0 / (af + 0.65))))
+        num[far] = np.where(af > 37.0, 0.0, e[far] / cf / 2.506628274631)
+    np.subtract(1.0, num, out=num, where=x > 0)
+    cdf: FloatArray = num.reshape(shape)
+    return cdf
+
+
+def _d1_d2(
+    spot: FloatArray,
+    strike: FloatArray,
+    t: FloatArray,
+    vol: FloatArray,
+    rate: FloatArray,
+    div: FloatArray,
+) -> tuple[FloatArray, FloatArray, FloatArray]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sig_t = vol * np.sqrt(t)
+        d1 = (np.log(spot / strike) + (rate - div + 0.5 * vol * vol) * t) / sig_t
+    return d1, d1 - sig_t, sig_t
+
+
+def _inputs(
+    spot: ArrayLike, strike: ArrayLike, t: ArrayLike, vol: ArrayLike, is_call: ArrayLike
+) -> tuple[np.ndarray, ...]:
+    arrays = np.broadcast_arrays(
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(t, dtype=np.float64),
+        np.asarray(vol, dtype=np.float64),
+        np.asarray(is_call, dtype=bool),
+    )
+    valid = (arrays[0] > 0) & (arrays[1] > 0) & (arrays[2] > 0) & (arrays[3] > 0)
+    return (*arrays, valid)
+
+
+def bs_price(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    t: ArrayLike,
+    vol: ArrayLike,
+    rate: ArrayLike = 0.0,
+    div: ArrayLike = 0.0,
+    is_call: ArrayLike = True,
+) -> np.ndarray:
+    """Black-Scholes-Merton price; all arguments broadcast. Invalid inputs give NaN."""
+    s, k, tt, v, c, valid = _inputs(spot, strike, t, vol, is_call)
+    r = np.asarray(rate, dtype=np.float64)
+    q = np.asarray(div, dtype=np.float64)
+    d1, d2, _ = _d1_d2(s, k, tt, v, r, q)
+    z = np.where(c, 1.0, -1.0)
+    fs = s * np.exp(-q * tt)
+    fk = k * np.exp(-r * tt)
+    price = z * (fs * norm_cdf(z * d1) - fk * norm_cdf(z * d2))
+    return np.where(valid, price, np.nan)
+
+
+def bs_greeks(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    t: ArrayLike,
+    vol: ArrayLike,
+    rate: ArrayLike = 0.0,
+    div: ArrayLike = 0.0,
+    is_call: ArrayLike = True,
+) -> dict[str, np.ndarray]:
+    """
+    Price, delta, gamma, vega and theta for every contract at once.
+
+    ``t`` is in years and ``vol`` annualized (0.25 = 25%). Vega is per 1.00 change in vol
+    and theta per year (divide by 100 / 365 for per-point / per-day figures).
+    Contracts with non-positive spot, strike, time or vol get NaN rather than raising.
+    """
+    s, k, tt, v, c, valid = _inputs(spot, strike, t, vol, is_call)
+    r = np.asarray(rate, dtype=np.float64)
+    q = np.asarray(div, dtype=np.float64)
+    d1, d2, sig_t = _d1_d2(s, k, tt, v, r, q)
+    q_disc = np.exp(-q * tt)
+    r_disc = np.exp(-r * tt)
+    # z = +1 for calls, -1 for puts: N(z*d) gives each side directly, without the
+    # cancellation that 1 - N(d) or put-call parity suffer far out of the money
+    z = np.where(c, 1.0, -1.0)
+    nz1, nz2 = norm_cdf(z * d1), norm_cdf(z * d2)
+    pdf1 = norm_pdf(d1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = q_disc * pdf1 / (s * sig_t)
+        decay = -s * q_disc * pdf1 * v / (2.0 * np.sqrt(tt))
+    out = {
+        "price": z * (s * q_disc * nz1 - k * r_disc * nz2),
+        "delta": z * q_disc * nz1,
+        "gamma": gamma,
+        "vega": s * q_disc * pdf1 * np.sqrt(tt),
+        "theta": decay - z * r * k * r_disc * nz2 + z * q * s * q_disc * nz1,
+    }
+    return {name: np.where(valid, arr, np.nan) for name, arr in out.items()}
+
+
+def _price_vega(
+    s: FloatArray,
+    k: FloatArray,
+    t: FloatArray,
+    vol: FloatArray,
+    r: FloatArray,
+    q: FloatArray,
+    c: BoolArray,
+) -> tuple[FloatArray, FloatArray]:
+    """Price and vega only, for already-validated flat arrays (the IV solver's inner loop)."""
+    d1, d2, _ = _d1_d2(s, k, t, vol, r, q)
+    fs = s * np.exp(-q * t)
+    fk = k * np.exp(-r * t)
+    z = np.where(c, 1.0, -1.0)
+    price = z * (fs * norm_cdf(z * d1) - fk * norm_cdf(z * d2))
+    return price, fs * norm_pdf(d1) * np.sqrt(t)
+
+
+def implied_vol(
+    price: ArrayLike,
+    spot: ArrayLike,
+    strike: ArrayLike,
+    t: ArrayLike,
+    rate: ArrayLike = 0.0,
+    div: ArrayLike = 0.0,
+    is_call: ArrayLike = True,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+    vol_bounds: tuple[float, float] = (1e-6, 5.0),
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solve Black-Scholes implied volatility for whole arrays at once.
+
+    Safeguarded Newton: each contract keeps a bisection bracket and falls back to its
+    midpoint whenever the Newton step leaves the bracket or vega vanishes. Only contracts
+    not yet converged are iterated; ``tol`` is relative to the (out-of-the-money) price.
+    Returns ``(iv, converged)``; prices outside the no-arbitrage bounds or not converged
+    within ``max_iter`` get NaN and False.
+    """
+    p, s, k, tt, c = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64),
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(t, dtype=np.float64),
+        np.asarray(is_call, dtype=bool),
+    )
+    r, q = np.broadcast_arrays(
+        np.broadcast_to(np.asarray(rate, dtype=np.float64), p.shape),
+        np.broadcast_to(np.asarray(div, dtype=np.float64), p.shape),
+    )
+    shape = p.shape
+    p, s, k, tt, c, r, q = (a.ravel() for a in (p, s, k, tt, c, r, q))
+    fwd_s = s * np.exp(-q * tt)
+    fwd_k = k * np.exp(-r * tt)
+    # Solve on the out-of-the-money side (put-call parity): an in-the-money price is mostly
+    # intrinsic value and barely moves with vol, which makes the root badly conditioned.
+    itm = np.where(c, fwd_s > fwd_k, fwd_k > fwd_s)
+    p = np.where(itm, p - np.where(c, fwd_s - fwd_k, fwd_k - fwd_s), p)
+    c = np.where(itm, ~c, c)
+    ok = (s > 0) & (k > 0) & (tt > 0) & (p > 0) & (p < np.where(c, fwd_s, fwd_k))
+
+    iv = np.full(p.shape, np.nan)
+    converged = np.zeros(p.shape, dtype=bool)
+    idx = np.flatnonzero(ok)
+    lo = np.full(idx.size, vol_bounds[0])
+    hi = np.full(idx.size, vol_bounds[1])
+    # Corrado-Miller closed-form estimate as the starting point (on the call-equivalent price)
+    fs, fk = fwd_s[idx], fwd_k[idx]
+    m = np.where(c[idx], p[idx], p[idx] + fs - fk) - 0.5 * (fs - fk)
+    root = np.sqrt(np.maximum(m * m - (fs - fk) ** 2 / np.pi, 0.0))
+    sigma = np.sqrt(2.0 * np.pi / tt[idx]) * (m + root) / (fs + fk)
+    sigma = np.clip(sigma, 2 * lo, 0.5 * hi)
+    log_p = np.log(p, where=ok, out=np.zeros_like(p))
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        price_i, vega_i = _price_vega(s[idx], k[idx], tt[idx], sigma, r[idx], q[idx], c[idx])
+        diff = price_i - p[idx]
+        done = (np.abs(diff) <= tol * p[idx]) | (hi - lo <= tol * sigma)
+        iv[idx[done]] = sigma[done]
+        converged[idx[done]] = True
+        keep = ~done
+        idx, sigma, lo, hi, diff, price_i, vega_i = (
+            a[keep] for a in (idx, sigma, lo, hi, diff, price_i, vega_i)
+        )
+        hi = np.where(diff > 0, sigma, hi)
+        lo = np.where(diff < 0, sigma, lo)
+        # Newton on log(price): far better behaved than raw price for cheap OTM options
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = sigma - (np.log(price_i) - log_p[idx]) * price_i / vega_i
+        bad = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+        sigma = np.where(bad, 0.5 * (lo + hi), step)
+    return iv.reshape(shape), converged.reshape(shape)
+
+
+def years_to_expiry(labels: list[str], now: datetime | None = None) -> np.ndarray:
+    """Years from ``now`` to 16:00 on each expiration date (NaN for unparsable labels)."""
+    now = now or datetime.now()
+    out = np.full(len(labels), np.nan)
+    for i, label in enumerate(labels):
+        d = parse_expiry(label)
+        if d is not None:
+            out[i] = (datetime.combine(d, _EXPIRY_TIME) - now).total_seconds() / _SECONDS_PER_YEAR
+    return out
+
+
+def chain_greeks(
+    chain: OptionsChain,
+    spot: float,
+    rate: float = 0.0,
+    div: float = 0.0,
+    now: datetime | None = None,
+    solve_iv: bool = False,
+    rows: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """
+    Greeks for the contracts of a chain (all of them, or the given row indices), in order.
+
+    Uses the source's implied volatility when present; with ``solve_iv`` (or when the
+    chain has no IV) it is solved from the bid/ask mid instead. ``iv_ok`` marks contracts
+    whose IV is usable; the others carry NaN Greeks.
+    """
+    if rows is None:
+        rows = np.arange(len(chain))
+    strike = chain.strikes(rows)
+    t = years_to_expiry(chain.expiries, now)[chain.expiry[rows]]
+    is_call = chain.side[rows] == CALL
+    if chain.iv is not None and not solve_iv:
+        iv = chain.iv[rows].astype(np.float64)  # compact chains store float32
+        iv_ok = np.isfinite(iv) & (iv > 0)
+    elif chain.bid is not None and chain.ask is not None:
+        mid = 0.5 * (chain.bid[rows].astype(np.float64) + chain.ask[rows])
+        iv, iv_ok = implied_vol(mid, spot, strike, t, rate, div, is_call)
+    else:
+        iv = np.full(strike.size, np.nan)
+        iv_ok = np.zeros(strike.size, dtype=bool)
+    greeks = bs_greeks(spot, strike, t, iv, rate, div, is_call)
+    return pd.DataFrame(
+        {
+            "expiry": np.asarray(chain.expiries, dtype=object)[chain.expiry[rows]],
+            "side": np.asarray(SIDES, dtype=object)[chain.side[rows]],
+            "strike": strike,
+            "t": t,
+            "iv": iv,
+            "iv_ok": iv_ok,
+            **greeks,
+        }
+    )
@@ -0,0 +1,69 @@
+"""Cumulative (prefix-sum) index over expirations for O(strikes) range aggregation."""
+
+import numpy as np
+import pandas as pd
+
+from options_analysis.aggregate import AGG_COLUMNS
+from options_analysis.chain import CALL, PUT, OptionsChain
+
+
+class CumulativeIndex:
+    """
+    Strike grid x expiry cumulative sums of volume and open interest per side.
+
+    Row i of each table holds the per-strike totals of expiry codes [0, i), so any contiguous
+    expiry range [start, stop) is ``table[stop] - table[start]``, independent of its length.
+    """
+
+    def __init__(self, chain: OptionsChain) -> None:
+        strikes = chain.strikes()
+        self.strikes = np.unique(strikes)
+        self.n_expiries = len(chain.expiries)
+        n_strikes = self.strikes.size
+        cell = chain.expiry.astype(np.int64) * n_strikes + np.searchsorted(self.strikes, strikes)
+        size = self.n_expiries * n_strikes
+
+        def cumulative(mask: np.ndarray, weights: np.ndarray | None) -> np.ndarray:
+            grid = np.bincount(
+                cell[mask], weights=None if weights is None else weights[mask], minlength=size
+            )
+            out = np.zeros((self.n_expiries + 1, n_strikes), dtype=np.int64)
+            np.cumsum(
+                np.rint(grid).astype(np.int64).reshape(self.n_expiries, n_strikes),
+                axis=0,
+                out=out[1:],
+            )
+            return out
+
+        calls = chain.side == CALL
+        puts = chain.side == PUT
+        self.call_volume = cumulative(calls, chain.volume)
+        self.call_open_int = cumulative(calls, chain.open_int)
+        self.put_volume = cumulative(puts, chain.volume)
+        self.put_open_int = cumulative(puts, chain.open_int)
+        # Contract counts tell "listed with zero volume" apart from "not listed at all"
+        self.listed = cumulative(np.ones(len(chain), dtype=bool), None)
+
+    def aggregate(
+        self, start: int, stop: int, volume: bool = True, open_int: bool = True
+    ) -> pd.DataFrame:
+        """Calls/puts/all by strike over expiry codes [start, stop), like GetOptsDF."""
+        start = max(0, start)
+        stop = min(self.n_expiries, stop)
+        if stop <= start:
+            return pd.DataFrame(columns=AGG_COLUMNS)
+        present = (self.listed[stop] - self.listed[start]) > 0
+        calls = np.zeros(int(present.sum()), dtype=np.int64)
+        puts = np.zeros_like(calls)
+        if volume:
+            calls += (self.call_volume[stop] - self.call_volume[start])[present]
+            puts += (self.put_volume[stop] - self.put_volume[start])[present]
+        if open_int:
+            calls += (self.call_open_int[stop] - self.call_open_int[start])[present]
+            puts += (self.put_open_int[stop] - self.put_open_int[start])[present]
+        if calls.size == 0:
+            return pd.DataFrame(columns=AGG_COLUMNS)
+        return pd.DataFrame(
+            {"calls": calls, "puts": puts, "all": calls + puts},
+            index=pd.Index(self.strikes[present], dtype=float),
+        )
@@ -0,0 +1,307 @@
+"""Headless stats results and batch static rendering (HTML / images) of options figures."""
+
+import importlib.util
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from html import escape
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from options_analysis.stats import segment_weighted_stats
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+PLOTLY_JS = "plotly.min.js"
+SIDE_LABELS = {"calls": "Calls", "puts": "Puts", "all": "All"}
+
+
+@dataclass
+class SideStats:
+    """Total, weighted strike mean/std and share of the total (%) for one side."""
+
+    total: int
+    mean: float
+    std: float
+    share: float | None = None
+
+
+@dataclass
+class StrikeStats:
+    """Strike distribution of one window: per-strike counts plus per-side summary stats."""
+
+    ticker: str
+    values_label: str
+    dates: list[str]
+    expiration_label: str
+    strikes: np.ndarray
+    counts: dict[str, np.ndarray]
+    sides: dict[str, SideStats] = field(default_factory=dict)
+
+    @property
+    def title(self) -> str:
+        return f"{self.ticker} Options {self.values_label}, {self.expiration_label}"
+
+    def side_lines(self) -> dict[str, str]:
+        """One aligned text line per side: count, mean, std and share."""
+        totals = {k: f"{s.total:,d}" for k, s in self.sides.items()}
+        means = {k: f"{s.mean:.2f}" for k, s in self.sides.items()}
+        stds = {k: f"{s.std:.2f}" for k, s in self.sides.items()}
+        wt, wm, ws = (max(map(len, d.values())) for d in (totals, means, stds))
+        lines = {}
+        for key, side in self.sides.items():
+            line = (
+                f"{SIDE_LABELS[key]}:\t{totals[key]:<{wt}} | Mean = {means[key]:<{wm}}"
+                f" | STD = ±{stds[key]:<{ws}}"
+            )
+            if side.share is not None:
+                line += f" | {side.share}%"
+            lines[key] = line
+        return lines
+
+    def format(self) -> str:
+        """The text block StatsPlot prints."""
+        header = f"---- {self.ticker} Options {self.values_label} Stats ----"
+        lines = self.side_lines()
+        body = [f"\t {lines[k]}" for k in ("all", "calls", "puts")]
+        return "\n".join([header, *body, "-" * len(header)])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Per-strike counts as the GetOptsDF frame."""
+        return pd.DataFrame(self.counts, index=pd.Index(self.strikes))
+
+
+def expiration_label(dates: list[str], all_dates: list[str]) -> str:
+    """Human-readable description of an expiration window used in titles."""
+    if all_dates and dates[0] == all_dates[0] and dates[-1] == all_dates[-1]:
+        return "All Expiration Dates"
+    if len(dates) == 1:
+        return "Expiring at " + dates[0]
+    return "Expiring From " + dates[0] + " Up To " + dates[-1]
+
+
+def strike_stats(
+    opts_df: pd.DataFrame,
+    ticker: str,
+    values_label: str,
+    dates: list[str],
+    all_dates: list[str],
+) -> StrikeStats:
+    """
+    Summarize a GetOptsDF frame without building any figure. Sides with no weight get NaN
+    mean/std (and NaN shares when the window is empty) instead of raising.
+    """
+    strikes = opts_df.index.to_numpy(dtype=np.float64)
+    seg = np.zeros(strikes.size, dtype=np.int64)
+    counts = {k: opts_df[k].to_numpy() for k in ("calls", "puts", "all")}
+    sides: dict[str, SideStats] = {}
+    for key, values in counts.items():
+        s = segment_weighted_stats(seg, 1, strikes, values.astype(np.float64), percentiles=())
+        sides[key] = SideStats(int(s["total"][0]), float(s["mean"][0]), float(s["std"][0]))
+    overall = sides["all"].total
+    for key in ("calls", "puts"):
+        sides[key].share = round(100 * sides[key].total / overall, 2) if overall else float("nan")
+    return StrikeStats(
+        ticker=ticker,
+        values_label=values_label,
+        dates=list(dates),
+        expiration_label=expiration_label(dates, all_dates),
+        strikes=strikes,
+        counts=counts,
+        sides=sides,
+    )
+
+
+def strike_figure(stats: StrikeStats) -> "go.Figure":
+    """Bar chart of calls/puts per strike with the overall line (what StatsPlot shows)."""
+    import plotly.graph_objects as go
+
+    names = {k: v.replace("\t", " ").replace(" |", ",") for k, v in stats.side_lines().items()}
+    fig = go.Figure()
+    fig.add_trace(
+        go.Bar(
+            x=stats.strikes,
+            y=stats.counts["calls"],
+            name=names["calls"],
+            marker_color="rgba(0,0,255,0.5)",
+        )
+    )
+    fig.add_trace(
+        go.Bar(
+            x=stats.strikes,
+            y=stats.counts["puts"],
+            name=names["puts"],
+            marker_color="rgba(255,0,0,0.5)",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=stats.strikes,
+            y=stats.counts["all"],
+            mode="lines",
+            name=names["all"],
+            line={"color": "black", "width": 2},
+        )
+    )
+    fig.update_layout(
+        title=stats.title,
+        xaxis_title="Strike",
+        yaxis_title=f"{stats.values_label} Count",
+        legend={"orientation": "h", "yanchor": "bottom", "y": 1.02, "xanchor": "left", "x": 0},
+        barmode="overlay",
+    )
+    return fig
+
+
+def timeline_figure(ticker: str, df: pd.DataFrame, exp_label: str) -> "go.Figure":
+    """Per-expiration weighted mean strike with std error bars (from GetTimelineStats)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(
+            x=df.index,
+            y=df["calls"],
+            error_y={"type": "data", "array": df["callsErr"], "visible": True},
+            mode="lines+markers",
+            name="Calls",
+            line={"dash": "dot", "color": "rgba(0,0,255,0.4)"},
+            marker={"size": 8},
+            text=[f"{y:.2f}, {z}%" for y, z in zip(df["calls"], df["perCalls"], strict=False)],
+            textposition="top right",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=df.index,
+            y=df["puts"],
+            error_y={"type": "data", "array": df["putsErr"], "visible": True},
+            mode="lines+markers",
+            name="Puts",
+            line={"dash": "dot", "color": "rgba(255,0,0,0.4)"},
+            marker={"size": 8},
+            text=[f"{y:.2f}, {z}%" for y, z in zip(df["puts"], df["perPuts"], strict=False)],
+            textposition="top left",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=df.index,
+            y=df["all"],
+            error_y={"type": "data", "array": df["allErr"], "visible": True},
+            mode="lines+markers",
+            name="All Options",
+            line={"color": "black", "width": 2},
+            marker={"size": 10},
+            text=[f"{y:.2f}" for y in df["all"]],
+            textposition="top center",
+        )
+    )
+    fig.update_traces(textfont_size=10)
+    fig.update_layout(
+        title=f"{ticker} Options Mean and STD spreads, {exp_label}",
+        xaxis_title="Expiration Dates",
+        yaxis_title="Mean and STD Count",
+        legend={"orientation": "h", "yanchor": "bottom", "y": 1.02, "xanchor": "left", "x": 0},
+        xaxis={"tickangle": -45},
+        showlegend=True,
+    )
+    return fig
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name) or "figure"
+
+
+def _file_names(names: Iterable[str]) -> dict[str, str]:
+    """
+    A distinct file name stem per figure name: names that sanitize to the same stem (e.g.
+    "PLTR 01/17/25" and "PLTR 01-17-25"), also only by case, get a counter suffix.
+    """
+    out: dict[str, str] = {}
+    taken: set[str] = set()
+    for name in names:
+        base = _safe_name(name)
+        stem, n = base, 1
+        while stem.lower() in taken:
+            n += 1
+            stem = f"{base}_{n}"
+        taken.add(stem.lower())
+        out[name] = stem
+    return out
+
+
+def write_figures(
+    figures: Mapping[str, "go.Figure"],
+    out_dir: str | Path,
+    combined: bool = False,
+    title: str = "Options report",
+    image_format: str | None = None,
+) -> list[Path]:
+    """
+    Write figures as static files under ``out_dir`` and return the written paths.
+
+    HTML pages reference one shared ``plotly.min.js`` next to them instead of embedding
+    the ~3.5 MB bundle per page. ``combined=True`` writes a single ``report.html`` with all
+    figures; otherwise one ``<name>.html`` per figure. ``image_format`` ("png", "svg",
+    "pdf", ...) additionally exports one image per figure, which needs kaleido.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    if image_format and importlib.util.find_spec("kaleido") is None:
+        raise RuntimeError(f"Writing {image_format} images requires the kaleido package")
+    written: list[Path] = []
+    if figures:
+        from plotly.offline import get_plotlyjs
+
+        js = out / PLOTLY_JS
+        if not js.exists():
+            js.write_text(get_plotlyjs(), encoding="utf-8")
+        written.append(js)
+    names = _file_names(figures)
+    if combined:
+        sections = [
+            f"<h2>{escape(name)}</h2>\n"
+            + fig.to_html(full_html=False, include_plotlyjs=False, div_id=f"fig-{i}")
+            for i, (name, fig) in enumerate(figures.items())
+        ]
+        page = out / "report.html"
+        page.write_text(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset='utf-8'>\n"
+            f"<title>{escape(title)}</title>\n<script src='{PLOTLY_JS}'></script>\n"
+            "</head>\n<body>\n" + "\n".join(sections) + "\n</body>\n</html>\n",
+            encoding="utf-8",
+        )
+        written.append(page)
+    else:
+        for name, fig in figures.items():
+            page = out / f"{names[name]}.html"
+            fig.write_html(page, include_plotlyjs=PLOTLY_JS, full_html=True)
+            written.append(page)
+    if image_format:
+        for name, fig in figures.items():
+            image = out / f"{names[name]}.{image_format}"
+            fig.write_image(image, format=image_format)
+            written.append(image)
+    return written
+
+
+def write_stats_reports(
+    results: Iterable[StrikeStats],
+    out_dir: str | Path,
+    combined: bool = False,
+    image_format: str | None = None,
+) -> list[Path]:
+    """Render many StrikeStats (e.g. one per ticker from a batch) with write_figures."""
+    figures: dict[str, go.Figure] = {}
+    for stats in results:
+        name = stats.ticker or "options"
+        key, n = name, 1
+        while key in figures:
+            n += 1
+            key = f"{name}_{n}"
+        figures[key] = strike_figure(stats)
+    return write_figures(figures, out_dir, combined=combined, image_format=image_format)
@@ -0,0 +1,121 @@
+"""Canonical typed schema for option chain frames, applied once when a source is loaded."""
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+# Canonical column -> accepted source spellings (yfinance, Yahoo HTML, TradeStation)
+COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "Strike": ("Strike", "strike"),
+    "Volume": ("Volume", "volume", "Vol"),
+    "OpenInt": ("OpenInt", "openInterest", "Open Interest", "OpenInterest", "Open Int"),
+    "Bid": ("Bid", "bid"),
+    "Ask": ("Ask", "ask"),
+    "Last": ("Last", "lastPrice", "Last Price", "LastPrice"),
+    "ImpVol": ("ImpVol", "impliedVolatility", "Implied Volatility", "ImpliedVolatility", "IV"),
+}
+# Contract counts are int64 with missing values as 0; everything else is float64 with NaN
+COUNT_COLUMNS = ("Volume", "OpenInt")
+FLOAT_COLUMNS = ("Strike", "Bid", "Ask", "Last", "ImpVol")
+
+# Placeholders sources use for "no value"; these are missing, not parse failures
+MISSING_TOKENS = frozenset({"", "-", "--", "N/A", "n/a", "NA", "nan", "NaN", "None", "null"})
+_SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9}
+
+
+def _parse(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Float64 values and a mask of entries that were present but unparsable."""
+    if values.dtype.kind in "iufb":
+        return values.to_numpy(dtype=np.float64, na_value=np.nan), np.zeros(len(values), bool)
+    out = pd.to_numeric(values, errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan, copy=True
+    )
+    retry = np.isnan(out) & values.notna().to_numpy()
+    failed = np.zeros(len(values), dtype=bool)
+    if not retry.any():
+        return out, failed
+    # Only the entries plain to_numeric rejected go through the text clean-up
+    text = values[retry].astype(str).str.strip()
+    missing = text.isin(MISSING_TOKENS).to_numpy()
+    text = text.str.replace(",", "", regex=False)
+    pct = text.str.endswith("%").to_numpy()
+    text = text.str.rstrip("%")
+    scale = text.str[-1:].str.upper().map(_SUFFIXES)
+    has_suffix = scale.notna().to_numpy()
+    text = text.where(~has_suffix, text.str[:-1])
+    parsed = pd.to_numeric(text, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    parsed = parsed * np.where(has_suffix, scale.to_numpy(dtype=np.float64, na_value=1.0), 1.0)
+    parsed = np.where(pct, parsed / 100.0, parsed)
+    out[retry] = parsed
+    failed[retry] = np.isnan(parsed) & ~missing
+    return out, failed
+
+
+def parse_numeric(values: pd.Series | np.ndarray | list[object]) -> tuple[np.ndarray, int]:
+    """
+    Parse a column to float64 in a few vectorized passes.
+
+    Accepts numbers and text such as "1,234", "1.5K", "2M", "45.3%" (-> 0.453). Missing
+    markers ("-", "N/A", empty) become NaN; the count of other unparsable entries is
+    returned alongside the values.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    out, failed = _parse(series)
+    return out, int(failed.sum())
+
+
+def canonical_name(column: object) -> str | None:
+    """Canonical schema name for a source column, or None if it is not part of the schema."""
+    name = str(column).strip()
+    for canonical, aliases in COLUMN_ALIASES.items():
+        if name in aliases:
+            return canonical
+    return None
+
+
+def normalize_frame(frame: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, int]]:
+    """
+    Rename a calls/puts frame to the canonical columns and give them their schema dtypes.
+
+    Volume and OpenInt are always present (int64, missing -> 0); Strike/Bid/Ask/Last/ImpVol
+    are float64 when the source has them. Other columns are kept untouched. Returns the
+    typed frame and the number of unparsable entries per canonical column (non-zero only).
+    """
+    renames: dict[object, str] = {}
+    for column in frame.columns:
+        canonical = canonical_name(column)
+        if canonical is not None and canonical not in renames.values():
+            renames[column] = canonical
+    out = frame.rename(columns=renames)
+    out = out.loc[:, ~out.columns.duplicated()]
+    failures: dict[str, int] = {}
+    typed: dict[str, np.ndarray] = {}
+    for name in (*FLOAT_COLUMNS, *COUNT_COLUMNS):
+        if name not in out.columns:
+            if name in COUNT_COLUMNS:
+                typed[name] = np.zeros(len(out), dtype=np.int64)
+            continue
+        values, failed = _parse(out[name])
+        if failed.any():
+            failures[name] = int(failed.sum())
+        if name in COUNT_COLUMNS:
+            values = np.nan_to_num(values, nan=0.0).round().astype(np.int64)
+        typed[name] = values
+    out = out.assign(**typed)
+    return out, failures
+
+
+def normalize_big_dict(
+    big_dict: Mapping[str, Mapping[str, pd.DataFrame]],
+) -> tuple[dict[str, dict[str, pd.DataFrame]], dict[str, int]]:
+    """normalize_frame over every expiry block; failure counts are summed per column."""
+    typed: dict[str, dict[str, pd.DataFrame]] = {}
+    failures: dict[str, int] = {}
+    for date, block in big_dict.items():
+        typed[date] = {}
+        for side, frame in block.items():
+            typed[date][side], bad = normalize_frame(frame)
+            for name, n in bad.items():
+                failures[name] = failures.get(name, 0) + n
+    return typed, failures
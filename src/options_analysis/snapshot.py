@@ -0,0 +1,139 @@
+"""On-disk store of chain snapshots: columnar .npy files, memory-mapped when reopened."""
+
+import json
+import os
+import shutil
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+from options_analysis.chain import COLUMNS, ChainBlocks, OptionsChain
+from options_analysis.sources.base import OptionsSourceResult
+
+FORMAT_VERSION = 1
+_KEY_FORMAT = "%Y%m%dT%H%M%S%fZ"
+_META = "meta.json"
+
+
+def _snapshot_key(captured_at: datetime) -> str:
+    if captured_at.tzinfo is None:
+        captured_at = captured_at.replace(tzinfo=UTC)
+    return captured_at.astimezone(UTC).strftime(_KEY_FORMAT)
+
+
+def _parse_key(key: str) -> datetime | None:
+    try:
+        return datetime.strptime(key, _KEY_FORMAT).replace(tzinfo=UTC)
+    except ValueError:
+        return None
+
+
+def write_result(folder: Path, result: OptionsSourceResult, **meta: object) -> None:
+    """
+    Write a source result into an (empty, existing) folder: one .npy per chain column and
+    a meta.json with the expiry labels and offsets plus any extra ``meta`` fields.
+    """
+    chain = result.get("chain")
+    if chain is None:
+        chain = OptionsChain.from_big_dict(result["dates"], result["big_dict"])
+    columns = chain.columns()
+    for name, values in columns.items():
+        np.save(folder / f"{name}.npy", np.ascontiguousarray(values), allow_pickle=False)
+    info = {
+        "version": FORMAT_VERSION,
+        "ticker": result["ticker"],
+        **meta,
+        "dates": list(result["dates"]),
+        "expiries": chain.expiries,
+        "expiry_offsets": [int(x) for x in chain.expiry_offsets],
+        "columns": list(columns),
+        "rows": len(chain),
+        "parse_failures": dict(result.get("parse_failures") or {}),
+    }
+    (folder / _META).write_text(json.dumps(info), encoding="utf-8")
+
+
+def read_result(folder: Path) -> OptionsSourceResult:
+    """
+    Reopen a folder written by write_result as a source result backed by memory-mapped
+    columns; big_dict builds each expiry's frames only when accessed.
+    """
+    meta_path = folder / _META
+    if not meta_path.is_file():
+        raise FileNotFoundError(f"No snapshot at {folder}")
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {meta.get('version')}")
+    # np.memmap cannot map zero bytes, so empty snapshots are loaded normally
+    mode: Literal["r", "r+", "c"] | None = "r" if meta["rows"] else None
+    columns = {
+        name: np.load(folder / f"{name}.npy", mmap_mode=mode, allow_pickle=False)
+        for name in meta["columns"]
+        if name in COLUMNS
+    }
+    chain = OptionsChain.from_sorted(
+        meta["expiries"], columns, np.asarray(meta["expiry_offsets"], dtype=np.int64)
+    )
+    return OptionsSourceResult(
+        ticker=meta["ticker"],
+        dates=meta["dates"],
+        big_dict=ChainBlocks(chain),
+        chain=chain,
+        parse_failures=meta["parse_failures"],
+    )
+
+
+class SnapshotStore:
+    """
+    Snapshots of loaded option chains under ``root/<TICKER>/<UTC capture time>/``.
+
+    Each snapshot is one .npy file per chain column (rows already in chain order) plus a
+    small meta.json with the expiry labels and offsets. Opening a snapshot memory-maps the
+    columns, so only the pages of the expirations actually queried are ever read.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _dir(self, ticker: str, captured_at: datetime) -> Path:
+        return self.root / ticker.upper() / _snapshot_key(captured_at)
+
+    def save(self, result: OptionsSourceResult, captured_at: datetime | None = None) -> Path:
+        """Write a source result as a new snapshot; returns its directory."""
+        captured_at = captured_at or datetime.now(UTC)
+        final = self._dir(result["ticker"], captured_at)
+        if final.exists():
+            raise FileExistsError(f"Snapshot already exists: {final}")
+        tmp = final.with_name(final.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        write_result(tmp, result, captured_at=captured_at.isoformat())
+        os.replace(tmp, final)  # readers never see a half-written snapshot
+        return final
+
+    def tickers(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def captures(self, ticker: str) -> list[datetime]:
+        """Capture times stored for a ticker, oldest first (directory listing only)."""
+        folder = self.root / ticker.upper()
+        if not folder.is_dir():
+            return []
+        times = (_parse_key(p.name) for p in folder.iterdir() if (p / _META).is_file())
+        return sorted(t for t in times if t is not None)
+
+    def open(self, ticker: str, captured_at: datetime | None = None) -> OptionsSourceResult:
+        """
+        Reopen a snapshot (the latest one by default) as a source result backed by
+        memory-mapped columns; big_dict builds each expiry's frames only when accessed.
+        """
+        if captured_at is None:
+            times = self.captures(ticker)
+            if not times:
+                raise FileNotFoundError(f"No snapshots for {ticker.upper()} in {self.root}")
+            captured_at = times[-1]
+        return read_result(self._dir(ticker, captured_at))
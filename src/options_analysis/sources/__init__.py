@@ -1,13 +1,22 @@
 """Options data source adapters."""
 
-from options_analysis.sources.base import OptionsSourceResult
+from options_analysis.sources.base import OptionsSource, OptionsSourceResult, ThreadedSource
+from options_analysis.sources.composite import CompositeSource, SourceStats
+from options_analysis.sources.registry import create_source, register_source, source_names
 from options_analysis.sources.tradestation import TradeStationFileSource
 from options_analysis.sources.yahoo_scrape import YahooScrapeSource
 from options_analysis.sources.yfinance_source import YFinanceSource
 
 __all__ = [
+    "CompositeSource",
+    "OptionsSource",
     "OptionsSourceResult",
+    "SourceStats",
+    "ThreadedSource",
     "TradeStationFileSource",
     "YahooScrapeSource",
     "YFinanceSource",
+    "create_source",
+    "register_source",
+    "source_names",
 ]
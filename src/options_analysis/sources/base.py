@@ -1,13 +1,71 @@
 """Base types for options data sources."""
 
-from typing import TypedDict
+import abc
+import asyncio
+from collections.abc import Mapping
+from typing import NotRequired, Protocol, TypedDict, runtime_checkable
 
 import pandas as pd
 
+from options_analysis.chain import OptionsChain
+from options_analysis.schema import normalize_big_dict
+from options_analysis.sources.fetch import FetchRecord, _start_daemon
+from shared.profiling import span
+
 
 class OptionsSourceResult(TypedDict):
     """Unified result from an options source."""
 
     ticker: str
     dates: list[str]
-    big_dict: dict[str, dict[str, pd.DataFrame]]  # date -> {calls, puts}
+    big_dict: Mapping[str, dict[str, pd.DataFrame]]  # date -> {calls, puts}
+    chain: NotRequired[OptionsChain]  # columnar form of big_dict
+    parse_failures: NotRequired[dict[str, int]]  # unparsable entries per canonical column
+    fetch_log: NotRequired[list[FetchRecord]]  # per-expiry status/latency (web sources)
+    source: NotRequired[str]  # name of the source(s) that produced it (composite sources)
+
+
+def build_source_result(
+    ticker: str, dates: list[str], big_dict: dict[str, dict[str, pd.DataFrame]]
+) -> OptionsSourceResult:
+    """Normalize raw source frames to the typed schema once and build the columnar chain."""
+    with span("normalize", expiries=len(dates)):
+        typed, failures = normalize_big_dict(big_dict)
+        return OptionsSourceResult(
+            ticker=ticker,
+            dates=dates,
+            big_dict=typed,
+            chain=OptionsChain.from_big_dict(dates, typed),
+            parse_failures=failures,
+        )
+
+
+@runtime_checkable
+class OptionsSource(Protocol):
+    """
+    A source of option chains. ``key`` is what the source loads: a ticker for web
+    sources, a file path for file sources.
+    """
+
+    name: str
+
+    def fetch(self, key: str) -> OptionsSourceResult: ...
+
+    async def fetch_async(self, key: str) -> OptionsSourceResult: ...
+
+
+class ThreadedSource(abc.ABC):
+    """
+    Base for sources whose fetch blocks (HTTP, file parsing): fetch_async runs it on its
+    own daemon thread. An abandoned fetch (e.g. the loser of a CompositeSource race) then
+    keeps neither the event loop nor interpreter exit waiting. Subclasses implement fetch.
+    """
+
+    name = "source"
+
+    @abc.abstractmethod
+    def fetch(self, key: str) -> OptionsSourceResult: ...
+
+    async def fetch_async(self, key: str) -> OptionsSourceResult:
+        result: OptionsSourceResult = await asyncio.wrap_future(_start_daemon(self.fetch, key))
+        return result
@@ -0,0 +1,235 @@
+"""Composite source: query several sources concurrently, first complete result or merged."""
+
+import asyncio
+import time
+from collections.abc import Coroutine, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+
+from options_analysis.chain import OptionsChain
+from options_analysis.expiry import parse_expiry
+from options_analysis.sources.base import OptionsSource, OptionsSourceResult, build_source_result
+from options_analysis.sources.fetch import FetchRecord, _start_daemon
+from options_analysis.sources.lazy import LazyExpiries
+
+MODES = ("first", "merge")
+
+
+@dataclass
+class SourceStats:
+    """Per-source counters of a CompositeSource; seconds are wall time of finished calls."""
+
+    calls: int = 0
+    ok: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    wins: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float = 0.0
+    last_error: str = ""
+
+    @property
+    def mean_seconds(self) -> float:
+        finished = self.ok + self.failed
+        return self.total_seconds / finished if finished else float("nan")
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine from sync code, also when an event loop is already running (Jupyter)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def is_complete(result: OptionsSourceResult) -> bool:
+    """True if the result has expirations and every one of them was loaded."""
+    big_dict = result["big_dict"]
+    loaded = set(big_dict.loaded) if isinstance(big_dict, LazyExpiries) else big_dict
+    return bool(result["dates"]) and all(d in loaded for d in result["dates"])
+
+
+def materialize(result: OptionsSourceResult) -> OptionsSourceResult:
+    """
+    A lazy result (LazyExpiries big_dict) with every expiry fetched, concurrently on the
+    mapping's workers; expiries that fail are left out. Other results are returned as is.
+    """
+    lazy = result["big_dict"]
+    if not isinstance(lazy, LazyExpiries):
+        return result
+    try:
+        futures = lazy.prefetch(result["dates"])
+        for fut in futures:
+            fut.exception()  # wait; failures just leave the expiry out
+    finally:
+        lazy.close()
+    blocks = {d: lazy[d] for d in lazy.loaded}
+    return OptionsSourceResult(
+        ticker=result["ticker"],
+        dates=result["dates"],
+        big_dict=blocks,
+        chain=OptionsChain.from_big_dict(result["dates"], blocks),
+        parse_failures=dict(lazy.parse_failures),
+    )
+
+
+def _date_key(label: str) -> tuple[int, str]:
+    parsed = parse_expiry(label)
+    return (0, parsed.isoformat()) if parsed is not None else (1, label)
+
+
+def merge_results(results: Sequence[tuple[str, OptionsSourceResult]]) -> OptionsSourceResult:
+    """
+    Union of several results for one ticker: each expiry comes from the first result (in
+    the given order) that has it; dates are in expiry order. Logs are kept with the source
+    name prefixed to each key; parse failures are summed.
+    """
+    blocks: dict[str, dict[str, pd.DataFrame]] = {}
+    fetch_log: list[FetchRecord] = []
+    failures: dict[str, int] = {}
+    for name, result in results:
+        for date in result["dates"]:
+            if date not in blocks and date in result["big_dict"]:
+                blocks[date] = result["big_dict"][date]
+        for record in result.get("fetch_log") or []:
+            fetch_log.append(FetchRecord(**{**record, "key": f"{name}:{record['key']}"}))
+        for column, n in (result.get("parse_failures") or {}).items():
+            failures[column] = failures.get(column, 0) + n
+    dates = sorted(blocks, key=_date_key)
+    merged = build_source_result(results[0][1]["ticker"], dates, blocks)
+    merged["parse_failures"] = failures
+    merged["fetch_log"] = fetch_log
+    merged["source"] = "+".join(name for name, _ in results)
+    return merged
+
+
+class CompositeSource:
+    """
+    Fan one fetch out to several sources concurrently.
+
+    ``mode="first"`` returns the first complete result (every expiration loaded) and
+    cancels the rest; a slow or throttled source no longer holds up the run when another
+    one has already answered. If no source returns a complete result, the partial one
+    with the most expirations is used. ``mode="merge"`` waits for every source and merges
+    their expirations (earlier sources take precedence). ``timeout`` bounds each source.
+    Lazy results (e.g. yfinance with ``lazy=True``) have all their expirations fetched
+    first (see ``materialize``), so they compete and merge on what actually loaded.
+
+    ``stats`` keeps per-source calls, successes, failures, cancellations, wins and latency.
+    The returned result names the source(s) it came from in ``result["source"]``.
+    """
+
+    name = "composite"
+
+    def __init__(
+        self,
+        sources: Sequence[OptionsSource] | Mapping[str, OptionsSource],
+        mode: str = "first",
+        timeout: float | None = None,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if isinstance(sources, Mapping):
+            self.sources = dict(sources)
+        else:
+            self.sources = {}
+            for source in sources:
+                name, n = source.name, 1
+                while name in self.sources:
+                    n += 1
+                    name = f"{source.name}_{n}"
+                self.sources[name] = source
+        if not self.sources:
+            raise ValueError("CompositeSource needs at least one source")
+        self.mode = mode
+        self.timeout = timeout
+        self.stats = {name: SourceStats() for name in self.sources}
+
+    async def _timed(self, name: str, source: OptionsSource, key: str) -> OptionsSourceResult:
+        stats = self.stats[name]
+        stats.calls += 1
+        start = time.monotonic()
+
+        def finished() -> None:
+            stats.last_seconds = time.monotonic() - start
+            stats.total_seconds += stats.last_seconds
+
+        async def fetch() -> OptionsSourceResult:
+            result = await source.fetch_async(key)
+            if isinstance(result["big_dict"], LazyExpiries):
+                # Race and merge on fetched data, not on an expiry list
+                result = await asyncio.wrap_future(_start_daemon(materialize, result))
+            return result
+
+        try:
+            result = await asyncio.wait_for(fetch(), self.timeout)
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        except Exception as e:
+            stats.failed += 1
+            stats.last_error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            finished()
+            raise
+        stats.ok += 1
+        finished()
+        return result
+
+    def _won(self, name: str, result: OptionsSourceResult) -> OptionsSourceResult:
+        self.stats[name].wins += 1
+        result["source"] = name
+        return result
+
+    async def fetch_async(self, key: str) -> OptionsSourceResult:
+        order = list(self.sources)
+        tasks = {
+            asyncio.ensure_future(self._timed(name, source, key)): name
+            for name, source in self.sources.items()
+        }
+        errors: dict[str, str] = {}
+        if self.mode == "merge":
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            results = []
+            for name, outcome in zip(tasks.values(), outcomes, strict=True):
+                if isinstance(outcome, BaseException):
+                    errors[name] = self.stats[name].last_error or type(outcome).__name__
+                else:
+                    results.append((name, outcome))
+            if not results:
+                raise RuntimeError(f"Every source failed for {key}: {errors}")
+            for name, _ in results:
+                self.stats[name].wins += 1
+            return merge_results(results)
+
+        partial: list[tuple[str, OptionsSourceResult]] = []
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Tasks finishing together are taken in source order
+                for task in sorted(done, key=lambda t: order.index(tasks[t])):
+                    name = tasks[task]
+                    if task.exception() is not None:
+                        errors[name] = self.stats[name].last_error
+                        continue
+                    if is_complete(task.result()):
+                        return self._won(name, task.result())
+                    partial.append((name, task.result()))
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        if partial:
+            name, result = max(partial, key=lambda nr: len(nr[1]["big_dict"]))
+            return self._won(name, result)
+        raise RuntimeError(f"Every source failed for {key}: {errors}")
+
+    def fetch(self, key: str) -> OptionsSourceResult:
+        result: OptionsSourceResult = run_sync(self.fetch_async(key))
+        return result
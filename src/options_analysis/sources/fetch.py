@@ -0,0 +1,240 @@
+"""Concurrent fetching for the web sources: bounded workers, retries, rate limiting."""
+
+import random
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Any, TypedDict
+
+if TYPE_CHECKING:
+    import requests
+
+
+class FetchRecord(TypedDict):
+    """Outcome of one expiry fetch: status "ok", "cached", "error" or "timeout"."""
+
+    key: str
+    status: str
+    attempts: int
+    seconds: float  # latency of the last attempt
+    error: str
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``rate`` requests per second on average, bursts up to
+    ``capacity``. One instance can be shared by every loader hitting the same host.
+    """
+
+    def __init__(
+        self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available (returns 0.0), else the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        while (delay := self.try_acquire()) > 0:
+            time.sleep(delay)
+
+
+# Shared by the yfinance and Yahoo HTML loaders (per process), so concurrent tickers in
+# one process stay under a common request rate
+YAHOO_RATE_LIMIT = TokenBucket(rate=5.0, capacity=10)
+
+
+def make_session(pool_size: int = 8, user_agent: str = "Mozilla/5.0") -> "requests.Session":
+    """
+    Keep-alive session whose connection pool fits ``pool_size`` concurrent requests.
+    Transport-level retries are off: retrying is done by RetryPolicy, with backoff.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = user_agent
+    return session
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits U(0, min(max, base * 2**(n-1)))."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    jitter: bool = True
+
+    def delay(self, attempt: int, rng: random.Random | None = None) -> float:
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return (rng or random).uniform(0, cap) if self.jitter else cap
+
+
+DEFAULT_RETRY = RetryPolicy()
+
+
+def call_with_retry(
+    fn: Callable[[], Any],
+    retry: RetryPolicy = DEFAULT_RETRY,
+    limiter: TokenBucket | None = None,
+) -> Any:
+    """Run fn in the calling thread with rate limiting and backoff (no timeout)."""
+    for attempt in range(1, retry.max_attempts + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return fn()
+        except Exception:
+            if attempt == retry.max_attempts:
+                raise
+            time.sleep(retry.delay(attempt))
+    raise AssertionError("unreachable")
+
+
+def _start_daemon(fn: Callable[..., Any], *args: Any) -> Future[Any]:
+    """
+    Run fn on a fresh daemon thread. Unlike a pool worker, an abandoned (hung) attempt
+    neither takes capacity from later attempts nor blocks interpreter exit.
+    """
+    fut: Future[Any] = Future()
+    fut.set_running_or_notify_cancel()
+
+    def target() -> None:
+        try:
+            fut.set_result(fn(*args))
+        except BaseException as e:
+            fut.set_exception(e)
+
+    Thread(target=target, daemon=True, name="fetch").start()
+    return fut
+
+
+def fetch_concurrently(
+    keys: Iterable[str],
+    fetch: Callable[[str], Any],
+    max_workers: int = 4,
+    timeout: float | None = 30.0,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    limiter: TokenBucket | None = None,
+) -> tuple[dict[str, Any], list[FetchRecord]]:
+    """
+    Fetch many keys on at most ``max_workers`` threads and return (results, records).
+
+    Each attempt waits for a token from ``limiter``. A failed attempt, or one still
+    running after ``timeout`` seconds, is retried after a jittered backoff until
+    ``retry.max_attempts`` is reached. (A hung attempt cannot be interrupted; it is
+    abandoned and its result ignored.) Failed keys are missing from the results.
+    Records are in input order and give per-key status, attempts and latency.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    order = list(dict.fromkeys(keys))
+    results: dict[str, Any] = {}
+    records: dict[str, FetchRecord] = {}
+    attempts = dict.fromkeys(order, 0)
+    # (key, not-before time); due keys are submitted in input order
+    ready: list[tuple[str, float]] = [(k, 0.0) for k in order]
+    running: dict[Future[Any], tuple[str, dict[str, float]]] = {}
+
+    def run(key: str, clock: dict[str, float]) -> Any:
+        value = fetch(key)
+        clock["end"] = time.monotonic()
+        return value
+
+    def failed(key: str, status: str, error: str, seconds: float) -> None:
+        if attempts[key] < retry.max_attempts:
+            ready.append((key, time.monotonic() + retry.delay(attempts[key])))
+            return
+        records[key] = FetchRecord(
+            key=key, status=status, attempts=attempts[key], seconds=seconds, error=error
+        )
+
+    while ready or running:
+        now = time.monotonic()
+        wake: list[float] = []
+        # Submit due keys (oldest first) while there is a free worker and a token
+        for item in sorted(ready, key=lambda r: r[1]):
+            if len(running) >= max_workers:
+                break
+            key, not_before = item
+            if not_before > now:
+                wake.append(not_before)
+                continue
+            delay = limiter.try_acquire() if limiter is not None else 0.0
+            if delay > 0:
+                wake.append(now + delay)
+                break
+            ready.remove(item)
+            attempts[key] += 1
+            clock = {"start": time.monotonic()}
+            running[_start_daemon(run, key, clock)] = (key, clock)
+        if timeout is not None:
+            wake += [c["start"] + timeout for _, c in running.values()]
+        if not running:
+            time.sleep(max(0.0, min(wake) - time.monotonic()) if wake else 0.0)
+            continue
+        wait_for = max(0.0, min(wake) - time.monotonic()) if wake else None
+        done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for fut in done:
+            key, clock = running.pop(fut)
+            seconds = clock.get("end", time.monotonic()) - clock["start"]
+            try:
+                results[key] = fut.result()
+            except Exception as e:
+                failed(key, "error", f"{type(e).__name__}: {e}", round(seconds, 4))
+                continue
+            records[key] = FetchRecord(
+                key=key,
+                status="ok",
+                attempts=attempts[key],
+                seconds=round(seconds, 4),
+                error="",
+            )
+        if timeout is not None:
+            now = time.monotonic()
+            for fut, (key, clock) in list(running.items()):
+                if now - clock["start"] >= timeout and not fut.done():
+                    del running[fut]
+                    failed(key, "timeout", f"no response after {timeout:g}s", timeout)
+    return results, [records[k] for k in order]
+
+
+def fetch_with_timeout(
+    key: str,
+    fetch: Callable[[str], Any],
+    timeout: float | None = 30.0,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    limiter: TokenBucket | None = None,
+) -> Any:
+    """
+    fetch(key) with the per-attempt timeout, retries and rate limiting of
+    fetch_concurrently; raises when every attempt failed (TimeoutError if the last one
+    timed out).
+    """
+    results, (record,) = fetch_concurrently([key], fetch, 1, timeout, retry, limiter)
+    if key in results:
+        return results[key]
+    error = TimeoutError if record["status"] == "timeout" else RuntimeError
+    raise error(f"{key}: {record['error']} (after {record['attempts']} attempts)")
@@ -0,0 +1,149 @@
+"""Lazily fetched expirations: a big_dict that downloads each expiry on first access."""
+
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+
+import pandas as pd
+
+from options_analysis.schema import normalize_frame
+
+BlockFetcher = Callable[[str], Mapping[str, pd.DataFrame]]
+
+
+class LazyExpiries(Mapping[str, dict[str, pd.DataFrame]]):
+    """
+    date -> {calls, puts} mapping whose blocks are fetched (and normalized to the typed
+    schema) the first time they are accessed; later accesses return the same frames.
+
+    The keys are known up front, so ``len``, ``in`` and iteration over keys never fetch.
+    ``prefetch`` starts background downloads of the first N dates (the nearest expiries).
+    Concurrent accesses to the same date share one request.
+    """
+
+    def __init__(
+        self,
+        dates: Iterable[str],
+        fetch: BlockFetcher,
+        prefetch: int = 0,
+        max_workers: int = 4,
+    ) -> None:
+        self._dates = list(dict.fromkeys(dates))
+        self._known = set(self._dates)
+        self._fetch = fetch
+        self._max_workers = max(1, max_workers)
+        self._futures: dict[str, Future[dict[str, pd.DataFrame]]] = {}
+        self._lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self.parse_failures: dict[str, int] = {}
+        if prefetch > 0:
+            self.prefetch(self._dates[:prefetch])
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="expiry-fetch"
+            )
+        return self._executor
+
+    def _load_block(self, date: str) -> dict[str, pd.DataFrame]:
+        raw = self._fetch(date)
+        block: dict[str, pd.DataFrame] = {}
+        for side, frame in raw.items():
+            block[side], failures = normalize_frame(frame)
+            with self._lock:
+                for name, n in failures.items():
+                    self.parse_failures[name] = self.parse_failures.get(name, 0) + n
+        return block
+
+    def _claim(self, date: str) -> tuple[Future[dict[str, pd.DataFrame]], bool]:
+        """The date's future and whether the caller must run the fetch itself."""
+        with self._lock:
+            fut = self._futures.get(date)
+            # A failed or cancelled fetch is retried on the next access
+            if fut is not None and not (fut.cancelled() or (fut.done() and fut.exception())):
+                return fut, False
+            fut = Future()
+            self._futures[date] = fut
+            return fut, True
+
+    def _run(self, date: str, fut: Future[dict[str, pd.DataFrame]]) -> None:
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            fut.set_result(self._load_block(date))
+        except BaseException as e:
+            fut.set_exception(e)
+
+    def prefetch(self, dates: Iterable[str]) -> list[Future[dict[str, pd.DataFrame]]]:
+        """Start background fetches for the given dates; returns their futures."""
+        futures = []
+        for date in dates:
+            if date not in self._known:
+                continue
+            fut, owner = self._claim(date)
+            if owner:
+                self._pool().submit(self._run, date, fut)
+            futures.append(fut)
+        return futures
+
+    def load(self, dates: Iterable[str]) -> None:
+        """Fetch the given dates concurrently and wait for them (errors are raised)."""
+        futures = self.prefetch(dates)
+        wait(futures)
+        for fut in futures:
+            fut.result()
+
+    def transform(
+        self,
+        dates: Iterable[str],
+        fn: Callable[[dict[str, pd.DataFrame]], dict[str, pd.DataFrame]],
+    ) -> None:
+        """Replace the fetched blocks of the given dates with ``fn(block)``; others are skipped."""
+        for date in dates:
+            with self._lock:
+                fut = self._futures.get(date)
+            if fut is None or not fut.done() or fut.cancelled() or fut.exception() is not None:
+                continue
+            done: Future[dict[str, pd.DataFrame]] = Future()
+            done.set_result(fn(fut.result()))
+            with self._lock:
+                if self._futures.get(date) is fut:
+                    self._futures[date] = done
+
+    @property
+    def loaded(self) -> list[str]:
+        """Dates fetched successfully so far, in source order."""
+        with self._lock:
+            done = {
+                d
+                for d, f in self._futures.items()
+                if f.done() and not f.cancelled() and f.exception() is None
+            }
+        return [d for d in self._dates if d in done]
+
+    def __getitem__(self, date: str) -> dict[str, pd.DataFrame]:
+        if date not in self._known:
+            raise KeyError(date)
+        fut, owner = self._claim(date)
+        if owner:
+            self._run(date, fut)  # first access fetches in the caller's thread
+        return fut.result()
+
+    def __contains__(self, date: object) -> bool:
+        return date in self._known
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dates)
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def close(self) -> None:
+        """Stop the prefetch workers (pending prefetches are cancelled)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        with self._lock:
+            for fut in self._futures.values():
+                fut.cancel()  # only affects fetches that never started
@@ -0,0 +1,67 @@
+"""Registry of options sources by name, so callers can pick sources from configuration."""
+
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from options_analysis.sources.base import OptionsSource
+from options_analysis.sources.composite import CompositeSource
+from options_analysis.sources.tradestation import TradeStationFileSource
+from options_analysis.sources.yahoo_scrape import YahooScrapeSource
+from options_analysis.sources.yfinance_source import YFinanceSource
+
+SourceFactory = Callable[..., OptionsSource]
+
+# Keyword arguments of a "+" name that configure the CompositeSource, not its parts
+COMPOSITE_OPTIONS = ("mode", "timeout")
+
+_REGISTRY: dict[str, SourceFactory] = {
+    "yfinance": YFinanceSource,
+    "yahoo": YahooScrapeSource,
+    "tradestation": TradeStationFileSource,
+}
+
+
+def register_source(name: str, factory: SourceFactory, replace: bool = False) -> None:
+    """Register a source factory (a class or a function returning an OptionsSource)."""
+    key = name.strip().lower()
+    if key in _REGISTRY and not replace:
+        raise ValueError(f"Source {key!r} is already registered")
+    _REGISTRY[key] = factory
+
+
+def source_names() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+def _accepts(factory: SourceFactory, name: str) -> bool:
+    try:
+        params = inspect.signature(factory).parameters.values()
+    except (TypeError, ValueError):  # no introspectable signature: let the call decide
+        return True
+    return any(p.name == name or p.kind is p.VAR_KEYWORD for p in params)
+
+
+def _factory(name: str) -> SourceFactory:
+    key = name.strip().lower()
+    if key not in _REGISTRY:
+        raise ValueError(f"Unknown source {name!r}; available: {', '.join(source_names())}")
+    return _REGISTRY[key]
+
+
+def create_source(name: str, **kwargs: Any) -> OptionsSource:
+    """
+    Build a registered source; keyword arguments go to its factory. Names joined with
+    "+" (e.g. "yfinance+yahoo") build a CompositeSource of those sources in that order:
+    ``mode`` and ``timeout`` configure the composite and every other keyword argument
+    goes to each part whose factory takes it (``lazy`` only to yfinance, for example).
+    """
+    if "+" not in name:
+        return _factory(name)(**kwargs)
+    factories = [_factory(part) for part in name.split("+")]
+    options = {k: kwargs.pop(k) for k in COMPOSITE_OPTIONS if k in kwargs}
+    unused = [k for k in kwargs if not any(_accepts(f, k) for f in factories)]
+    if unused:
+        raise TypeError(f"No source in {name!r} takes {', '.join(map(repr, unused))}")
+    parts = [f(**{k: v for k, v in kwargs.items() if _accepts(f, k)}) for f in factories]
+    return CompositeSource(parts, **options)
@@ -1,85 +1,335 @@
 """TradeStation file source (xls, xlsx, csv)."""
 
+import warnings
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
+from numpy.typing import NDArray
 
-from options_analysis.sources.base import OptionsSourceResult
+from options_analysis.chain import CALL, OPTIONAL_COLUMNS, ChainBlocks, OptionsChain
+from options_analysis.schema import COUNT_COLUMNS, MISSING_TOKENS, canonical_name, parse_numeric
+from options_analysis.sources.base import OptionsSourceResult, ThreadedSource
+from shared.profiling import span
 
+if TYPE_CHECKING:
+    from pandas.io.parsers import TextFileReader
 
-def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Ensure Strike, Volume, OpenInt column names (title case)."""
-    col_map = {c: str(c).replace(" ", "") for c in df.columns}
-    df = df.rename(columns=col_map)
-    renames: dict[str, str] = {}
-    for c in df.columns:
-        cnorm = c.replace(" ", "")
-        if cnorm.lower() == "strike" and cnorm != "Strike":
-            renames[c] = "Strike"
-        elif cnorm == "OpenInterest" or "Open Interest" in c:
-            renames[c] = "OpenInt"
-    df = df.rename(columns=renames)
-    if "OpenInt" not in df.columns and "Volume" in df.columns:
-        df["OpenInt"] = 0
-    return df
+    # Imported lazily at runtime: file_cache -> snapshot -> sources would be circular
+    from options_analysis.file_cache import ParsedFileCache
 
+# Bump when parsing changes so cached results of older loaders are not reused
+LOADER_VERSION = 1
 
-def load_tradestation_file(file_path: str | Path) -> OptionsSourceResult:
+# First cells that are neither numbers nor expiration labels
+_NOT_LABELS = MISSING_TOKENS | {"Pos"}
+# Rows searched for the header before falling back to scanning the whole file
+_HEADER_SCAN_ROWS = 200
+_CHAIN_COLUMNS = {"Strike": "strike", "Volume": "volume", "OpenInt": "open_int"} | {
+    name: key for key, name in OPTIONAL_COLUMNS.items()
+}
+
+
+@dataclass(frozen=True)
+class _Layout:
+    """Cell index of each canonical column on the calls side and on the puts side."""
+
+    calls: dict[str, int]
+    puts: dict[str, int]
+
+
+def _layout(names: list[str]) -> _Layout:
+    """Calls run up to the (first) Strike column, puts from the (last) one onwards."""
+    strike_cols = [i for i, name in enumerate(names) if name.lower() == "strike"]
+    calls_end, puts_start = strike_cols[0] + 1, strike_cols[-1]
+
+    def columns(indexes: Iterable[int]) -> dict[str, int]:
+        found: dict[str, int] = {}
+        for i in indexes:
+            canonical = canonical_name(names[i])
+            if canonical is not None and canonical not in found:
+                found[canonical] = i
+        return found
+
+    return _Layout(columns(range(calls_end)), columns(range(puts_start, len(names))))
+
+
+def _find_header(cells: np.ndarray) -> tuple[int, _Layout] | None:
+    """Index of the header row (the one naming a Strike column) and its layout."""
+    rows = ([str(x).replace(" ", "") for x in row] for row in cells)
+    found = next(
+        ((i, names) for i, names in enumerate(rows) if any(n.lower() == "strike" for n in names)),
+        None,
+    )
+    return None if found is None else (found[0], _layout(found[1]))
+
+
+def _label_mask(first: pd.Series) -> NDArray[np.bool_]:
+    """Expiration rows are the ones whose first cell is present text rather than a number."""
+    present = first.notna().to_numpy(dtype=bool)
+    not_label = first.astype(str).str.strip().isin(_NOT_LABELS).to_numpy(dtype=bool)
+    mask: NDArray[np.bool_] = present & np.isnan(parse_numeric(first)[0]) & ~not_label
+    return mask
+
+
+def _label(cell: object) -> str:
+    return str(cell).split("\t")[0].replace("   ", "").strip()
+
+
+def _typed_rows(
+    rows: pd.DataFrame, expiry: np.ndarray, layout: _Layout, failures: dict[str, int]
+) -> dict[str, np.ndarray | None]:
     """
-    Load options data from a TradeStation-format file.
-    File should be named <ticker>.[xls, xlsx, csv].
+    Chain columns for contract rows (calls and puts halves of each row), parsing every
+    cell column once. Rows without a strike are dropped; unparsable entries are counted
+    into ``failures`` per canonical column.
     """
-    path = Path(file_path)
-    path_str = str(path).lower()
-    if not path_str.endswith((".xls", ".xlsx", ".csv")):
+    parts: dict[str, list[np.ndarray | None]] = {key: [] for key in ("expiry", "side")}
+    parts |= {key: [] for key in _CHAIN_COLUMNS.values()}
+    for side, columns in enumerate((layout.calls, layout.puts), start=CALL):
+        values: dict[str, np.ndarray] = {}
+        for name, index in columns.items():
+            values[name], bad = parse_numeric(rows.iloc[:, index])
+            if bad:
+                failures[name] = failures.get(name, 0) + bad
+        valid = ~np.isnan(values["Strike"])
+        parts["expiry"].append(expiry[valid])
+        parts["side"].append(np.full(int(valid.sum()), side, dtype=np.int8))
+        for name, key in _CHAIN_COLUMNS.items():
+            if name in values:
+                arr = values[name][valid]
+                if name in COUNT_COLUMNS:
+                    arr = np.nan_to_num(arr, nan=0.0).round().astype(np.int64)
+                parts[key].append(arr)
+            elif name in COUNT_COLUMNS:
+                parts[key].append(np.zeros(int(valid.sum()), dtype=np.int64))
+            else:
+                parts[key].append(None)
+    return _concat([parts])
+
+
+def _concat(pieces: list[dict[str, list[np.ndarray | None]]]) -> dict[str, np.ndarray | None]:
+    """Join per-side / per-chunk columns; an optional column absent everywhere stays None."""
+    merged = {key: [a for piece in pieces for a in piece[key]] for key in pieces[0]}
+    sizes = [a.size for a in merged["expiry"] if a is not None]
+    out: dict[str, np.ndarray | None] = {}
+    for key, arrays in merged.items():
+        if not arrays or all(a is None for a in arrays):
+            out[key] = None
+            continue
+        out[key] = np.concatenate(
+            [a if a is not None else np.full(n, np.nan) for a, n in zip(arrays, sizes, strict=True)]
+        )
+    return out
+
+
+def _chain(dates: list[str], columns: dict[str, np.ndarray | None]) -> OptionsChain:
+    if columns["expiry"] is None or columns["strike"] is None:
+        return OptionsChain.empty(dates)
+    return OptionsChain(
+        dates,
+        columns["expiry"],
+        columns["side"],  # type: ignore[arg-type]
+        columns["strike"],
+        columns["volume"],  # type: ignore[arg-type]
+        columns["open_int"],  # type: ignore[arg-type]
+        bid=columns["bid"],
+        ask=columns["ask"],
+        iv=columns["iv"],
+    )
+
+
+def _ticker(path: Path) -> str:
+    if not str(path).lower().endswith((".xls", ".xlsx", ".csv")):
         raise ValueError("Only .xls, .xlsx or .csv files are allowed")
     ticker = path.stem
     if not ticker:
         raise ValueError("Bad file name format; use <ticker>.[xls, xlsx, csv]")
-    ticker = str(ticker).strip().upper().lstrip("0")
+    return str(ticker).strip().upper().lstrip("0")
+
+
+def _read_cells(path: Path, nrows: int | None = None) -> NDArray[np.object_]:
+    """Cells of the export as text (object dtype); used only to locate the header row."""
+    if path.suffix.lower() == ".csv":
+        frame = pd.read_csv(path, header=None, dtype=object, skip_blank_lines=False, nrows=nrows)
+    else:
+        frame = pd.read_excel(path, header=None, dtype=object, nrows=nrows)
+    cells: NDArray[np.object_] = frame.to_numpy(dtype=object)
+    return cells
+
 
-    raw = pd.read_excel(path) if path.suffix.lower() != ".csv" else pd.read_csv(path)
-    temp_df = pd.DataFrame(raw.values)
-    first_row = [str(x).replace(" ", "") for x in list(temp_df.iloc[0])]
-    first_row_lower = [x.lower() for x in first_row]
-    if "strike" not in first_row_lower:
+def _locate_header(path: Path) -> tuple[int, int, _Layout]:
+    """Header row index, row width and layout; TS files may have title rows above it."""
+    cells = _read_cells(path, _HEADER_SCAN_ROWS)
+    found = _find_header(cells)
+    if found is None and len(cells) == _HEADER_SCAN_ROWS:
+        cells = _read_cells(path)
+        found = _find_header(cells)
+    if found is None:
         raise ValueError("No 'strike' column found in file")
-    strike_index = first_row_lower.index("strike")
+    return found[0], cells.shape[1], found[1]
 
-    dates: list[str] = []
-    indexes: list[int] = []
-    for idx, val in enumerate(list(temp_df.iloc[:, 0])):
-        if isinstance(val, str) and val != "Pos":
-            date = val.split("\t")[0].replace("   ", "").strip()
-            dates.append(date)
-            indexes.append(idx)
 
-    big_dict: dict[str, dict[str, pd.DataFrame]] = {}
-    for i, date in enumerate(dates):
-        start_row = indexes[i] + 1
-        end_row = indexes[i + 1] if i + 1 < len(indexes) else len(temp_df.index)
+def _read_body(path: Path, skip: int, width: int) -> pd.DataFrame:
+    """
+    Rows below the header. With the header row skipped the C parser types plain numeric
+    columns itself, so only columns holding text ("1,200", "3.4K", labels) stay object.
+    """
+    if path.suffix.lower() != ".csv":
+        frame = pd.read_excel(path, header=None, skiprows=skip)
+        return frame.reindex(columns=range(width))
+    return pd.read_csv(path, header=None, names=range(width), skiprows=skip, skip_blank_lines=False)
+
+
+def _read_body_chunks(path: Path, skip: int, width: int, chunksize: int) -> "TextFileReader":
+    """_read_body for a CSV as a reader of ``chunksize``-row frames."""
+    return pd.read_csv(
+        path,
+        header=None,
+        names=range(width),
+        skiprows=skip,
+        skip_blank_lines=False,
+        chunksize=chunksize,
+    )
+
+
+def _iter_segments(path: Path, chunksize: int) -> Iterator[tuple[str, pd.DataFrame, _Layout]]:
+    """
+    Stream a CSV export as (expiration label, its contract rows, layout), reading
+    ``chunksize`` rows at a time. Only the current expiration's rows are held across chunks.
+    """
+    header, width, layout = _locate_header(path)
+    label: str | None = None
+    pending: list[pd.DataFrame] = []
+    with _read_body_chunks(path, header + 1, width, chunksize) as reader:
+        while True:
+            with warnings.catch_warnings():
+                # Columns mixing numbers and text come back as object, which is handled
+                warnings.simplefilter("ignore", pd.errors.DtypeWarning)
+                frame = next(reader, None)
+            if frame is None:
+                break
+            starts = np.flatnonzero(_label_mask(frame.iloc[:, 0]))
+            bounds = [*starts.tolist(), len(frame)]
+            if label is not None:
+                pending.append(frame.iloc[: bounds[0]])
+            for i, start in enumerate(starts):
+                if label is not None:
+                    yield label, pd.concat(pending), layout
+                label = _label(frame.iloc[start, 0])
+                pending = [frame.iloc[start + 1 : bounds[i + 1]]]
+    if label is not None:
+        yield label, pd.concat(pending), layout
 
-        calls = pd.DataFrame(temp_df.iloc[start_row:end_row, : strike_index + 1])
-        calls.columns = first_row[: strike_index + 1]
-        calls.index = np.arange(1, len(calls) + 1)
-        calls = calls.drop("Pos", axis=1, errors="ignore")
-        calls = _normalize_columns(calls)
 
-        puts = pd.DataFrame(temp_df.iloc[start_row:end_row, strike_index:])
-        puts.columns = first_row[strike_index:]
-        puts.index = np.arange(1, len(puts) + 1)
-        puts = puts.drop("Pos", axis=1, errors="ignore")
-        puts = _normalize_columns(puts)
+def iter_tradestation_csv(
+    file_path: str | Path, chunksize: int = 100_000
+) -> Iterator[tuple[str, dict[str, pd.DataFrame]]]:
+    """
+    Yield (expiration label, {calls, puts}) from a TradeStation CSV export one expiration
+    at a time, reading ``chunksize`` rows at a time, so memory is bounded by one chunk
+    plus one expiration. Frames have the typed schema columns; a label repeated in the
+    file is yielded once per block.
+    """
+    path = Path(file_path)
+    _ticker(path)
+    for label, rows, layout in _iter_segments(path, chunksize):
+        failures: dict[str, int] = {}
+        columns = _typed_rows(rows, np.zeros(len(rows), dtype=np.int32), layout, failures)
+        yield label, _chain([label], columns).block(label)
 
-        big_dict[date] = {"calls": calls, "puts": puts}
 
-    return OptionsSourceResult(ticker=ticker, dates=dates, big_dict=big_dict)
+def load_tradestation_file(
+    file_path: str | Path,
+    chunksize: int | None = None,
+    cache: "ParsedFileCache | None" = None,
+) -> OptionsSourceResult:
+    """
+    Load options data from a TradeStation-format file.
+    File should be named <ticker>.[xls, xlsx, csv].
 
+    The export is one header row (calls columns, Strike, puts columns) followed by blocks
+    of contracts, each introduced by a row holding the expiration label in the first cell.
+    Block boundaries come from one vectorized mask over the first column and every cell
+    column is parsed once, straight into the columnar chain; big_dict is a lazy view of it.
+    With ``chunksize`` a CSV is read that many rows at a time, so only the typed output
+    and one chunk of rows are in memory.
 
-class TradeStationFileSource:
+    Parsed results are kept in ``cache`` keyed by file content and LOADER_VERSION, so
+    loading an unchanged file again skips parsing. Excel files use
+    options_analysis.file_cache.default_file_cache() when no cache is given (CSV parses
+    about as fast as it hashes, so it is cached only on request).
+    """
+    from options_analysis.file_cache import default_file_cache
+
+    path = Path(file_path)
+    ticker = _ticker(path)
+    if cache is None and path.suffix.lower() != ".csv":
+        cache = default_file_cache()
+
+    def parse(p: Path) -> OptionsSourceResult:
+        with span("tradestation.parse"):
+            return _parse_file(p, ticker, chunksize)
+
+    with span("tradestation.load", file=path.name):
+        if cache is None:
+            return parse(path)
+        result = cache.load(path, "tradestation", LOADER_VERSION, parse)
+    result["ticker"] = ticker  # copies of one export under other names share an entry
+    return result
+
+
+def _parse_file(path: Path, ticker: str, chunksize: int | None) -> OptionsSourceResult:
+    codes: dict[str, int] = {}  # a label repeated in the file is merged into one expiry
+    failures: dict[str, int] = {}
+
+    if chunksize is not None and path.suffix.lower() == ".csv":
+        pieces = []
+        for label, rows, layout in _iter_segments(path, chunksize):
+            code = codes.setdefault(label, len(codes))
+            expiry = np.full(len(rows), code, dtype=np.int32)
+            pieces.append(_typed_rows(rows, expiry, layout, failures))
+        columns = _concat([{k: [v] for k, v in p.items()} for p in pieces]) if pieces else None
+    else:
+        header, width, layout = _locate_header(path)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", pd.errors.DtypeWarning)
+            body = _read_body(path, header + 1, width)
+        is_label = _label_mask(body.iloc[:, 0])
+        labels = [_label(body.iloc[i, 0]) for i in np.flatnonzero(is_label)]
+        block_codes = np.array([codes.setdefault(x, len(codes)) for x in labels], dtype=np.int32)
+        # Block number of every row (-1 above the first label); label rows are not contracts
+        block = np.cumsum(is_label) - 1
+        keep = ~is_label & (block >= 0)
+        columns = None
+        if keep.any():
+            columns = _typed_rows(body[keep], block_codes[block[keep]], layout, failures)
+
+    dates = list(codes)
+    chain = _chain(dates, columns) if columns is not None else OptionsChain.empty(dates)
+    return OptionsSourceResult(
+        ticker=ticker,
+        dates=dates,
+        big_dict=ChainBlocks(chain),
+        chain=chain,
+        parse_failures=failures,
+    )
+
+
+class TradeStationFileSource(ThreadedSource):
     """Options data from a local TradeStation file."""
 
+    name = "tradestation"
+
+    def __init__(
+        self, chunksize: int | None = None, cache: "ParsedFileCache | None" = None
+    ) -> None:
+        self.chunksize = chunksize
+        self.cache = cache
+
     def fetch(self, file_path: str | Path) -> OptionsSourceResult:
         """Load from file; ticker is derived from filename."""
-        return load_tradestation_file(file_path)
+        return load_tradestation_file(file_path, chunksize=self.chunksize, cache=self.cache)
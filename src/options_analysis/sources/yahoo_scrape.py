@@ -1,27 +1,147 @@
 """Yahoo Finance HTML scrape source (fallback when yfinance unavailable)."""
 
+import html
+import re
 from datetime import datetime
-from threading import Lock, Thread
+from typing import TYPE_CHECKING
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
-from options_analysis.sources.base import OptionsSourceResult
+from options_analysis.sources.base import OptionsSourceResult, ThreadedSource, build_source_result
+from options_analysis.sources.fetch import (
+    DEFAULT_RETRY,
+    YAHOO_RATE_LIMIT,
+    FetchRecord,
+    RetryPolicy,
+    TokenBucket,
+    call_with_retry,
+    fetch_concurrently,
+    make_session,
+)
+from shared.http_cache import HttpCache, OfflineCacheMissError, PageResponse, default_cache
+from shared.profiling import span
 from shared.utils import get_timer, start_timer
 
+if TYPE_CHECKING:
+    import requests
 
-def _parse_yahoo_options_page(
-    ticker: str, date_code: str, verbose: bool = True
-) -> tuple[str, dict[str, pd.DataFrame]]:
-    """Fetch one expiration's options from Yahoo options page. Returns (date_str, {calls, puts})."""
-    url = f"https://finance.yahoo.com/quote/{ticker}/options?date={date_code}"
-    if verbose:
-        print("Getting Options Data from:", url)
-    resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+CACHE_SOURCE = "yahoo"
+
+
+def _options_url(ticker: str, date_code: str | None = None) -> str:
+    url = f"https://finance.yahoo.com/quote/{ticker}/options"
+    return url if date_code is None else f"{url}?date={date_code}"
+
+
+def _get(
+    session: "requests.Session",
+    url: str,
+    timeout: float | None,
+    cache: HttpCache | None = None,
+) -> bytes:
+    resp: PageResponse
+    if cache is None:
+        resp = session.get(url, timeout=timeout)
+    else:
+        resp = cache.get(url, CACHE_SOURCE, session=session, timeout=timeout)
     if not resp.ok:
-        raise RuntimeError(f"Response Error - {resp.reason}")
-    soup = BeautifulSoup(resp.content, "html.parser")
+        # Raised (not printed) so throttling and server errors are retried by the caller
+        raise RuntimeError(f"Response Error - {resp.status_code} {resp.reason}")
+    return resp.content
+
+
+def _from_cache(cache: HttpCache | None, url: str) -> bytes | None:
+    """
+    The page if the cache can serve it without a request (so no rate-limit token is
+    spent on it), else None. Offline, a page that was never cached raises.
+    """
+    if cache is None:
+        return None
+    if cache.offline:
+        return cache.get(url, CACHE_SOURCE).content
+    hit = cache.lookup(url, CACHE_SOURCE)
+    return None if hit is None else hit.content
+
+
+_TABLE = re.compile(r"<table\b([^>]*)>(.*?)</table\s*>", re.S | re.I)
+_CLASS = re.compile(r"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_THEAD = re.compile(r"<thead\b[^>]*>(.*?)</thead\s*>", re.S | re.I)
+_TBODY = re.compile(r"<tbody\b[^>]*>(.*?)</tbody\s*>", re.S | re.I)
+_TR = re.compile(r"<tr\b[^>]*>(.*?)</tr\s*>", re.S | re.I)
+_TH = re.compile(r"<th\b[^>]*>(.*?)</th\s*>", re.S | re.I)
+_TD = re.compile(r"<td\b[^>]*>(.*?)</td\s*>", re.S | re.I)
+_TAG = re.compile(r"<[^>]*>")
+_OPEN = {name: re.compile(rf"<{name}\b", re.I) for name in ("table", "tr", "td", "th")}
+# Raw-text and comment blocks: dropped first so markup inside them is never matched
+_NON_CONTENT = re.compile(r"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+# Markup the fast path does not model; such pages go to BeautifulSoup
+_UNSUPPORTED = re.compile(r"<!\[CDATA\[|<!--|<script\b|<style\b", re.I)
+
+
+def _text(cell: str) -> str:
+    """Text of a cell like bs4's get_text(strip=True): strip each text node, join them."""
+    return "".join(p for p in (html.unescape(x).strip() for x in _TAG.split(cell)) if p)
+
+
+def _cells(pattern: re.Pattern[str], tag: str, fragment: str) -> list[str] | None:
+    cells = pattern.findall(fragment)
+    # Every opening tag must belong to a matched, closed cell (no implicit closing)
+    if len(cells) != len(_OPEN[tag].findall(fragment)):
+        return None
+    return [_text(c) for c in cells]
+
+
+def _fast_tables(content: bytes) -> dict[str, pd.DataFrame] | None:
+    """
+    Extract the calls/puts tables with targeted regular expressions instead of building a
+    document tree. Returns None when the markup is outside what this path handles
+    (undecodable bytes, nested tables, unclosed rows/cells, CDATA or unterminated
+    comments), so the caller can fall back to BeautifulSoup.
+    """
+    try:
+        doc = _NON_CONTENT.sub("", content.decode("utf-8"))
+    except UnicodeDecodeError:
+        return None
+    tables: dict[str, pd.DataFrame] = {"calls": pd.DataFrame(), "puts": pd.DataFrame()}
+    for attrs, body in _TABLE.findall(doc):
+        if _OPEN["table"].search(body) or _UNSUPPORTED.search(body):
+            return None
+        first_row: list[str] = []
+        thead = _THEAD.search(body)
+        if thead:
+            tr = _TR.search(thead.group(1))
+            if tr:
+                header = _cells(_TH, "th", tr.group(1))
+                if header is None:
+                    return None
+                first_row = header
+        rows: list[list[str]] = []
+        for tbody in _TBODY.findall(body):
+            trs = _TR.findall(tbody)
+            if len(trs) != len(_OPEN["tr"].findall(tbody)):
+                return None
+            for tr in trs:
+                row = _cells(_TD, "td", tr)
+                if row is None:
+                    return None
+                rows.append(row)
+        if not first_row or not rows:
+            continue
+        df = pd.DataFrame(data=rows, columns=first_row)
+        match = _CLASS.search(attrs)
+        classes = next((g for g in match.groups() if g is not None), "").split() if match else []
+        if "calls" in classes:
+            tables["calls"] = df
+        if "puts" in classes:
+            tables["puts"] = df
+    return tables
+
+
+def _soup_tables(content: bytes) -> dict[str, pd.DataFrame]:
+    """Reference path: full BeautifulSoup parse of the page."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
     opts_dict: dict[str, pd.DataFrame] = {"calls": pd.DataFrame(), "puts": pd.DataFrame()}
     for table in soup.find_all("table"):
         first_row: list[str] = []
@@ -31,8 +151,6 @@ def _parse_yahoo_options_page(
             if tr:
                 for th in tr.find_all("th"):
                     first_row.append(th.get_text(strip=True))
-        replacements = {"Open Interest": "OpenInt", "Implied Volatility": "ImpVol"}
-        first_row = [replacements.get(x, x) for x in first_row]
         rows: list[list[str]] = []
         for tbody in table.find_all("tbody"):
             for tr in tbody.find_all("tr"):
@@ -45,74 +163,165 @@ def _parse_yahoo_options_page(
             opts_dict["calls"] = df
         if "puts" in table_classes:
             opts_dict["puts"] = df
-    return date_code, opts_dict
+    return opts_dict
 
 
-def load_yahoo_scrape(ticker: str, verbose: bool = True) -> OptionsSourceResult:
-    """Scrape Yahoo Finance options pages for ticker (multi-threaded)."""
-    ticker = str(ticker).strip().upper().lstrip("0")
-    base_url = f"https://finance.yahoo.com/quote/{ticker}/options"
+def parse_options_tables(content: bytes) -> dict[str, pd.DataFrame]:
+    """{calls, puts} DataFrames of a Yahoo options page (fast path, else BeautifulSoup)."""
+    with span("yahoo.parse"):
+        tables = _fast_tables(content)
+        return tables if tables is not None else _soup_tables(content)
+
+
+def _parse_yahoo_options_page(
+    ticker: str,
+    date_code: str,
+    verbose: bool = True,
+    session: "requests.Session | None" = None,
+    timeout: float | None = 10.0,
+    cache: HttpCache | None = None,
+) -> tuple[str, dict[str, pd.DataFrame]]:
+    """Fetch one expiration's options from Yahoo options page. Returns (date_str, {calls, puts})."""
+    url = _options_url(ticker, date_code)
     if verbose:
-        print("Getting Dates from:", base_url)
-    resp = requests.get(base_url, headers={"User-Agent": "Mozilla/5.0"})
-    if not resp.ok:
-        raise RuntimeError(f"Response Error - {resp.reason}")
-    soup = BeautifulSoup(resp.content, "html.parser")
-    date_codes: list[tuple[str, str]] = []
-    dates_list: list[str] = []
-    for opt in soup.find_all("option"):
-        value = opt.get("value")
-        text = opt.get_text(strip=True)
-        if not value or not text:
-            continue
-        try:
-            dt = datetime.strptime(text, "%B %d, %Y")
+        print("Getting Options Data from:", url)
+    content = _get(session or make_session(1), url, timeout, cache)
+    return date_code, parse_options_tables(content)
+
+
+def load_yahoo_scrape(
+    ticker: str,
+    verbose: bool = True,
+    session: "requests.Session | None" = None,
+    max_workers: int = 8,
+    timeout: float | None = 10.0,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    limiter: TokenBucket | None = YAHOO_RATE_LIMIT,
+    cache: HttpCache | None = None,
+) -> OptionsSourceResult:
+    """
+    Scrape Yahoo Finance options pages for ticker.
+
+    All pages go through one keep-alive ``session`` (by default a new one with a
+    connection pool of ``max_workers``), on at most ``max_workers`` threads, with a
+    per-request ``timeout``, retries per ``retry`` and the shared rate ``limiter``.
+    Expirations that still fail are left out of big_dict; ``fetch_log`` holds one record
+    per expiration (status, attempts, latency, error).
+
+    Pages go through the HTTP ``cache`` (default: shared.http_cache.default_cache()).
+    Pages it can serve are not requested and are logged with status "cached"; in offline
+    mode expirations that were never cached are logged as errors.
+    """
+    from bs4 import BeautifulSoup
+
+    ticker = str(ticker).strip().upper().lstrip("0")
+    cache = cache if cache is not None else default_cache()
+    own_session = session is None
+    session = session or make_session(max_workers)
+    try:
+        base_url = _options_url(ticker)
+        if verbose:
+            print("Getting Dates from:", base_url)
+        content = _from_cache(cache, base_url)
+        if content is None:
+            content = call_with_retry(
+                lambda: _get(session, base_url, timeout, cache), retry, limiter
+            )
+        soup = BeautifulSoup(content, "html.parser")
+        codes: dict[str, str] = {}
+        dates_list: list[str] = []
+        for opt in soup.find_all("option"):
+            value = opt.get("value")
+            text = opt.get_text(strip=True)
+            if not value or not text:
+                continue
+            try:
+                dt = datetime.strptime(text, "%B %d, %Y")
+            except ValueError:
+                continue
             date_str = dt.strftime("%d/%m/%Y")
-            date_codes.append((value, date_str))
+            codes[date_str] = value
             dates_list.append(date_str)
-        except ValueError:
-            continue
-    if verbose:
-        print("Done")
 
-    big_dict: dict[str, dict[str, pd.DataFrame]] = {}
-    mutex = Lock()
+        def fetch(date_str: str) -> dict[str, pd.DataFrame]:
+            _, opts = _parse_yahoo_options_page(
+                ticker,
+                codes[date_str],
+                verbose=False,
+                session=session,
+                timeout=timeout,
+                cache=cache,
+            )
+            return opts
 
-    def worker(dc: tuple[str, str]) -> None:
         start = start_timer()
-        try:
-            code, date_str = dc
-            _, opts = _parse_yahoo_options_page(ticker, code, verbose=verbose)
-            with mutex:
-                big_dict[date_str] = opts
-                if verbose:
-                    print(
-                        "Request for",
-                        date_str,
-                        "ended after",
-                        get_timer(start),
-                        "seconds",
-                    )
-        except Exception as e:
-            with mutex:
-                if verbose:
-                    print("Request failed for", dc, ":", e)
-
-    threads = [Thread(target=worker, args=(dc,)) for dc in date_codes]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
-
-    return OptionsSourceResult(ticker=ticker, dates=dates_list, big_dict=big_dict)
-
-
-class YahooScrapeSource:
+        blocks: dict[str, dict[str, pd.DataFrame]] = {}
+        records: dict[str, FetchRecord] = {}
+        pending: list[str] = []
+        for date_str in dates_list:
+            try:
+                page = _from_cache(cache, _options_url(ticker, codes[date_str]))
+            except OfflineCacheMissError as e:
+                records[date_str] = FetchRecord(
+                    key=date_str, status="error", attempts=0, seconds=0.0, error=str(e)
+                )
+                continue
+            if page is None:
+                pending.append(date_str)
+                continue
+            blocks[date_str] = parse_options_tables(page)
+            records[date_str] = FetchRecord(
+                key=date_str, status="cached", attempts=0, seconds=0.0, error=""
+            )
+        with span("yahoo.fetch", expiries=len(pending)):
+            fetched, log = fetch_concurrently(pending, fetch, max_workers, timeout, retry, limiter)
+        blocks.update(fetched)
+        records.update((r["key"], r) for r in log)
+    finally:
+        if own_session:
+            session.close()
+    if verbose:
+        print(f"Fetched {len(blocks)}/{len(dates_list)} expirations in {get_timer(start)}")
+
+    big_dict = {d: blocks[d] for d in dates_list if d in blocks}
+    result = build_source_result(ticker, dates_list, big_dict)
+    result["fetch_log"] = [records[d] for d in dates_list]
+    return result
+
+
+class YahooScrapeSource(ThreadedSource):
     """Options data by scraping Yahoo Finance HTML (fallback)."""
 
-    def __init__(self, verbose: bool = True) -> None:
+    name = "yahoo"
+
+    def __init__(
+        self,
+        verbose: bool = True,
+        max_workers: int = 8,
+        timeout: float | None = 10.0,
+        retry: RetryPolicy = DEFAULT_RETRY,
+        limiter: TokenBucket | None = YAHOO_RATE_LIMIT,
+        cache: HttpCache | None = None,
+    ) -> None:
         self.verbose = verbose
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retry = retry
+        self.limiter = limiter
+        self.cache = cache
+        self._session: requests.Session | None = None
 
     def fetch(self, ticker: str) -> OptionsSourceResult:
-        """Scrape options for symbol."""
-        return load_yahoo_scrape(ticker, verbose=self.verbose)
+        """Scrape options for symbol (the source keeps one session across tickers)."""
+        if self._session is None:
+            self._session = make_session(self.max_workers)
+        return load_yahoo_scrape(
+            ticker,
+            verbose=self.verbose,
+            session=self._session,
+            max_workers=self.max_workers,
+            timeout=self.timeout,
+            retry=self.retry,
+            limiter=self.limiter,
+            cache=self.cache,
+        )
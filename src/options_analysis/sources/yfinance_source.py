@@ -3,9 +3,19 @@
 from datetime import datetime
 
 import pandas as pd
-import yfinance as yf
 
-from options_analysis.sources.base import OptionsSourceResult
+from options_analysis.sources.base import OptionsSourceResult, ThreadedSource, build_source_result
+from options_analysis.sources.fetch import (
+    DEFAULT_RETRY,
+    YAHOO_RATE_LIMIT,
+    RetryPolicy,
+    TokenBucket,
+    call_with_retry,
+    fetch_concurrently,
+    fetch_with_timeout,
+)
+from options_analysis.sources.lazy import LazyExpiries
+from shared.profiling import span
 
 
 def _date_to_ddmmyyyy(exp: str) -> str:
@@ -14,46 +24,95 @@ def _date_to_ddmmyyyy(exp: str) -> str:
     return dt.strftime("%d/%m/%Y")
 
 
-def _normalize_chain_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Rename columns to Strike, Volume, OpenInt for core compatibility."""
-    renames: dict[str, str] = {}
-    for c in df.columns:
-        if c == "strike":
-            renames[c] = "Strike"
-        elif c == "volume":
-            renames[c] = "Volume"
-        elif c == "openInterest":
-            renames[c] = "OpenInt"
-    out = df.rename(columns=renames).copy()
-    if "Volume" not in out.columns:
-        out["Volume"] = 0
-    if "OpenInt" not in out.columns:
-        out["OpenInt"] = 0
-    return out
-
-
-def load_yfinance(ticker: str) -> OptionsSourceResult:
-    """Fetch options chain for ticker from yfinance (Yahoo)."""
+def load_yfinance(
+    ticker: str,
+    lazy: bool = False,
+    prefetch: int = 0,
+    max_workers: int = 4,
+    timeout: float | None = 30.0,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    limiter: TokenBucket | None = YAHOO_RATE_LIMIT,
+) -> OptionsSourceResult:
+    """
+    Fetch options chain for ticker from yfinance (Yahoo).
+
+    Expirations are downloaded on up to ``max_workers`` threads. Each request waits for a
+    token from ``limiter`` (shared across tickers by default) and is retried with jittered
+    exponential backoff when it fails or exceeds ``timeout`` seconds. ``dates`` keeps the
+    yfinance order; expirations that still fail are left out of big_dict. Per-expiry
+    status, attempts and latency are returned in ``fetch_log``.
+
+    With ``lazy=True`` only the expiration list is requested up front: big_dict is a
+    LazyExpiries mapping that downloads an expiry on first access, and ``prefetch``
+    starts background downloads of the nearest N expiries. Each of those downloads has
+    the same ``timeout``, retries and rate limit; one that still fails raises on access.
+    """
+    import yfinance as yf
+
     ticker = str(ticker).strip().upper().lstrip("0")
     t = yf.Ticker(ticker)
-    expirations = t.options
+    expirations = call_with_retry(lambda: t.options, retry, limiter)
     if not expirations:
-        return OptionsSourceResult(ticker=ticker, dates=[], big_dict={})
+        return build_source_result(ticker, [], {})
 
     dates_str = [_date_to_ddmmyyyy(exp) for exp in expirations]
-    big_dict: dict[str, dict[str, pd.DataFrame]] = {}
-    for exp, date_str in zip(expirations, dates_str, strict=False):
-        chain = t.option_chain(exp)
-        calls = _normalize_chain_df(chain.calls)
-        puts = _normalize_chain_df(chain.puts)
-        big_dict[date_str] = {"calls": calls, "puts": puts}
+    by_date = dict(zip(dates_str, expirations, strict=True))
+
+    def fetch(date_str: str) -> dict[str, pd.DataFrame]:
+        chain = t.option_chain(by_date[date_str])
+        return {"calls": chain.calls, "puts": chain.puts}
 
-    return OptionsSourceResult(ticker=ticker, dates=dates_str, big_dict=big_dict)
+    if lazy:
+        return OptionsSourceResult(
+            ticker=ticker,
+            dates=dates_str,
+            big_dict=LazyExpiries(
+                dates_str,
+                lambda d: fetch_with_timeout(d, fetch, timeout, retry, limiter),
+                prefetch,
+                max_workers,
+            ),
+        )
 
+    with span("yfinance.fetch", expiries=len(dates_str)):
+        blocks, log = fetch_concurrently(dates_str, fetch, max_workers, timeout, retry, limiter)
+    if not blocks:
+        raise RuntimeError(f"No expirations could be fetched for {ticker}: {log[0]['error']}")
+    big_dict = {d: blocks[d] for d in dates_str if d in blocks}
+    result = build_source_result(ticker, dates_str, big_dict)
+    result["fetch_log"] = log
+    return result
 
-class YFinanceSource:
+
+class YFinanceSource(ThreadedSource):
     """Options data via yfinance (free, no API key)."""
 
+    name = "yfinance"
+
+    def __init__(
+        self,
+        lazy: bool = False,
+        prefetch: int = 0,
+        max_workers: int = 4,
+        timeout: float | None = 30.0,
+        retry: RetryPolicy = DEFAULT_RETRY,
+        limiter: TokenBucket | None = YAHOO_RATE_LIMIT,
+    ) -> None:
+        self.lazy = lazy
+        self.prefetch = prefetch
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retry = retry
+        self.limiter = limiter
+
     def fetch(self, ticker: str) -> OptionsSourceResult:
         """Fetch options chain for symbol."""
-        return load_yfinance(ticker)
+        return load_yfinance(
+            ticker,
+            lazy=self.lazy,
+            prefetch=self.prefetch,
+            max_workers=self.max_workers,
+            timeout=self.timeout,
+            retry=self.retry,
+            limiter=self.limiter,
+        )
@@ -0,0 +1,51 @@
+"""Segment reductions: weighted strike statistics for many expirations in one pass."""
+
+import numpy as np
+
+
+def segment_weighted_stats(
+    seg: np.ndarray,
+    n_segments: int,
+    x: np.ndarray,
+    w: np.ndarray,
+    percentiles: tuple[float, ...] = (0.5,),
+) -> dict[str, np.ndarray]:
+    """
+    Weighted total, mean, std, skewness and percentiles of x for every segment.
+
+    ``seg`` must be non-decreasing and ``x`` sorted within each segment (the chain's
+    row order already guarantees both per side). Segments with zero total weight get NaN
+    instead of raising. Percentiles are the lower weighted percentile: the smallest x whose
+    cumulative weight reaches q * total.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    w = np.asarray(w, dtype=np.float64)
+    total = np.bincount(seg, weights=w, minlength=n_segments)
+    has_weight = total > 0
+    safe_total = np.where(has_weight, total, 1.0)
+    mean = np.bincount(seg, weights=w * x, minlength=n_segments) / safe_total
+    dx = x - mean[seg]
+    m2 = np.bincount(seg, weights=w * dx**2, minlength=n_segments) / safe_total
+    m3 = np.bincount(seg, weights=w * dx**3, minlength=n_segments) / safe_total
+    std = np.sqrt(m2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skew = np.where(m2 > 0, m3 / m2**1.5, np.nan)
+    out = {
+        "total": total,
+        "mean": np.where(has_weight, mean, np.nan),
+        "std": np.where(has_weight, std, np.nan),
+        "skew": np.where(has_weight, skew, np.nan),
+    }
+
+    starts = np.searchsorted(seg, np.arange(n_segments))
+    ends = np.searchsorted(seg, np.arange(n_segments), side="right")
+    cum = np.cumsum(w)
+    base = np.where(starts > 0, cum[np.maximum(starts - 1, 0)], 0.0) if cum.size else starts
+    for q in percentiles:
+        target = base + q * total
+        # q == 0 means "first strike carrying weight", hence the strict comparison
+        idx = np.searchsorted(cum, target, side="right" if q == 0 else "left")
+        idx = np.clip(idx, starts, np.maximum(ends - 1, starts))
+        values = x[np.minimum(idx, max(x.size - 1, 0))] if x.size else np.full(n_segments, 0.0)
+        out[f"p{round(q * 100):d}"] = np.where(has_weight, values, np.nan)
+    return out
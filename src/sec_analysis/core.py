@@ -9,6 +9,7 @@ from bs4 import BeautifulSoup
 from sec_edgar_downloader import Downloader
 
 from sec_analysis.params import SUPPORTED_FILINGS
+from shared.http_cache import HttpCache, PageResponse, default_cache
 
 
 class SEC_Object:
@@ -27,7 +28,7 @@ class SEC_Object:
 class SEC_Analysis:
     """Fetch SEC filing URLs for a ticker and extract financial tables."""
 
-    def __init__(self, ticker: str, filings: list[str]) -> None:
+    def __init__(self, ticker: str, filings: list[str], cache: HttpCache | None = None) -> None:
         if not ticker:
             raise ValueError("No ticker given")
         if not filings:
@@ -38,6 +39,8 @@ class SEC_Analysis:
         self.ticker = str(ticker).strip().upper().lstrip("0")
         self.fillings = filings
         self.urls: dict[str, Any] = {}
+        # Filed documents never change, so explore_urls reads them through the HTTP cache
+        self.cache = cache if cache is not None else default_cache()
         self.master_dict: dict[str, Any] = {}
 
     def get_urls(
@@ -113,7 +116,11 @@ class SEC_Analysis:
             raise RuntimeError("No urls found. Call get_urls() first.")
         for key, lst_val in self.urls.items():
             for value in lst_val:
-                resp = requests.get(value.url)
+                resp: PageResponse
+                if self.cache is None:
+                    resp = requests.get(value.url)
+                else:
+                    resp = self.cache.get(value.url, "sec")
                 soup = BeautifulSoup(resp.content, "lxml")
                 obj = SEC_Object()
                 obj.ticker = self.ticker
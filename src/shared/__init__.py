@@ -1,5 +1,26 @@
 """Shared utilities."""
 
+from shared.http_cache import (
+    CacheStats,
+    HttpCache,
+    OfflineCacheMissError,
+    PageResponse,
+    default_cache,
+)
+from shared.profiling import Profiler, profile, profiled, span
 from shared.utils import get_timer, is_date, start_timer
 
-__all__ = ["start_timer", "get_timer", "is_date"]
+__all__ = [
+    "start_timer",
+    "get_timer",
+    "is_date",
+    "HttpCache",
+    "CacheStats",
+    "OfflineCacheMissError",
+    "PageResponse",
+    "default_cache",
+    "Profiler",
+    "profile",
+    "profiled",
+    "span",
+]
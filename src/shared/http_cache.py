@@ -0,0 +1,331 @@
+"""On-disk HTTP response cache shared by the web scrapers (Yahoo, Finviz, SEC)."""
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    import requests
+
+# Seconds a stored page is served without asking the server. Option chains move during
+# the session; Finviz snapshots a little slower; filed SEC documents never change.
+DEFAULT_TTLS: dict[str, float] = {
+    "yahoo": 300.0,
+    "finviz": 900.0,
+    "sec": 7 * 86400.0,
+}
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+class OfflineCacheMissError(RuntimeError):
+    """Raised in offline mode when a URL has never been cached."""
+
+
+class PageResponse(Protocol):
+    """What the scrapers read from a response: a requests.Response or a CachedResponse."""
+
+    @property
+    def ok(self) -> bool: ...
+
+    @property
+    def status_code(self) -> int: ...
+
+    @property
+    def reason(self) -> str: ...
+
+    @property
+    def content(self) -> bytes: ...
+
+
+@dataclass
+class CachedResponse:
+    """The parts of a requests.Response the scrapers use, plus where it came from."""
+
+    url: str
+    status_code: int
+    reason: str
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+
+@dataclass
+class CacheStats:
+    """
+    hits: fresh pages served from disk; revalidated: stale pages the server confirmed
+    (304); misses: full downloads; offline_misses: lookups that failed in offline mode.
+    """
+
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    offline_misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        served = self.hits + self.revalidated
+        total = served + self.misses + self.offline_misses
+        return served / total if total else 0.0
+
+
+class HttpCache:
+    """
+    GET responses stored under ``root`` (one body file and one JSON metadata file per URL).
+
+    A page younger than its source's TTL is served without a request. An older one is
+    revalidated with If-None-Match / If-Modified-Since; a 304 refreshes it in place. Only
+    200 responses are stored. The store is an LRU bounded to ``max_bytes`` of bodies
+    (recency survives restarts via the body file's mtime). ``offline=True`` never touches
+    the network: any cached page is served, however old, and others raise OfflineCacheMissError.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        ttls: Mapping[str, float] | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        offline: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index: dict[str, tuple[int, float]] | None = None  # key -> (size, last used)
+        self._stats = CacheStats()
+
+    # ---- storage -------------------------------------------------------------------
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.root / f"{key}.body", self.root / f"{key}.json"
+
+    def _load_index(self) -> dict[str, tuple[int, float]]:
+        """Body sizes and recency, read from the directory once per process (lock held)."""
+        if self._index is None:
+            self._index = {}
+            if self.root.is_dir():
+                for entry in os.scandir(self.root):
+                    if entry.name.endswith(".body"):
+                        st = entry.stat()
+                        self._index[entry.name[:-5]] = (st.st_size, st.st_mtime)
+        return self._index
+
+    def _read(self, key: str) -> tuple[dict[str, Any], bytes] | None:
+        body_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            return meta, body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _write_meta(self, key: str, meta: dict[str, Any]) -> None:
+        self._write_atomic(self._paths(key)[1], json.dumps(meta).encode("utf-8"))
+
+    def _touch(self, key: str, size: int) -> None:
+        now = self._clock()
+        with self._lock:
+            self._load_index()[key] = (size, now)
+        with contextlib.suppress(OSError):
+            os.utime(self._paths(key)[0], (now, now))
+
+    def _store(self, key: str, meta: dict[str, Any], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Body before metadata: a reader never sees metadata without its body
+        self._write_atomic(self._paths(key)[0], body)
+        self._write_meta(key, meta)
+        self._touch(key, len(body))
+        with self._lock:
+            self._stats.stored += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            index = self._load_index()
+            total = sum(size for size, _ in index.values())
+            victims = []
+            for key, (size, _) in sorted(index.items(), key=lambda kv: kv[1][1]):
+                if total <= self.max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+                del index[key]
+            self._stats.evicted += len(victims)
+        for key in victims:
+            for path in self._paths(key):
+                path.unlink(missing_ok=True)
+
+    # ---- public API ----------------------------------------------------------------
+
+    def ttl(self, source: str) -> float:
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def lookup(self, url: str, source: str = "default") -> CachedResponse | None:
+        """
+        The cached page if it can be served without a request (fresh, or any age when
+        offline), else None. Counts as a hit when it returns a page; misses are counted
+        by get().
+        """
+        key = self._key(url)
+        cached = self._read(key)
+        if cached is None:
+            return None
+        meta, body = cached
+        if not self.offline and self._clock() - meta["stored_at"] >= self.ttl(source):
+            return None
+        self._touch(key, len(body))
+        with self._lock:
+            self._stats.hits += 1
+        return self._response(url, meta, body)
+
+    @staticmethod
+    def _response(url: str, meta: dict[str, Any], body: bytes) -> CachedResponse:
+        return CachedResponse(
+            url=url,
+            status_code=200,
+            reason="OK",
+            content=body,
+            headers=dict(meta.get("headers", {})),
+            from_cache=True,
+        )
+
+    def get(
+        self,
+        url: str,
+        source: str = "default",
+        session: "requests.Session | None" = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> CachedResponse:
+        """
+        GET ``url`` through the cache (with ``session``, or requests.get). Error
+        responses are returned as-is and not stored, so callers keep their own checks.
+        """
+        fresh = self.lookup(url, source)
+        if fresh is not None:
+            return fresh
+        if self.offline:
+            with self._lock:
+                self._stats.offline_misses += 1
+            raise OfflineCacheMissError(f"Not cached (offline mode): {url}")
+        key = self._key(url)
+        cached = self._read(key)
+        request_headers = dict(headers or {})
+        if cached is not None:
+            meta, _ = cached
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+        import requests
+
+        getter = session.get if session is not None else requests.get
+        resp = getter(url, headers=request_headers, timeout=timeout)
+        if resp.status_code == 304 and cached is not None:
+            meta, body = cached
+            meta["stored_at"] = self._clock()
+            self._write_meta(key, meta)
+            self._touch(key, len(body))
+            with self._lock:
+                self._stats.revalidated += 1
+            return self._response(url, meta, body)
+        with self._lock:
+            self._stats.misses += 1
+        resp_headers = dict(resp.headers or {})
+        response = CachedResponse(
+            url=url,
+            status_code=resp.status_code,
+            reason=resp.reason or "",
+            content=resp.content,
+            headers=resp_headers,
+        )
+        if resp.status_code == 200:
+            meta = {
+                "url": url,
+                "source": source,
+                "stored_at": self._clock(),
+                "etag": resp_headers.get("ETag") or resp_headers.get("etag"),
+                "last_modified": (
+                    resp_headers.get("Last-Modified") or resp_headers.get("last-modified")
+                ),
+                "headers": {k: v for k, v in resp_headers.items() if k.lower() == "content-type"},
+            }
+            self._store(key, meta, response.content)
+        return response
+
+    @property
+    def stats(self) -> CacheStats:
+        """A snapshot of the hit/miss counters."""
+        with self._lock:
+            return CacheStats(**asdict(self._stats))
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = CacheStats()
+
+    def size(self) -> int:
+        """Bytes of cached bodies."""
+        with self._lock:
+            return sum(size for size, _ in self._load_index().values())
+
+    def clear(self) -> None:
+        """Delete every cached page."""
+        with self._lock:
+            keys = list(self._load_index())
+            self._index = {}
+        for key in keys:
+            for path in self._paths(key):
+                path.unlink(missing_ok=True)
+
+
+_default: HttpCache | None = None
+_default_config: tuple[str, str, str] | None = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> HttpCache | None:
+    """
+    The process-wide cache the scrapers use when none is passed, configured from the
+    environment: SOA_HTTP_CACHE_DIR (default ~/.cache/stock-options-analysis/http),
+    SOA_HTTP_CACHE=off to disable caching, SOA_HTTP_OFFLINE=1 for offline mode.
+    """
+    global _default, _default_config
+    config = (
+        os.environ.get("SOA_HTTP_CACHE", "on").strip().lower(),
+        os.environ.get("SOA_HTTP_CACHE_DIR", ""),
+        os.environ.get("SOA_HTTP_OFFLINE", "").strip().lower(),
+    )
+    if config[0] in ("0", "off", "false", "no"):
+        return None
+    with _default_lock:
+        if _default is None or config != _default_config:
+            root = config[1] or Path.home() / ".cache" / "stock-options-analysis" / "http"
+            _default = HttpCache(root, offline=config[2] in ("1", "on", "true", "yes"))
+            _default_config = config
+        return _default
@@ -0,0 +1,248 @@
+"""Per-stage profiling: named spans with wall time, CPU time, RSS delta and tracemalloc peak."""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+_NULL = contextlib.nullcontext()
+_active: "Profiler | None" = None
+
+
+@dataclass
+class SpanRecord:
+    """One finished span. ``path`` is the span's name prefixed by its enclosing spans."""
+
+    name: str
+    path: tuple[str, ...]
+    thread: str
+    start: float  # seconds since the profiler started
+    wall: float
+    cpu: float  # CPU time of the span's own thread
+    rss_delta: int  # process RSS change in bytes (all threads)
+    peak: int | None  # traced allocation peak above the start level; None without memory
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _Open:
+    path: tuple[str, ...]
+    traced: int
+    max_traced: int
+
+
+@dataclass
+class StageTotals:
+    """All spans with one path added up; ``self_wall`` excludes time in child spans."""
+
+    path: tuple[str, ...]
+    count: int = 0
+    wall: float = 0.0
+    self_wall: float = 0.0
+    cpu: float = 0.0
+    rss_delta: int = 0
+    peak: int | None = None
+
+
+class Profiler:
+    """
+    Collects spans while it is active (see ``profile``). Spans nest per thread; spans
+    opened on worker threads (concurrent fetches) are roots of their own thread.
+
+    With ``memory=True`` tracemalloc runs for the profiler's lifetime and each span
+    records the peak of traced allocations above the level at its start. The trace is
+    process-wide, so spans overlapping on other threads count towards each other's peak.
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.spans: list[SpanRecord] = []
+        self._origin = time.perf_counter()
+        import psutil
+
+        self._process = psutil.Process(os.getpid())
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: list[_Open] = []  # every open span (all threads), for peak tracking
+        self._started_tracemalloc = False
+
+    def _stack(self) -> list[str]:
+        stack: list[str] | None = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[None]:
+        stack = self._stack()
+        stack.append(name)
+        path = tuple(stack)
+        opened = None
+        if self.memory:
+            traced, peak = tracemalloc.get_traced_memory()
+            with self._lock:
+                for other in self._open:
+                    other.max_traced = max(other.max_traced, peak)
+                tracemalloc.reset_peak()
+                opened = _Open(path, traced, traced)
+                self._open.append(opened)
+        rss = self._process.memory_info().rss
+        cpu = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - cpu
+            rss_delta = self._process.memory_info().rss - rss
+            span_peak = None
+            if opened is not None:
+                peak = tracemalloc.get_traced_memory()[1]
+                with self._lock:
+                    self._open.remove(opened)
+                    for other in self._open:
+                        other.max_traced = max(other.max_traced, peak)
+                span_peak = max(opened.max_traced, peak) - opened.traced
+            stack.pop()
+            record = SpanRecord(
+                name=name,
+                path=path,
+                thread=threading.current_thread().name,
+                start=start - self._origin,
+                wall=wall,
+                cpu=cpu,
+                rss_delta=rss_delta,
+                peak=span_peak,
+                attrs=attrs,
+            )
+            with self._lock:
+                self.spans.append(record)
+
+    def totals(self) -> list[StageTotals]:
+        """Spans grouped by path, sorted so every stage follows its parent."""
+        totals: dict[tuple[str, ...], StageTotals] = {}
+        for record in self.spans:
+            t = totals.setdefault(record.path, StageTotals(record.path))
+            t.count += 1
+            t.wall += record.wall
+            t.self_wall += record.wall
+            t.cpu += record.cpu
+            t.rss_delta += record.rss_delta
+            if record.peak is not None:
+                t.peak = max(t.peak or 0, record.peak)
+        for path, t in totals.items():
+            parent = totals.get(path[:-1]) if len(path) > 1 else None
+            if parent is not None:
+                parent.self_wall -= t.wall
+        for t in totals.values():
+            t.self_wall = max(t.self_wall, 0.0)
+        return sorted(totals.values(), key=lambda t: t.path)
+
+    def summary(self) -> str:
+        """Text table of the totals, children indented under their parents."""
+        lines = [
+            f"{'stage':40s} {'calls':>6s} {'wall s':>9s} {'cpu s':>9s} {'rss MB':>8s} {'peak MB':>8s}"
+        ]
+        for t in self.totals():
+            label = "  " * (len(t.path) - 1) + t.path[-1]
+            peak = f"{t.peak / 1e6:8.1f}" if t.peak is not None else f"{'-':>8s}"
+            lines.append(
+                f"{label:40s} {t.count:6d} {t.wall:9.4f} {t.cpu:9.4f}"
+                f" {t.rss_delta / 1e6:8.1f} {peak}"
+            )
+        return "\n".join(lines)
+
+    def folded(self) -> str:
+        """
+        Flame-graph input in the "folded stacks" format (``a;b;c <self microseconds>``),
+        readable by flamegraph.pl, speedscope and inferno.
+        """
+        return "\n".join(
+            f"{';'.join(t.path)} {round(t.self_wall * 1e6)}"
+            for t in self.totals()
+            if round(t.self_wall * 1e6) > 0
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "memory": self.memory,
+            "spans": [{**asdict(r), "path": list(r.path)} for r in self.spans],
+            "totals": [{**asdict(t), "path": list(t.path)} for t in self.totals()],
+        }
+
+    def write(self, path: str | Path) -> Path:
+        """Write the profile: folded stacks for .folded / .txt files, JSON otherwise."""
+        path = Path(path)
+        if path.suffix in (".folded", ".txt"):
+            path.write_text(self.folded() + "\n", encoding="utf-8")
+        else:
+            path.write_text(json.dumps(self.to_dict(), indent=1, default=str), encoding="utf-8")
+        return path
+
+
+@contextlib.contextmanager
+def profile(memory: bool = False, output: str | Path | None = None) -> Iterator[Profiler]:
+    """
+    Profile everything run inside the block: instrumented code (sources, OptsAnalysis,
+    StockData) records its spans into the yielded Profiler, which is also written to
+    ``output`` (see ``Profiler.write``) on exit. Profiles do not nest.
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("A profile is already active")
+    profiler = Profiler(memory=memory)
+    profiler.start()
+    _active = profiler
+    try:
+        yield profiler
+    finally:
+        _active = None
+        profiler.stop()
+        if output is not None:
+            profiler.write(output)
+
+
+def active_profiler() -> Profiler | None:
+    return _active
+
+
+def span(name: str, **attrs: Any) -> contextlib.AbstractContextManager[None]:
+    """A named stage; records nothing (and costs about a function call) unless profiling."""
+    profiler = _active
+    if profiler is None:
+        return _NULL
+    return profiler.span(name, **attrs)
+
+
+def profiled(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator: run the function inside ``span(name)``."""
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _active
+            if profiler is None:
+                return fn(*args, **kwargs)
+            with profiler.span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
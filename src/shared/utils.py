@@ -3,9 +3,6 @@
 import os
 from datetime import datetime
 
-import psutil
-from dateutil.parser import parse as dateutil_parse
-
 
 def start_timer() -> datetime:
     """Return current time for elapsed measurement."""
@@ -24,6 +21,8 @@ def print_time(start: datetime) -> None:
 
 def print_mem() -> None:
     """Print process memory usage in MB."""
+    import psutil
+
     process = psutil.Process(os.getpid())
     print("MB used => " + str(process.memory_info().rss / 10**6))
 
@@ -36,6 +35,8 @@ def print_run_data(start: datetime) -> None:
 
 def is_date(string: str, fuzzy: bool = False) -> bool:
     """Return whether the string can be interpreted as a date."""
+    from dateutil.parser import parse as dateutil_parse
+
     try:
         dateutil_parse(string, fuzzy=fuzzy)
         return True
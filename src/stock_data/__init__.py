@@ -1,5 +1,6 @@
 """Stock data loading and correlation analysis."""
 
 from stock_data.core import StockData
+from stock_data.days import DayFrames, DayIndex
 
-__all__ = ["StockData"]
+__all__ = ["DayFrames", "DayIndex", "StockData"]
@@ -1,13 +1,15 @@
 """Stock data: load CSV, date-indexed frames, correlation with reference ticker."""
 
 import datetime
+from collections.abc import Mapping
 from pathlib import Path
 
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from shared.profiling import span
+from stock_data.days import DayIndex
+
 
 def _get_data(ticker: str, data_dir: str | Path) -> pd.DataFrame:
     """Load first CSV in data_dir that contains ticker in filename."""
@@ -29,13 +31,8 @@ def _get_data(ticker: str, data_dir: str | Path) -> pd.DataFrame:
     return df
 
 
-def _get_dates_dict(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
-    """Split dataframe by date; keys are dd/mm/yyyy."""
-    dates_parsed = pd.to_datetime(df["Date"], format="%m/%d/%Y", errors="coerce")
-    df = df.copy()
-    df["Date"] = dates_parsed.dt.strftime("%d/%m/%Y")
-    date_keys = list(dict.fromkeys(df["Date"].tolist()))
-    return {k: df.loc[df["Date"] == k] for k in date_keys}
+def _bar_average(frame: pd.DataFrame) -> pd.Series:
+    return (frame["Open"] + frame["Close"] + frame["Low"] + frame["High"]) / 4
 
 
 class StockData:
@@ -52,13 +49,26 @@ class StockData:
         self.ticker = str(ticker).strip().upper().lstrip("0")
         self.refticker = str(refticker).strip().upper().lstrip("0") if refticker else None
         self.data_dir = Path(data_dir) if data_dir else Path("data")
-        self.ticker_df = _get_data(self.ticker, self.data_dir)
-        self.ticker_dates_dict = _get_dates_dict(self.ticker_df)
+        with span("stock_data.load", ticker=self.ticker):
+            self.ticker_df = _get_data(self.ticker, self.data_dir)
+            self.ticker_days = DayIndex(self.ticker_df)
+        # date -> that day's bars, sliced from the day index on access
+        self.ticker_dates_dict: Mapping[str, pd.DataFrame] = self.ticker_days.frames()
         self.refticker_df: pd.DataFrame | None = None
-        self.refticker_dates_dict: dict[str, pd.DataFrame] = {}
+        self.refticker_days: DayIndex | None = None
+        self.refticker_dates_dict: Mapping[str, pd.DataFrame] = {}
         if self.refticker:
-            self.refticker_df = _get_data(self.refticker, self.data_dir)
-            self.refticker_dates_dict = _get_dates_dict(self.refticker_df)
+            with span("stock_data.load", ticker=self.refticker):
+                self.refticker_df = _get_data(self.refticker, self.data_dir)
+                self.refticker_days = DayIndex(self.refticker_df)
+            self.refticker_dates_dict = self.refticker_days.frames()
+
+    def day(self, date: str, ref: bool = False) -> pd.DataFrame:
+        """Bars of one day (dd/mm/yyyy) of the ticker, or of the reference ticker."""
+        days = self.refticker_days if ref else self.ticker_days
+        if days is None:
+            raise ValueError("No reference ticker was provided")
+        return days.day(date)
 
     @staticmethod
     def _plot_dict(
@@ -66,6 +76,9 @@ class StockData:
         d2: dict[str, float] | None = None,
         annotate: bool = True,
     ) -> None:
+        import matplotlib.dates as mdates
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots()
         keys = list(d.keys())
         times = [datetime.datetime.strptime(k, "%d/%m/%Y") for k in keys]
@@ -112,6 +125,8 @@ class StockData:
         d: dict[str, datetime.time],
         d2: dict[str, datetime.time] | None = None,
     ) -> None:
+        import matplotlib.pyplot as plt
+
         bins = [t.strftime("%H:%M") for t in pd.date_range("16:30", "23:00", freq="1min")]
         bins1 = dict.fromkeys(bins, 0)
         for t in d.values():
@@ -155,23 +170,19 @@ class StockData:
         date_analysis: bool = True,
         plot: bool = True,
     ) -> dict[str, float]:
-        if not self.refticker:
+        if not self.refticker or self.refticker_days is None:
             raise ValueError("No reference ticker was provided")
-        correlation_dict: dict[str, float] = {}
-        for key in self.ticker_dates_dict:
-            if key not in self.refticker_dates_dict:
-                continue
-            open1 = self.ticker_dates_dict[key]["Open"]
-            close1 = self.ticker_dates_dict[key]["Close"]
-            low1 = self.ticker_dates_dict[key]["Low"]
-            high1 = self.ticker_dates_dict[key]["High"]
-            avg1 = (open1 + close1 + low1 + high1) / 4
-            open2 = self.refticker_dates_dict[key]["Open"]
-            close2 = self.refticker_dates_dict[key]["Close"]
-            low2 = self.refticker_dates_dict[key]["Low"]
-            high2 = self.refticker_dates_dict[key]["High"]
-            avg2 = (open2 + close2 + low2 + high2) / 4
-            correlation_dict[key] = float(avg1.corr(avg2))
+        days, ref_days = self.ticker_days, self.refticker_days
+        with span("stock_data.correlation"):
+            # Bar averages once per file; each day is then a slice of them
+            avg, ref_avg = _bar_average(days.frame), _bar_average(ref_days.frame)
+            correlation_dict: dict[str, float] = {}
+            for key in days.keys:
+                if key not in ref_days:
+                    continue
+                avg1 = avg.iloc[days.bounds(key)]
+                avg2 = ref_avg.iloc[ref_days.bounds(key)]
+                correlation_dict[key] = float(avg1.corr(avg2))
         values_arr = np.array(list(correlation_dict.values()))
         print("Calculated Correlation of", self.ticker, "to", self.refticker)
         print("Correlation Median:\t\t", f"{np.median(values_arr):.4f}")
@@ -181,7 +192,8 @@ class StockData:
         if date_analysis:
             self._date_analysis(correlation_dict)
         if plot:
-            self._plot_dict(correlation_dict)
+            with span("stock_data.render"):
+                self._plot_dict(correlation_dict)
         return correlation_dict
 
     def highest_lowest_point_daily(
@@ -200,7 +212,8 @@ class StockData:
             highest[key] = datetime.datetime.strptime(high_time_str, "%H:%M").time()
             lowest[key] = datetime.datetime.strptime(low_time_str, "%H:%M").time()
         if hist:
-            self._plot_histogram(highest, lowest)
+            with span("stock_data.render"):
+                self._plot_histogram(highest, lowest)
         return highest, lowest
 
     def intraday_analysis(self) -> None:
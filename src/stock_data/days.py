@@ -0,0 +1,68 @@
+"""Intraday bars partitioned by trading day: one sort, then each day is a row slice."""
+
+from collections.abc import Iterator, Mapping
+
+import numpy as np
+import pandas as pd
+
+
+class DayIndex:
+    """
+    Bars sorted by day (stable, so bars keep their file order within a day) with the
+    offsets where each day starts: day ``i`` is rows ``offsets[i]:offsets[i + 1]`` of
+    ``frame``, so a day is a slice of the sorted frame rather than a filtered copy.
+    Keys are dd/mm/yyyy in date order; bars whose date does not parse are left out.
+    """
+
+    def __init__(self, df: pd.DataFrame, date_format: str = "%m/%d/%Y") -> None:
+        parsed = pd.to_datetime(df["Date"], format=date_format, errors="coerce")
+        days = parsed.to_numpy(dtype="datetime64[D]")
+        dated = np.flatnonzero(~np.isnat(days))
+        order = dated[np.argsort(days[dated], kind="stable")]
+        days = days[order]
+        if len(order) != len(df) or np.any(order[1:] < order[:-1]):
+            df = df.take(order)
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])[: len(days)]
+        self.offsets = np.r_[starts, len(days)].astype(np.int64)
+        self.days = days[starts]
+        iso = np.datetime_as_string(self.days, unit="D")
+        self.keys = [f"{d[8:10]}/{d[5:7]}/{d[:4]}" for d in iso]
+        labels = np.repeat(np.array(self.keys, dtype=object), np.diff(self.offsets))
+        self.frame = df.assign(Date=labels)
+        self._positions = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def bounds(self, key: str) -> slice:
+        """Row slice of ``frame`` holding the bars of day ``key``."""
+        i = self._positions[key]
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def day(self, key: str) -> pd.DataFrame:
+        """The bars of day ``key`` (dd/mm/yyyy)."""
+        return self.frame.iloc[self.bounds(key)]
+
+    def frames(self) -> "DayFrames":
+        return DayFrames(self)
+
+
+class DayFrames(Mapping[str, pd.DataFrame]):
+    """Read-only dd/mm/yyyy -> bars view of a DayIndex; a day's frame is sliced on access."""
+
+    def __init__(self, index: DayIndex) -> None:
+        self._index = index
+
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        if key not in self._index:
+            raise KeyError(key)
+        return self._index.day(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index.keys)
+
+    def __len__(self) -> int:
+        return len(self._index)
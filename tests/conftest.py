@@ -3,7 +3,16 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure src is on path when running tests
 src = Path(__file__).resolve().parent.parent / "src"
 if str(src) not in sys.path:
     sys.path.insert(0, str(src))
+
+
+@pytest.fixture(autouse=True)
+def _no_default_caches(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests never touch the user's on-disk caches; cache tests pass their own."""
+    monkeypatch.setenv("SOA_HTTP_CACHE", "off")
+    monkeypatch.setenv("SOA_FILE_CACHE", "off")
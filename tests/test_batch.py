@@ -0,0 +1,83 @@
+"""Tests for options_analysis.batch: symbol lists, summaries, error isolation."""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from options_analysis.batch import read_symbols, run_batch
+from options_analysis.sources.base import OptionsSourceResult
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def _fake_loader(ticker: str) -> OptionsSourceResult:
+    """Module-level so worker processes can unpickle it."""
+    if ticker == "BAD":
+        raise RuntimeError("no options listed")
+    if ticker == "SLOW":
+        time.sleep(30)
+    if ticker.startswith("NAP"):
+        time.sleep(0.2)
+    calls = pd.DataFrame({"Strike": [100.0, 110.0], "Volume": [1, 3], "OpenInt": [0, 0]})
+    puts = pd.DataFrame({"Strike": [90.0], "Volume": [2], "OpenInt": [0]})
+    return {
+        "ticker": ticker,
+        "dates": ["17/01/2025"],
+        "big_dict": {"17/01/2025": {"calls": calls, "puts": puts}},
+    }
+
+
+def test_read_symbols_cboe_weeklys() -> None:
+    symbols = read_symbols(DATA_DIR / "cboe_symbol_dir_weeklys.csv")
+    assert symbols[:3] == ["DDD", "MMM", "ABT"]
+    assert "ZNGA" in symbols
+    assert len(symbols) == len(set(symbols))
+
+
+def test_run_batch_isolates_errors_and_timeouts() -> None:
+    df = run_batch(
+        ["aaa", "BAD", "SLOW", "BBB", "aaa"],
+        source=_fake_loader,
+        val="Volume",
+        max_workers=2,
+        timeout=3.0,
+        verbose=False,
+    )
+    assert list(df["ticker"]) == ["AAA", "BAD", "SLOW", "BBB"]
+    assert list(df["status"]) == ["ok", "error", "timeout", "ok"]
+    assert "no options listed" in df.loc[1, "error"]
+    ok = df.iloc[0]
+    assert ok["calls"] == 4 and ok["puts"] == 2 and ok["all"] == 6
+    assert ok["putCallRatio"] == 0.5
+    assert np.isclose(ok["callsMean"], 107.5)
+    assert df.attrs["tickers_per_minute"] > 0
+
+
+def test_run_batch_hung_ticker_does_not_time_out_the_queue() -> None:
+    start = time.perf_counter()
+    df = run_batch(
+        ["SLOW", "NAP1", "NAP2", "NAP3"],
+        source=_fake_loader,
+        max_workers=1,
+        timeout=1.0,
+        verbose=False,
+    )
+    assert list(df["status"]) == ["timeout", "ok", "ok", "ok"]
+    assert time.perf_counter() - start < 10  # the hung worker was killed, not waited for
+
+
+def test_run_batch_writes_combined_report(tmp_path) -> None:
+    df = run_batch(
+        ["AAA", "BAD", "BBB"],
+        source=_fake_loader,
+        max_workers=2,
+        verbose=False,
+        report_dir=tmp_path,
+        combined_report=True,
+    )
+    assert "strikeStats" not in df.columns
+    assert [Path(p).name for p in df.attrs["report_files"]] == ["plotly.min.js", "report.html"]
+    text = (tmp_path / "report.html").read_text()
+    assert "<h2>AAA</h2>" in text and "<h2>BBB</h2>" in text and "BAD" not in text
@@ -0,0 +1,110 @@
+"""Tests for the compact in-memory mode and the memory report."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from options_analysis import OptsAnalysis
+from options_analysis.chain import OptionsChain
+from options_analysis.compact import compact_chain, compact_frame
+from options_analysis.sources.tradestation import load_tradestation_file
+
+DATES = ["17/01/2025", "24/01/2025", "21/02/2025"]
+N = 60
+
+
+def _source() -> dict[str, object]:
+    rng = np.random.default_rng(0)
+    strikes = np.round(np.arange(N) * 2.5 + 100.35, 2)  # cents float32 does not hold exactly
+
+    def side(kind: str) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "contractSymbol": [f"XYZ{kind}{i:05d}" for i in range(N)],
+                "Strike": strikes,
+                "Volume": rng.integers(0, 5_000, N),
+                "OpenInt": rng.integers(0, 20_000, N),
+                "Bid": rng.uniform(0, 10, N),
+                "Ask": rng.uniform(0, 10, N),
+                "ImpVol": rng.uniform(0.1, 0.9, N),
+                "currency": ["USD"] * N,
+                "change": ["-"] * N,
+            }
+        )
+
+    big_dict = {d: {"calls": side("C"), "puts": side("P")} for d in DATES}
+    return {"ticker": "XYZ", "dates": DATES, "big_dict": big_dict}
+
+
+def _pair() -> tuple[OptsAnalysis, OptsAnalysis]:
+    full, compact = OptsAnalysis(), OptsAnalysis(compact=True)
+    full.load_from_source(_source())  # type: ignore[arg-type]
+    compact.load_from_source(_source())  # type: ignore[arg-type]
+    return full, compact
+
+
+def test_compact_mode_gives_identical_results() -> None:
+    full, compact = _pair()
+    chain = compact.Chain
+    assert chain.strike.dtype == np.float32 and chain.volume.dtype == np.int32
+    assert chain.iv is not None and chain.iv.dtype == np.float32
+    for v in ("Volume", "OpenInt", "Both"):
+        for dates in (DATES, DATES[1:2]):
+            pd.testing.assert_frame_equal(compact.GetOptsDF(v, dates), full.GetOptsDF(v, dates))
+    pd.testing.assert_frame_equal(compact.GetTimelineStats(), full.GetTimelineStats())
+    assert compact.GetMaxPain() == full.GetMaxPain()
+    now = datetime(2025, 1, 10)
+    pd.testing.assert_frame_equal(
+        compact.GetGreeks(120.0, now=now), full.GetGreeks(120.0, now=now), rtol=1e-4
+    )
+
+
+def test_compact_mode_drops_source_frames_and_memory_report() -> None:
+    full, compact = _pair()
+    calls = compact.BigDict[DATES[0]]["calls"]
+    assert list(calls.columns) == ["Strike", "Volume", "OpenInt", "Bid", "Ask", "ImpVol"]
+    pd.testing.assert_frame_equal(
+        calls[["Strike", "Volume"]],
+        full.BigDict[DATES[0]]["calls"][["Strike", "Volume"]],
+        check_dtype=False,
+    )
+    report, compact_report = full.memory_report(), compact.memory_report()
+    assert list(report.index) == [*DATES, "total"]
+    assert report.loc[DATES[0], "chain.strike"] == 2 * N * 8
+    assert compact_report.loc[DATES[0], "chain.strike"] == 2 * N * 4
+    assert report.loc["total", "total"] == report["total"].iloc[:-1].sum()
+    assert all(c.startswith("chain.") or c == "total" for c in compact_report.columns)
+    # Only the narrowed chain is held: no second copy in source frames
+    chain_bytes = sum(v.nbytes for v in compact.Chain.columns().values())
+    assert compact_report.loc["total", "total"] == chain_bytes
+    assert compact_report.loc["total", "total"] < 0.2 * report.loc["total", "total"]
+
+
+def test_compact_frame() -> None:
+    calls = compact_frame(_source()["big_dict"][DATES[0]]["calls"])  # type: ignore[index]
+    assert "change" not in calls.columns  # held nothing but "-"
+    assert isinstance(calls["currency"].dtype, pd.CategoricalDtype)
+    assert not isinstance(calls["contractSymbol"].dtype, pd.CategoricalDtype)  # all distinct
+    assert calls["Volume"].dtype == np.int32 and calls["Bid"].dtype == np.float32
+    assert calls["Strike"].dtype == np.float64
+
+
+def test_strikes_that_float32_cannot_restore_stay_float64() -> None:
+    z = np.zeros(2, dtype=np.int64)
+    chain = OptionsChain(["17/01/2025"], z, z, [33.333, 1e6 + 0.01], z, z)
+    assert compact_chain(chain).strike.dtype == np.float64
+
+
+def test_compact_file_chain_is_viewed_not_copied(tmp_path) -> None:
+    path = tmp_path / "xyz.csv"
+    path.write_text(
+        "Pos,Bid,Ask,Volume,Open Int,Strike,Strike,Bid,Ask,Volume\n"
+        "Jan 17 25,,,,,,,,,\n"
+        ",1.10,1.20,12,34,100.5,100.5,0.40,0.50,15\n"
+    )
+    opts = OptsAnalysis(compact=True)
+    opts.load_from_source(load_tradestation_file(path))
+    assert opts.BigDict["Jan 17 25"]["calls"]["Strike"].tolist() == [100.5]
+    report = opts.memory_report()
+    assert not any(c for c in report.columns if not c.startswith("chain.") and c != "total")
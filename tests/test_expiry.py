@@ -0,0 +1,84 @@
+"""Tests for expiration parsing and the sorted date index."""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from options_analysis import OptsAnalysis
+from options_analysis.expiry import ExpiryIndex, parse_dte_range, parse_expiry
+
+# Mixed formats as merged sources produce them, not in date order:
+# 17 Jan (monthly), 24 Jan (weekly), 20 Mar (Thursday monthly: Good Friday-style gap), 21 Feb
+LABELS = ["17/01/2025", "Jan 24 25", "03/20/25", "2025-02-21", "Exp 0001"]
+
+
+@pytest.mark.parametrize(
+    ("label", "expected"),
+    [
+        ("17/01/2025", date(2025, 1, 17)),
+        ("01/17/25", date(2025, 1, 17)),
+        ("2025-01-17", date(2025, 1, 17)),
+        ("Jan 17 25", date(2025, 1, 17)),
+        ("January 17, 2025", date(2025, 1, 17)),
+        ("Exp 0001", None),
+    ],
+)
+def test_parse_expiry_formats(label: str, expected: date | None) -> None:
+    assert parse_expiry(label) == expected
+
+
+def test_parse_dte_range() -> None:
+    assert parse_dte_range("7-45") == (7, 45)
+    assert parse_dte_range("7–45 days") == (7, 45)
+    assert parse_dte_range("7 to 45d") == (7, 45)
+    assert parse_dte_range("30+") == (30, None)
+    assert parse_dte_range("14 days") == (14, 14)
+    with pytest.raises(ValueError):
+        parse_dte_range("45-7")
+    with pytest.raises(ValueError):
+        parse_dte_range("soon")
+
+
+def test_index_windows_are_in_date_order_across_formats() -> None:
+    index = ExpiryIndex(LABELS)
+    assert not index.complete
+    assert index.days.dtype == np.dtype("datetime64[D]") and np.isnat(index.days[-1])
+    assert index.between() == ["17/01/2025", "Jan 24 25", "2025-02-21", "03/20/25"]
+    # Bounds in any format, and not necessarily expirations
+    assert index.between("2025-01-20", date(2025, 2, 21)) == ["Jan 24 25", "2025-02-21"]
+    assert index.between("Jan 24 25", "Jan 24 25") == ["Jan 24 25"]
+    assert index.by_dte(0, 10, today=date(2025, 1, 14)) == ["17/01/2025", "Jan 24 25"]
+    with pytest.raises(ValueError, match="Not a date"):
+        index.between("someday")
+
+
+def test_bounds_are_read_in_label_format_then_day_first() -> None:
+    day_first = ExpiryIndex(["17/01/2025", "21/03/2025"])
+    for bound in ("03/04/2025", "03/04/25", "2025-04-03"):
+        assert day_first.day(bound) == np.datetime64("2025-04-03")
+    assert ExpiryIndex(["01/17/25"]).day("03/04/25") == np.datetime64("2025-03-04")
+
+
+def test_calendar_filters() -> None:
+    index = ExpiryIndex(LABELS)
+    assert index.between(calendar="monthly") == ["17/01/2025", "2025-02-21", "03/20/25"]
+    assert index.between(calendar="weekly") == ["Jan 24 25"]
+    assert index.between(calendar="quarterly") == ["03/20/25"]
+    # A third-week Thursday is a weekly when the Friday after it is listed too
+    assert ExpiryIndex(["20/03/2025", "21/03/2025"]).between(calendar="monthly") == ["21/03/2025"]
+    with pytest.raises(ValueError, match="calendar"):
+        index.between(calendar="daily")
+
+
+def test_opts_analysis_date_windows() -> None:
+    opts = OptsAnalysis()
+    dates = ["2025-02-21", "17/01/2025", "Jan 24 25"]
+    opts.load_from_source({"ticker": "XYZ", "dates": dates, "big_dict": {}})
+    assert opts.GetDatesStartEnd() == ["17/01/2025", "Jan 24 25", "2025-02-21"]
+    assert opts.GetDatesStartEnd("01/20/25") == ["Jan 24 25", "2025-02-21"]
+    assert opts.GetDatesStartEnd(calendar="monthly") == ["17/01/2025", "2025-02-21"]
+    assert opts.GetDatesStartEnd("nonsense") == []
+    today = date(2025, 1, 10)
+    assert opts.GetDatesByDTE("7-14 days", today=today) == ["17/01/2025", "Jan 24 25"]
+    assert opts.GetDatesByDTE("7+", today=today, calendar="weekly") == ["Jan 24 25"]
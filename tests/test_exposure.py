@@ -0,0 +1,99 @@
+"""Tests for max pain, GEX and gamma flip (options_analysis.exposure + OptsAnalysis)."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from options_analysis import OptsAnalysis
+from options_analysis.exposure import gamma_flip, max_pain, segmented_cumsum
+
+NOW = datetime(2025, 1, 10, 16, 0)
+
+
+def _brute_force_payout(strikes: np.ndarray, calls: np.ndarray, puts: np.ndarray) -> np.ndarray:
+    return np.array(
+        [
+            np.sum(calls * np.maximum(s - strikes, 0)) + np.sum(puts * np.maximum(strikes - s, 0))
+            for s in strikes
+        ]
+    )
+
+
+def test_segmented_cumsum_restarts() -> None:
+    seg = np.array([0, 0, 1, 1, 1, 3])
+    assert list(segmented_cumsum(seg, np.array([1, 2, 3, 4, 5, 6]))) == [1, 3, 3, 7, 12, 6]
+
+
+def test_max_pain_matches_brute_force() -> None:
+    rng = np.random.default_rng(0)
+    seg = np.repeat([0, 1, 2], [40, 1, 25])
+    strikes = np.concatenate([np.sort(rng.choice(200, n, replace=False)) for n in (40, 1, 25)])
+    calls = rng.integers(0, 1000, seg.size).astype(float)
+    puts = rng.integers(0, 1000, seg.size).astype(float)
+    payout, pain = max_pain(seg, strikes, calls, puts)
+    for s in range(3):
+        m = seg == s
+        expected = _brute_force_payout(strikes[m], calls[m], puts[m])
+        assert np.allclose(payout[m], expected)
+        assert pain[s] == strikes[m][np.argmin(expected)]
+
+
+def test_gamma_flip_interpolates_first_crossing() -> None:
+    seg = np.array([0, 0, 0, 0, 1, 1])
+    strikes = np.array([90.0, 100.0, 110.0, 120.0, 90.0, 100.0])
+    net = np.array([-10.0, -10.0, 40.0, 5.0, 1.0, 1.0])
+    flips = gamma_flip(seg, strikes, net)
+    assert np.isclose(flips[0], 105.0)  # cumulative -10, -20, +20: crosses halfway
+    assert np.isnan(flips[1])  # never negative
+
+
+def _opts() -> OptsAnalysis:
+    def block(call_oi: list[int], put_oi: list[int]) -> dict[str, pd.DataFrame]:
+        strikes = [90.0, 100.0, 110.0]
+        return {
+            "calls": pd.DataFrame({"Strike": strikes, "OpenInt": call_oi, "ImpVol": 0.3}),
+            "puts": pd.DataFrame({"Strike": strikes, "OpenInt": put_oi, "ImpVol": 0.3}),
+        }
+
+    opts = OptsAnalysis()
+    opts.load_from_source(
+        {
+            "ticker": "T",
+            "dates": ["17/01/2025", "24/01/2025"],
+            "big_dict": {
+                "17/01/2025": block([0, 10, 100], [100, 10, 0]),
+                "24/01/2025": block([500, 0, 0], [0, 0, 10]),
+            },
+        }
+    )
+    return opts
+
+
+def test_get_max_pain_window_and_by_expiry() -> None:
+    opts = _opts()
+    by_exp = opts.GetMaxPain(by_expiry=True)
+    assert isinstance(by_exp, pd.Series)
+    assert by_exp.to_dict() == {"17/01/2025": 100.0, "24/01/2025": 90.0}
+    assert opts.GetMaxPain(dates=["17/01/2025"]) == 100.0
+    assert opts.GetMaxPain() == 90.0
+    assert opts.GetMaxPain(dates=["99/99/9999"]) is None
+
+
+def test_get_gex_signs_and_flip() -> None:
+    opts = _opts()
+    gex = opts.GetGEX(100.0, dates=["17/01/2025"], now=NOW)
+    assert gex is not None
+    assert list(gex.index) == [90.0, 100.0, 110.0]
+    assert (gex["calls"] >= 0).all() and (gex["puts"] <= 0).all()
+    assert np.allclose(gex["net"], gex["calls"] + gex["puts"])
+    # symmetric OI around spot: ATM calls and puts cancel
+    assert np.isclose(gex.loc[100.0, "net"], 0.0)
+    flip = opts.GetGammaFlip(100.0, dates=["17/01/2025"], now=NOW)
+    assert isinstance(flip, float) and 100.0 < flip < 110.0
+    by_exp = opts.GetGEX(100.0, by_expiry=True, now=NOW)
+    assert by_exp is not None
+    assert by_exp.index.names == ["expiry", "strike"]
+    assert np.isclose(by_exp["net"].sum(), opts.GetGEX(100.0, now=NOW)["net"].sum())
+    flips = opts.GetGammaFlip(100.0, by_expiry=True, now=NOW)
+    assert isinstance(flips, pd.Series) and list(flips.index) == ["17/01/2025", "24/01/2025"]
@@ -0,0 +1,132 @@
+"""Tests for sources.fetch (concurrency, retries, rate limiting) and the yfinance loader."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+import yfinance
+
+import options_analysis.sources.yfinance_source as yfinance_source
+from options_analysis.sources.fetch import RetryPolicy, TokenBucket, fetch_concurrently
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0.0)
+
+
+def test_fetch_concurrently_bounds_workers_and_keeps_order() -> None:
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch(key: str) -> str:
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02 * (5 - int(key)))  # later keys finish first
+        with lock:
+            active[0] -= 1
+        return key * 2
+
+    keys = [str(i) for i in range(5)]
+    results, log = fetch_concurrently(keys, fetch, max_workers=2, retry=NO_WAIT)
+    assert results == {k: k * 2 for k in keys}
+    assert [r["key"] for r in log] == keys
+    assert all(r["status"] == "ok" and r["attempts"] == 1 and r["seconds"] > 0 for r in log)
+    assert peak[0] == 2
+
+
+def test_fetch_concurrently_retries_and_reports_failures() -> None:
+    calls: dict[str, int] = {}
+
+    def fetch(key: str) -> str:
+        calls[key] = calls.get(key, 0) + 1
+        if key == "flaky" and calls[key] < 3:
+            raise RuntimeError("429 Too Many Requests")
+        if key == "broken":
+            raise ValueError("no data")
+        return "ok"
+
+    results, log = fetch_concurrently(["flaky", "broken", "fine"], fetch, retry=NO_WAIT)
+    assert results == {"flaky": "ok", "fine": "ok"}
+    by_key = {r["key"]: r for r in log}
+    assert by_key["flaky"]["attempts"] == 3 and by_key["flaky"]["status"] == "ok"
+    assert by_key["broken"]["status"] == "error" and by_key["broken"]["attempts"] == 3
+    assert "ValueError: no data" in by_key["broken"]["error"]
+
+
+def test_fetch_concurrently_times_out_hung_requests() -> None:
+    def fetch(key: str) -> str:
+        if key == "hang":
+            time.sleep(2)
+        return key
+
+    start = time.monotonic()
+    results, log = fetch_concurrently(
+        ["hang", "a"], fetch, timeout=0.1, retry=RetryPolicy(max_attempts=2, base_delay=0.0)
+    )
+    assert time.monotonic() - start < 1.0
+    assert results == {"a": "a"}
+    assert log[0]["status"] == "timeout" and log[0]["attempts"] == 2
+
+
+def test_token_bucket_rate() -> None:
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0])
+    assert bucket.try_acquire() == 0.0 and bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.try_acquire() == 0.0
+    now[0] = 100.0  # refills up to capacity only
+    assert [bucket.try_acquire() for _ in range(3)][-1] > 0
+
+
+def test_fetch_concurrently_respects_limiter() -> None:
+    bucket = TokenBucket(rate=40.0, capacity=1)
+    start = time.monotonic()
+    fetch_concurrently([str(i) for i in range(9)], str, max_workers=8, limiter=bucket)
+    assert time.monotonic() - start >= 8 / 40.0 * 0.9
+
+
+def test_retry_policy_delay_bounds() -> None:
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+    assert all(0 <= policy.delay(1) <= 0.5 for _ in range(50))
+    assert all(0 <= policy.delay(10) <= 3.0 for _ in range(50))
+    assert RetryPolicy(base_delay=0.5, jitter=False).delay(3) == 2.0
+
+
+class _StubTicker:
+    """Stands in for yf.Ticker; the 24th fails once, the 31st always."""
+
+    calls: dict[str, int] = {}
+
+    def __init__(self, symbol: str) -> None:
+        self.options = ("2025-01-17", "2025-01-24", "2025-01-31", "2025-02-07")
+
+    def option_chain(self, exp: str) -> SimpleNamespace:
+        n = _StubTicker.calls[exp] = _StubTicker.calls.get(exp, 0) + 1
+        if exp == "2025-01-31" or (exp == "2025-01-24" and n == 1):
+            raise RuntimeError("Too Many Requests. Rate limited.")
+        frame = pd.DataFrame({"strike": [100.0], "volume": [1.0], "openInterest": [2]})
+        return SimpleNamespace(calls=frame, puts=frame)
+
+
+def test_load_yfinance_concurrent_with_stub(monkeypatch) -> None:
+    _StubTicker.calls = {}
+    monkeypatch.setattr(yfinance, "Ticker", _StubTicker)
+    result = yfinance_source.load_yfinance("pltr", max_workers=3, retry=NO_WAIT, limiter=None)
+    assert result["dates"] == ["17/01/2025", "24/01/2025", "31/01/2025", "07/02/2025"]
+    assert list(result["big_dict"]) == ["17/01/2025", "24/01/2025", "07/02/2025"]
+    log = {r["key"]: r for r in result["fetch_log"]}
+    assert log["24/01/2025"]["attempts"] == 2 and log["24/01/2025"]["status"] == "ok"
+    assert log["31/01/2025"]["status"] == "error"
+    assert len(result["chain"]) == 6
+
+
+def test_load_yfinance_all_failed_raises(monkeypatch) -> None:
+    class Down(_StubTicker):
+        def option_chain(self, exp: str) -> SimpleNamespace:
+            raise ConnectionError("offline")
+
+    monkeypatch.setattr(yfinance, "Ticker", Down)
+    with pytest.raises(RuntimeError, match="offline"):
+        yfinance_source.load_yfinance("X", retry=NO_WAIT, limiter=None)
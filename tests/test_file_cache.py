@@ -0,0 +1,98 @@
+"""Tests for the parsed-file cache used by TradeStation Excel imports."""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import options_analysis.sources.tradestation as tradestation
+from options_analysis import OptsAnalysis
+from options_analysis.file_cache import ParsedFileCache
+from options_analysis.sources.tradestation import load_tradestation_file
+
+ROWS = [
+    ["Volume", "Open Int", "Strike", "Strike", "Volume", "Open Int"],
+    ["Jan 17 25", None, None, None, None, None],
+    [100, 50, 100, 100, 80, 30],
+    [200, 80, 105, 105, 150, 60],
+    ["Jan 24 25", None, None, None, None, None],
+    [5, 6, 110, 110, 7, 8],
+]
+
+
+def _write_xlsx(path, rows=ROWS) -> None:
+    pd.DataFrame(rows).to_excel(path, header=False, index=False)
+
+
+@pytest.fixture
+def no_excel(monkeypatch):
+    """Fail the test if anything parses Excel."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Excel was parsed")
+
+    return lambda: monkeypatch.setattr(tradestation.pd, "read_excel", fail)
+
+
+def test_second_load_skips_excel_parsing(tmp_path, no_excel) -> None:
+    export = tmp_path / "pltr.xlsx"
+    _write_xlsx(export)
+    cache = ParsedFileCache(tmp_path / "cache")
+    first = load_tradestation_file(export, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    no_excel()
+    opts = OptsAnalysis()
+    opts.BuildFromTS(str(export), cache=cache)
+    assert cache.hits == 1 and opts.Chain.mapped
+    assert opts.Dates == ["Jan 17 25", "Jan 24 25"]
+    for name, values in first["chain"].columns().items():
+        np.testing.assert_array_equal(opts.Chain.columns()[name], values)
+
+    copy = tmp_path / "copy.xlsx"  # same bytes under another name: same entry, own ticker
+    shutil.copy(export, copy)
+    assert load_tradestation_file(copy, cache=cache)["ticker"] == "COPY"
+    assert cache.hits == 2
+
+
+def test_changed_file_or_loader_invalidates_entry(tmp_path, monkeypatch) -> None:
+    export = tmp_path / "pltr.xlsx"
+    _write_xlsx(export)
+    cache = ParsedFileCache(tmp_path / "cache")
+    load_tradestation_file(export, cache=cache)
+
+    def entries() -> list[str]:
+        return sorted(p.name for p in cache.root.iterdir() if p.name != "sources")
+
+    (old_entry,) = entries()
+
+    _write_xlsx(export, [*ROWS, [9, 9, 120, 120, 9, 9]])
+    os.utime(export, ns=(1, 1))  # content and mtime change
+    result = load_tradestation_file(export, cache=cache)
+    assert cache.misses == 2 and len(result["chain"]) == 8
+    assert entries() != [old_entry] and len(entries()) == 1  # the stale entry is gone
+
+    monkeypatch.setattr(tradestation, "LOADER_VERSION", tradestation.LOADER_VERSION + 1)
+    load_tradestation_file(export, cache=cache)
+    assert cache.misses == 3
+    assert entries()[0].startswith(f"tradestation-v{tradestation.LOADER_VERSION}-")
+
+
+def test_entry_shared_by_another_path_survives_a_change(tmp_path, no_excel) -> None:
+    export, copy = tmp_path / "pltr.xlsx", tmp_path / "copy.xlsx"
+    _write_xlsx(export)
+    shutil.copy(export, copy)
+    cache = ParsedFileCache(tmp_path / "cache")
+    load_tradestation_file(export, cache=cache)
+    load_tradestation_file(copy, cache=cache)
+
+    _write_xlsx(export, [*ROWS, [9, 9, 120, 120, 9, 9]])
+    os.utime(export, ns=(1, 1))
+    load_tradestation_file(export, cache=cache)
+    assert cache.misses == 2
+
+    no_excel()  # the copy's entry was kept: no re-parse
+    assert len(load_tradestation_file(copy, cache=cache)["chain"]) == 6
+    assert cache.hits == 2
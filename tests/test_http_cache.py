@@ -0,0 +1,137 @@
+"""Tests for the shared HTTP cache against a local HTTP server."""
+
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from shared.http_cache import HttpCache, OfflineCacheMissError, default_cache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """/page has an ETag (answers 304 when matched); /dated only Last-Modified; /gone 404."""
+
+    requests: list[tuple[str, str | None]] = []
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.requests.append(
+            (self.path, self.headers.get("If-None-Match") or self.headers.get("If-Modified-Since"))
+        )
+        if self.path == "/gone":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path == "/page" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f"body of {self.path}".encode() * 10
+        self.send_response(200)
+        if self.path == "/page":
+            self.send_header("ETag", '"v1"')
+        else:
+            self.send_header("Last-Modified", "Wed, 01 Jan 2025 00:00:00 GMT")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_then_conditional_revalidation(server: str, tmp_path) -> None:
+    clock = _Clock()
+    cache = HttpCache(tmp_path, ttls={"test": 60.0}, clock=clock)
+    first = cache.get(f"{server}/page", "test", timeout=5)
+    assert first.ok and not first.from_cache
+    again = cache.get(f"{server}/page", "test", timeout=5)
+    assert again.from_cache and again.content == first.content
+    assert len(_Handler.requests) == 1
+
+    clock.now += 61  # stale: revalidated with the ETag, the server answers 304
+    revalidated = cache.get(f"{server}/page", "test", timeout=5)
+    assert revalidated.from_cache and revalidated.content == first.content
+    assert _Handler.requests[-1] == ("/page", '"v1"')
+
+    clock.now += 61  # Last-Modified only: If-Modified-Since, full 200 re-download
+    cache.get(f"{server}/dated", "test", timeout=5)
+    clock.now += 61
+    cache.get(f"{server}/dated", "test", timeout=5)
+    assert _Handler.requests[-1] == ("/dated", "Wed, 01 Jan 2025 00:00:00 GMT")
+
+    stats = cache.stats
+    assert (stats.hits, stats.revalidated, stats.misses) == (1, 1, 3)
+    assert stats.hit_rate == 0.4
+
+
+def test_errors_are_not_cached_and_state_persists(server: str, tmp_path) -> None:
+    cache = HttpCache(tmp_path)
+    assert cache.get(f"{server}/gone").status_code == 404
+    assert cache.get(f"{server}/gone").status_code == 404
+    assert len(_Handler.requests) == 2
+    cache.get(f"{server}/page")
+
+    reopened = HttpCache(tmp_path)  # a new process sees the stored page
+    assert reopened.get(f"{server}/page").from_cache
+    assert reopened.size() == cache.size() > 0
+    assert len(_Handler.requests) == 3
+
+
+def test_lru_bound_evicts_least_recently_used(server: str, tmp_path) -> None:
+    clock = _Clock()
+    size = len(b"body of /a" * 10)
+    cache = HttpCache(tmp_path, max_bytes=2 * size, clock=clock)
+    for path in ("/a", "/b"):
+        clock.now += 1
+        cache.get(f"{server}{path}")
+    clock.now += 1
+    assert cache.get(f"{server}/a").from_cache  # /a is now the most recently used
+    clock.now += 1
+    cache.get(f"{server}/c")
+    assert cache.stats.evicted == 1 and cache.size() == 2 * size
+    assert cache.lookup(f"{server}/a") is not None
+    assert cache.lookup(f"{server}/b") is None
+
+
+def test_offline_serves_stale_pages_and_raises_on_misses(server: str, tmp_path) -> None:
+    clock = _Clock()
+    HttpCache(tmp_path, clock=clock).get(f"{server}/page")
+    clock.now += 10 * 86400
+    offline = HttpCache(tmp_path, offline=True, clock=clock)
+    assert offline.get(f"{server}/page").from_cache
+    with pytest.raises(OfflineCacheMissError):
+        offline.get(f"{server}/other")
+    assert len(_Handler.requests) == 1
+    assert offline.stats.offline_misses == 1
+
+
+def test_default_cache_follows_environment(monkeypatch, tmp_path) -> None:
+    assert default_cache() is None  # disabled for the test session by conftest
+    monkeypatch.setenv("SOA_HTTP_CACHE", "on")
+    monkeypatch.setenv("SOA_HTTP_CACHE_DIR", str(tmp_path))
+    cache = default_cache()
+    assert cache is not None and cache.root == tmp_path and not cache.offline
+    assert default_cache() is cache
+    monkeypatch.setenv("SOA_HTTP_OFFLINE", "1")
+    offline = default_cache()
+    assert offline is not None and offline.offline
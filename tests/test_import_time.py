@@ -0,0 +1,46 @@
+"""Import-time budget: `import options_analysis` must not load plotting or web stacks."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+HEAVY = ("plotly", "matplotlib", "yfinance", "requests", "bs4", "psutil")
+# Seconds on top of numpy + pandas (which the package needs at import); override on slow CI
+BUDGET = float(os.environ.get("SOA_IMPORT_BUDGET", "0.2"))
+
+PROBE = """
+import json, sys, time
+import numpy, pandas
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _probe(module: str) -> tuple[float, set[str]]:
+    """Seconds to import ``module`` in a fresh interpreter, and the modules loaded then."""
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    result = json.loads(out.stdout)
+    return result["seconds"], set(result["modules"])
+
+
+def test_import_loads_no_heavy_dependencies() -> None:
+    for module in ("options_analysis", "stock_data"):
+        heavy = _probe(module)[1] & set(HEAVY)
+        assert not heavy, f"{module} imports {sorted(heavy)}"
+
+
+def test_import_time_budget() -> None:
+    seconds = min(_probe("options_analysis")[0] for _ in range(3))
+    assert seconds < BUDGET, f"import options_analysis took {seconds:.3f} s (budget {BUDGET} s)"
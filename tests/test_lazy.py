@@ -0,0 +1,162 @@
+"""Tests for lazily fetched expirations (sources.lazy and load_yfinance(lazy=True))."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+import yfinance
+
+from options_analysis import OptsAnalysis
+from options_analysis.sources.fetch import RetryPolicy
+from options_analysis.sources.lazy import LazyExpiries
+from options_analysis.sources.yfinance_source import load_yfinance
+
+EXPIRATIONS = ["2025-01-17", "2025-01-24", "2025-01-31", "2025-02-07"]
+
+
+class _StubTicker:
+    """Stands in for yf.Ticker: records which expirations were requested."""
+
+    requested: list[str] = []
+
+    def __init__(self, symbol: str) -> None:
+        self.options = tuple(EXPIRATIONS)
+
+    def option_chain(self, exp: str) -> SimpleNamespace:
+        _StubTicker.requested.append(exp)
+        day = int(exp[-2:])
+        calls = pd.DataFrame({"strike": [100.0, 110.0], "volume": [day, 1.0], "openInterest": 5})
+        puts = pd.DataFrame({"strike": [90.0], "volume": [2.0], "openInterest": ["1,000"]})
+        return SimpleNamespace(calls=calls, puts=puts)
+
+
+@pytest.fixture
+def stub_yf(monkeypatch):
+    _StubTicker.requested = []
+    monkeypatch.setattr(yfinance, "Ticker", _StubTicker)
+    return _StubTicker
+
+
+def test_lazy_yfinance_fetches_only_queried_expiries(stub_yf) -> None:
+    opts = OptsAnalysis()
+    opts.BuildFromYFinance("pltr", lazy=True)
+    dates = opts.GetExpirationDates()
+    assert dates == ["17/01/2025", "24/01/2025", "31/01/2025", "07/02/2025"]
+    assert stub_yf.requested == []
+
+    result = opts.PlotHistByDate(dates[0], "Volume", plot=False)
+    assert result is not None and result.sides["calls"].total == 18
+    assert stub_yf.requested == ["2025-01-17"]
+
+    df = opts.GetOptsDF("OpenInt", dates=dates[1:3])
+    assert df is not None and df.loc[90.0, "puts"] == 2000
+    assert sorted(stub_yf.requested) == ["2025-01-17", "2025-01-24", "2025-01-31"]
+    # Earlier results are unaffected by the chain growing
+    assert opts.GetOptsDF("Volume", dates=dates[:1]).loc[100.0, "calls"] == 17
+
+    assert len(opts.Chain.expiries) == 4 and len(stub_yf.requested) == 4
+    assert opts.BigDict["07/02/2025"]["calls"]["Volume"].dtype == "int64"
+
+
+def test_snapshot_of_lazy_load_is_complete(stub_yf, tmp_path) -> None:
+    opts = OptsAnalysis()
+    opts.BuildFromYFinance("PLTR", lazy=True)
+    opts.GetOptsDF("Volume", dates=opts.GetExpirationDates()[:1])
+    opts.SaveSnapshot(tmp_path)
+    assert sorted(stub_yf.requested) == EXPIRATIONS
+    reopened = OptsAnalysis()
+    reopened.BuildFromSnapshot(tmp_path, "PLTR")
+    assert len(reopened.BigDict) == 4
+    pd.testing.assert_frame_equal(reopened.GetTimelineStats(), opts.GetTimelineStats())
+
+
+def test_lazy_expiry_fetch_times_out(stub_yf, monkeypatch) -> None:
+    hang = threading.Event()
+    slow = stub_yf.option_chain
+
+    def option_chain(self, exp: str) -> SimpleNamespace:
+        if exp == EXPIRATIONS[0]:
+            hang.wait(10)
+        return slow(self, exp)
+
+    monkeypatch.setattr(stub_yf, "option_chain", option_chain)
+    result = load_yfinance("PLTR", lazy=True, timeout=0.2, retry=RetryPolicy(max_attempts=2))
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError, match="after 2 attempts"):
+        result["big_dict"]["17/01/2025"]
+    assert time.perf_counter() - start < 3
+    assert result["big_dict"]["24/01/2025"]["calls"]["Strike"].tolist() == [100.0, 110.0]
+    hang.set()
+
+
+def test_lazy_matches_eager(stub_yf) -> None:
+    lazy, eager = OptsAnalysis(), OptsAnalysis()
+    lazy.BuildFromYFinance("PLTR", lazy=True)
+    eager.BuildFromYFinance("PLTR")
+    dates = eager.GetExpirationDates()
+    pd.testing.assert_frame_equal(lazy.GetOptsDF("Both", dates), eager.GetOptsDF("Both", dates))
+    pd.testing.assert_frame_equal(lazy.GetTimelineStats(), eager.GetTimelineStats())
+    assert lazy.GetMaxPain() == eager.GetMaxPain()
+
+
+def test_compact_lazy_load_compacts_fetched_frames(stub_yf) -> None:
+    lazy, compact = OptsAnalysis(), OptsAnalysis(compact=True)
+    lazy.BuildFromYFinance("PLTR", lazy=True)
+    compact.BuildFromYFinance("PLTR", lazy=True)
+    dates = lazy.GetExpirationDates()
+    pd.testing.assert_frame_equal(
+        compact.GetOptsDF("Both", dates[:2]), lazy.GetOptsDF("Both", dates[:2])
+    )
+    calls = compact.BigDict[dates[0]]["calls"]
+    assert calls["Volume"].dtype == "int32" and calls["Strike"].dtype == "float64"
+    assert compact.BigDict[dates[0]]["calls"] is calls  # compacted once, not per access
+    assert (
+        compact.memory_report().loc[dates[0], "Volume"]
+        < lazy.memory_report().loc[dates[0], "Volume"]
+    )
+    # Growing the chain again compacts only the newly fetched frames, with nothing refetched
+    pd.testing.assert_frame_equal(compact.GetOptsDF("Both", dates), lazy.GetOptsDF("Both", dates))
+    assert compact.BigDict[dates[0]]["calls"] is calls
+    assert compact.BigDict[dates[-1]]["puts"]["OpenInt"].dtype == "int32"
+    assert len(stub_yf.requested) == 2 * len(EXPIRATIONS)
+
+
+def test_prefetch_nearest_and_single_request_per_expiry() -> None:
+    calls: list[str] = []
+    gate = threading.Event()
+
+    def fetch(date: str) -> dict[str, pd.DataFrame]:
+        gate.wait(5)
+        calls.append(date)
+        return {"calls": pd.DataFrame({"Strike": [1.0], "Volume": ["1K"]})}
+
+    lazy = LazyExpiries(["a", "b", "c"], fetch, prefetch=2)
+    assert lazy.loaded == [] and "c" in lazy and len(lazy) == 3
+    gate.set()
+    assert lazy["a"]["calls"]["Volume"].tolist() == [1000]  # joins the prefetch
+    deadline = time.time() + 5
+    while lazy.loaded != ["a", "b"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert lazy.loaded == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+    lazy.close()
+
+
+def test_failed_fetch_is_retried() -> None:
+    attempts: list[str] = []
+
+    def fetch(date: str) -> dict[str, pd.DataFrame]:
+        attempts.append(date)
+        if len(attempts) == 1:
+            raise RuntimeError("rate limited")
+        return {"calls": pd.DataFrame({"Strike": [1.0]})}
+
+    lazy = LazyExpiries(["a"], fetch)
+    with pytest.raises(RuntimeError):
+        lazy["a"]
+    assert lazy.loaded == []
+    assert len(lazy["a"]["calls"]) == 1 and attempts == ["a", "a"]
+    with pytest.raises(KeyError):
+        lazy["zzz"]
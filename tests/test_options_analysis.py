@@ -1,10 +1,14 @@
 """Tests for options_analysis: parsing, GetDatesStartEnd, GetOptsDF."""
 
+from datetime import date
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from options_analysis import OptsAnalysis
+from options_analysis.aggregate import aggregate_by_strike
+from options_analysis.chain import CALL, PUT, OptionsChain
 from options_analysis.core import Values, _normalize_val
 from options_analysis.sources.tradestation import load_tradestation_file
 
@@ -24,7 +28,7 @@ def test_normalize_val() -> None:
 def test_tradestation_parse_fixture() -> None:
     path = FIXTURES_DIR / "sample_ts_options.csv"
     result = load_tradestation_file(path)
-    assert result["ticker"] == "sample_ts_options"
+    assert result["ticker"] == "SAMPLE_TS_OPTIONS"
     assert len(result["dates"]) == 1
     assert result["dates"][0] == "01/17/25"
     assert "01/17/25" in result["big_dict"]
@@ -150,3 +154,185 @@ def test_get_opts_df_default_val_enum() -> None:
     df = opts.GetOptsDF(dates=["01/17/25"])  # default val=Values.Both
     assert df is not None
     assert not df.empty
+
+
+def test_get_opts_df_sums_across_dates() -> None:
+    """Strikes shared by several expirations are summed into one row."""
+    opts = OptsAnalysis()
+    block = {
+        "calls": pd.DataFrame({"Strike": [100.0, 110.0], "Volume": [1, 2], "OpenInt": [0, 0]}),
+        "puts": pd.DataFrame({"Strike": [90.0, 100.0], "Volume": [3, 4], "OpenInt": [0, 0]}),
+    }
+    opts.load_from_source(
+        {
+            "ticker": "T",
+            "dates": ["01/17/25", "01/24/25"],
+            "big_dict": {"01/17/25": block, "01/24/25": block},
+        }
+    )
+    df = opts.GetOptsDF(Values.Volume, dates=["01/17/25", "01/24/25"])
+    assert df is not None
+    assert list(df.index) == [90.0, 100.0, 110.0]
+    assert list(df["calls"]) == [0, 2, 4]
+    assert list(df["puts"]) == [6, 8, 0]
+    assert list(df["all"]) == [6, 10, 4]
+    assert opts.GetOptsDF(Values.Volume, dates=["99/99/99"]).empty
+
+
+def test_options_chain_columnar_layout() -> None:
+    calls = pd.DataFrame(
+        {"Strike": ["105", "100"], "Volume": ["1,000", "-"], "ImpVol": ["45.50%", "50.00%"]}
+    )
+    puts = pd.DataFrame({"Strike": [95.0], "Volume": [3], "OpenInt": [7]})
+    chain = OptionsChain.from_big_dict(
+        ["a", "b", "c"], {"c": {"calls": calls, "puts": puts}, "a": {"calls": puts, "puts": puts}}
+    )
+    assert len(chain) == 5
+    assert chain.expiries == ["a", "b", "c"]
+    assert list(chain.expiry_offsets) == [0, 2, 2, 5]
+    # within an expiry: calls before puts, each sorted by strike
+    sl = chain.expiry_slice(chain.code("c"))
+    assert list(chain.side[sl]) == [CALL, CALL, PUT]
+    assert list(chain.strike[sl]) == [100.0, 105.0, 95.0]
+    assert list(chain.volume[sl]) == [0, 1000, 3]
+    assert chain.iv is not None and chain.iv[sl][1] == 0.455
+    assert np.isnan(chain.iv[sl][2])
+    assert list(chain.strike[chain.strike_order]) == sorted(chain.strike)
+    assert list(chain.rows_for(["c", "zz", "a"])) == [2, 3, 4, 0, 1]
+
+
+def test_big_dict_view_from_chain_only() -> None:
+    calls = pd.DataFrame({"Strike": [100.0, 105.0], "Volume": [10, 20], "OpenInt": [5, 15]})
+    puts = pd.DataFrame({"Strike": [95.0], "Volume": [30], "OpenInt": [10]})
+    chain = OptionsChain.from_big_dict(["01/17/25"], {"01/17/25": {"calls": calls, "puts": puts}})
+    opts = OptsAnalysis()
+    opts.load_from_source({"ticker": "T", "dates": ["01/17/25"], "big_dict": {}, "chain": chain})
+    assert opts.Chain is chain
+    view = opts.BigDict["01/17/25"]
+    assert list(view["calls"]["Strike"]) == [100.0, 105.0]
+    assert list(view["puts"]["OpenInt"]) == [10]
+    df = opts.GetOptsDF(Values.Both, dates=["01/17/25"])
+    assert df is not None
+    assert df.loc[95, "puts"] == 40 and df.loc[105, "calls"] == 35
+
+
+def test_aggregation_cache_hits_and_invalidation() -> None:
+    calls = pd.DataFrame({"Strike": [100.0], "Volume": [1], "OpenInt": [2]})
+    puts = pd.DataFrame({"Strike": [100.0], "Volume": [3], "OpenInt": [4]})
+    source = {
+        "ticker": "T",
+        "dates": ["01/17/25"],
+        "big_dict": {"01/17/25": {"calls": calls, "puts": puts}},
+    }
+    opts = OptsAnalysis(cache_size=2)
+    opts.load_from_source(source)
+    first = opts.GetOptsDF("Volume", dates=["01/17/25"])
+    assert first is not None
+    first.loc[100, "calls"] = -1  # mutating a result must not poison the cache
+    again = opts.GetOptsDF(Values.Volume, dates=["01/17/25"])
+    assert again is not None and again.loc[100, "calls"] == 1
+    assert opts.CacheInfo()["hits"] == 1 and opts.CacheInfo()["misses"] == 1
+
+    opts.GetOptsDF(Values.OpenInt, dates=["01/17/25"])
+    opts.GetOptsDF(Values.Both, dates=["01/17/25"])
+    assert opts.CacheInfo()["size"] == 2  # LRU evicted the Volume entry
+    opts.GetOptsDF(Values.Volume, dates=["01/17/25"])
+    assert opts.CacheInfo()["misses"] == 4
+
+    bigger = pd.DataFrame({"Strike": [100.0], "Volume": [10], "OpenInt": [0]})
+    opts.load_from_source({**source, "big_dict": {"01/17/25": {"calls": bigger, "puts": puts}}})
+    assert opts.CacheInfo()["size"] == 0
+    df = opts.GetOptsDF(Values.Volume, dates=["01/17/25"])
+    assert df is not None and df.loc[100, "calls"] == 10
+
+
+def _three_expiry_opts() -> OptsAnalysis:
+    dates = ["17/01/2025", "24/01/2025", "21/02/2025"]
+    big_dict = {
+        d: {
+            "calls": pd.DataFrame(
+                {"Strike": [100.0 + i, 110.0], "Volume": [i + 1, 2], "OpenInt": [10, 0]}
+            ),
+            "puts": pd.DataFrame({"Strike": [90.0], "Volume": [0], "OpenInt": [5 * (i + 1)]}),
+        }
+        for i, d in enumerate(dates)
+    }
+    opts = OptsAnalysis()
+    opts.load_from_source({"ticker": "T", "dates": dates, "big_dict": big_dict})
+    return opts
+
+
+def test_prefix_index_matches_direct_aggregation() -> None:
+    opts = _three_expiry_opts()
+    index = opts.GetPrefixIndex()
+    for v in Values:
+        for start in range(3):
+            for stop in range(start + 1, 4):
+                dates = opts.Dates[start:stop]
+                rows = opts.Chain.rows_for(dates)
+                calls = opts.Chain.side[rows] == CALL
+                values = opts.Chain.volume[rows] * (v != Values.OpenInt) + opts.Chain.open_int[
+                    rows
+                ] * (v != Values.Volume)
+                strikes = opts.Chain.strike[rows]
+                direct = aggregate_by_strike(
+                    strikes[calls], values[calls], strikes[~calls], values[~calls]
+                )
+                got = index.aggregate(
+                    start, stop, volume=v != Values.OpenInt, open_int=v != Values.Volume
+                )
+                pd.testing.assert_frame_equal(got, direct)
+    assert index.aggregate(2, 1).empty
+
+
+def test_date_windows_by_index_and_dte() -> None:
+    opts = _three_expiry_opts()
+    assert opts.GetDatesByIndex(stop=2) == ["17/01/2025", "24/01/2025"]
+    assert opts.GetDatesByIndex(-1) == ["21/02/2025"]
+    today = date(2025, 1, 10)
+    assert opts.GetDatesByDTE(7, 14, today=today) == ["17/01/2025", "24/01/2025"]
+    assert opts.GetDatesByDTE(30, today=today) == ["21/02/2025"]
+    df = opts.GetOptsDF(Values.Volume, dates=opts.GetDatesByIndex(0, 2))
+    assert df is not None
+    assert list(df.index) == [90.0, 100.0, 101.0, 110.0]
+    assert list(df["calls"]) == [0, 1, 2, 4]
+    assert opts.GetPrefixIndex() is opts.GetPrefixIndex()
+
+
+def test_timeline_stats_matches_weighted_average() -> None:
+    dates = ["17/01/2025", "24/01/2025", "31/01/2025"]
+    calls = pd.DataFrame({"Strike": [100.0, 110.0, 120.0], "Volume": [1, 2, 1], "OpenInt": 0})
+    puts = pd.DataFrame({"Strike": [90.0, 100.0], "Volume": [3, 1], "OpenInt": 0})
+    zero = pd.DataFrame({"Strike": [100.0], "Volume": [0], "OpenInt": [0]})
+    opts = OptsAnalysis()
+    opts.load_from_source(
+        {
+            "ticker": "T",
+            "dates": dates,
+            "big_dict": {
+                dates[0]: {"calls": calls, "puts": puts},
+                dates[1]: {"calls": zero, "puts": zero},
+            },
+        }
+    )
+    df = opts.GetTimelineStats("Volume", percentiles=(0.25, 0.5))
+    assert df is not None
+    assert list(df.index) == dates[:2]  # the expiry without contracts is skipped
+    row = df.loc[dates[0]]
+    assert row["calls"] == 110.0
+    assert np.isclose(row["callsErr"], np.sqrt(50.0))
+    assert row["callsSkew"] == 0.0
+    assert row["callsP50"] == 110.0 and row["callsP25"] == 100.0
+    strikes = np.array([100.0, 110.0, 120.0, 90.0, 100.0])
+    weights = np.array([1, 2, 1, 3, 1])
+    mean_all = np.average(strikes, weights=weights)
+    assert np.isclose(row["all"], mean_all)
+    assert np.isclose(
+        row["allErr"], np.sqrt(np.average((strikes - mean_all) ** 2, weights=weights))
+    )
+    assert row["allP50"] == 100.0
+    assert row["perCalls"] == 50.0 and row["perPuts"] == 50.0
+    assert row["allTotal"] == 8
+    # zero-weight expiration: NaN stats instead of ZeroDivisionError
+    empty = df.loc[dates[1]]
+    assert np.isnan(empty["calls"]) and np.isnan(empty["allErr"]) and empty["perCalls"] == 0
@@ -0,0 +1,74 @@
+"""Tests for profiling spans and the stages emitted by OptsAnalysis."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from options_analysis import OptsAnalysis
+from shared.profiling import active_profiler, profile, profiled, span
+
+
+def test_spans_nest_and_total() -> None:
+    @profiled("work")
+    def work() -> int:
+        with span("inner", n=1):
+            return sum(range(1000))
+
+    with profile() as prof, span("outer"):
+        work()
+        work()
+    assert active_profiler() is None
+    assert [r.path for r in prof.spans][:2] == [("outer", "work", "inner"), ("outer", "work")]
+    assert prof.spans[0].attrs == {"n": 1} and prof.spans[0].peak is None
+    totals = {t.path: t for t in prof.totals()}
+    assert totals[("outer", "work")].count == 2
+    outer = totals[("outer",)]
+    assert outer.self_wall == pytest.approx(outer.wall - totals[("outer", "work")].wall)
+    assert "    inner" in prof.summary()
+
+
+def test_nothing_is_recorded_without_a_profile() -> None:
+    with span("idle"):
+        pass
+    with profile() as prof:
+        pass
+    assert prof.spans == []
+    with profile(), pytest.raises(RuntimeError, match="already active"), profile():
+        pass
+
+
+def test_memory_peak_is_per_span() -> None:
+    with profile(memory=True) as prof, span("big"):
+        block = np.ones(2_000_000)  # 16 MB
+        del block
+        with span("small"):
+            small = np.ones(1000)
+            del small
+    peaks = {r.name: r.peak for r in prof.spans}
+    assert peaks["big"] >= 16_000_000 > peaks["small"]
+
+
+def test_write_json_and_folded(tmp_path) -> None:
+    out = tmp_path / "profile.json"
+    with profile(output=out) as prof, span("a"), span("b"):
+        sum(range(10_000))
+    data = json.loads(out.read_text())
+    assert [s["path"] for s in data["spans"]] == [["a", "b"], ["a"]]
+    assert {tuple(t["path"]) for t in data["totals"]} == {("a",), ("a", "b")}
+    folded = prof.write(tmp_path / "profile.folded").read_text()
+    assert folded.splitlines()[-1].startswith("a;b ")
+
+
+def test_opts_analysis_emits_stages() -> None:
+    frame = pd.DataFrame({"Strike": [100.0, 105.0], "Volume": [1, 2], "OpenInt": [3, 4]})
+    big_dict = {"17/01/2025": {"calls": frame, "puts": frame}}
+    opts = OptsAnalysis()
+    with profile() as prof:
+        opts.load_from_source({"ticker": "XYZ", "dates": ["17/01/2025"], "big_dict": big_dict})
+        opts.GetOptsDF("Both", ["17/01/2025"])
+        opts.GetOptsDF("Both", ["17/01/2025"])  # memoized: no second aggregate
+        opts.GetTimelineStats("Both")
+    names = [r.name for r in prof.spans]
+    assert names == ["opts.build_chain", "opts.aggregate", "opts.timeline_stats"]
@@ -0,0 +1,90 @@
+"""Tests for options_analysis.report: headless stats results and static rendering."""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from options_analysis import OptsAnalysis
+from options_analysis.report import strike_figure, write_figures, write_stats_reports
+
+
+def _opts(ticker: str = "T") -> OptsAnalysis:
+    calls = pd.DataFrame({"Strike": [100.0, 110.0], "Volume": [1, 3], "OpenInt": [0, 0]})
+    puts = pd.DataFrame({"Strike": [90.0, 100.0], "Volume": [2, 0], "OpenInt": [0, 0]})
+    opts = OptsAnalysis()
+    opts.load_from_source(
+        {
+            "ticker": ticker,
+            "dates": ["17/01/2025"],
+            "big_dict": {"17/01/2025": {"calls": calls, "puts": puts}},
+        }
+    )
+    return opts
+
+
+def test_stats_plot_returns_result_without_plotting(capsys) -> None:
+    opts = _opts()
+    df = opts.GetOptsDF("Volume", dates=["17/01/2025"])
+    result = opts.StatsPlot(stats=True, plot=False, val="Volume", dates=["17/01/2025"], opts_df=df)
+    assert result is not None
+    calls = result.sides["calls"]
+    assert calls.total == 4 and calls.share == round(100 * 4 / 6, 2)
+    assert np.isclose(calls.mean, np.average([100.0, 110.0], weights=[1, 3]))
+    assert np.isclose(
+        result.sides["all"].std, np.sqrt(np.cov([90, 90, 100, 110, 110, 110], bias=True))
+    )
+    assert result.sides["all"].share is None
+    assert result.expiration_label == "All Expiration Dates"
+    pd.testing.assert_frame_equal(result.to_frame(), df, check_dtype=False)
+    out = capsys.readouterr().out
+    assert "---- T Options Volume Stats ----" in out
+    assert "Calls:\t4 | Mean = 107.50 | STD = ±4.33 | 66.67%" in out
+
+
+def test_get_strike_stats_handles_zero_weight() -> None:
+    result = _opts().GetStrikeStats("OpenInt")
+    assert result is not None
+    assert result.sides["all"].total == 0
+    assert np.isnan(result.sides["calls"].mean) and np.isnan(result.sides["calls"].share)
+
+
+def test_write_figures_shares_plotly_js(tmp_path) -> None:
+    stats = [_opts(t).GetStrikeStats("Volume") for t in ("AAA", "BBB", "AAA")]
+    per_ticker = write_stats_reports(stats, tmp_path / "pages")
+    assert [p.name for p in per_ticker] == ["plotly.min.js", "AAA.html", "BBB.html", "AAA_2.html"]
+    page = (tmp_path / "pages" / "AAA.html").read_text()
+    assert 'src="plotly.min.js"' in page
+    assert len(page) < 100_000  # the bundle is not embedded
+
+    combined = write_figures(
+        {"AAA": strike_figure(stats[0]), "BBB": strike_figure(stats[1])},
+        tmp_path / "combined",
+        combined=True,
+    )
+    assert [p.name for p in combined] == ["plotly.min.js", "report.html"]
+    text = combined[1].read_text()
+    assert text.count("Plotly.newPlot") == 2 and "<h2>BBB</h2>" in text
+
+
+def test_write_figures_keeps_names_that_sanitize_alike(tmp_path) -> None:
+    fig = strike_figure(_opts().GetStrikeStats("Volume"))
+    names = ["PLTR 01/17/25", "PLTR 01:17:25", "pltr 01_17_25"]
+    written = write_figures(dict.fromkeys(names, fig), tmp_path)
+    assert [p.name for p in written[1:]] == [
+        "PLTR_01_17_25.html",
+        "PLTR_01_17_25_2.html",
+        "pltr_01_17_25_3.html",
+    ]
+
+
+def test_stats_are_headless() -> None:
+    # Computing stats must not need plotly at all
+    saved = {k: v for k, v in sys.modules.items() if k == "plotly" or k.startswith("plotly.")}
+    for k in saved:
+        del sys.modules[k]
+    try:
+        assert _opts().GetStrikeStats("Volume") is not None
+        assert "plotly.graph_objects" not in sys.modules
+    finally:
+        sys.modules.update(saved)
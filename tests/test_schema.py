@@ -0,0 +1,62 @@
+"""Tests for options_analysis.schema: typed columns and parse-failure counts at ingestion."""
+
+import numpy as np
+import pandas as pd
+
+from options_analysis import OptsAnalysis
+from options_analysis.schema import normalize_big_dict, normalize_frame, parse_numeric
+from options_analysis.sources.base import build_source_result
+
+
+def test_parse_numeric_text_forms() -> None:
+    values, failures = parse_numeric(["1,234", "-", "1.5K", "2M", "45.3%", "abc", None, " 7 ", ""])
+    expected = [1234, np.nan, 1500, 2e6, 0.453, np.nan, np.nan, 7, np.nan]
+    assert np.allclose(values, expected, equal_nan=True)
+    assert failures == 1
+
+
+def test_parse_numeric_numeric_passthrough() -> None:
+    values, failures = parse_numeric(pd.Series([1, 2, 3]))
+    assert values.dtype == np.float64 and failures == 0
+
+
+def test_normalize_frame_yahoo_strings() -> None:
+    raw = pd.DataFrame(
+        {
+            "Contract Name": ["X1", "X2", "X3"],
+            "Strike": ["1,000.00", "1,010.00", "1,020.00"],
+            "Last Price": ["12.5", "-", "3"],
+            "Volume": ["1.2K", "-", "oops"],
+            "Open Interest": ["3,400", "12", "0"],
+            "Implied Volatility": ["45.30%", "50.00%", "0.00%"],
+        }
+    )
+    df, failures = normalize_frame(raw)
+    assert df["Strike"].dtype == np.float64 and df["Strike"].iloc[1] == 1010.0
+    assert df["Volume"].dtype == np.int64 and list(df["Volume"]) == [1200, 0, 0]
+    assert list(df["OpenInt"]) == [3400, 12, 0]
+    assert np.isclose(df["ImpVol"].iloc[0], 0.453)
+    assert np.isnan(df["Last"].iloc[1])
+    assert df["Contract Name"].tolist() == ["X1", "X2", "X3"]
+    assert failures == {"Volume": 1}
+
+
+def test_normalize_frame_yfinance_columns_and_missing_counts() -> None:
+    raw = pd.DataFrame({"strike": [10.0, 12.5], "volume": [np.nan, 4.0], "bid": [0.1, 0.2]})
+    df, failures = normalize_frame(raw)
+    assert {"Strike", "Volume", "OpenInt", "Bid"} <= set(df.columns)
+    assert list(df["Volume"]) == [0, 4] and list(df["OpenInt"]) == [0, 0]
+    assert failures == {}
+
+
+def test_source_result_records_failures_and_types() -> None:
+    calls = pd.DataFrame({"Strike": ["100", "x"], "Volume": ["5", "n/a"], "OpenInt": ["1", "?"]})
+    typed, failures = normalize_big_dict({"d": {"calls": calls, "puts": calls}})
+    assert failures == {"Strike": 2, "OpenInt": 2}
+    assert typed["d"]["puts"]["Volume"].dtype == np.int64
+
+    opts = OptsAnalysis()
+    opts.load_from_source(build_source_result("T", ["d"], {"d": {"calls": calls}}))
+    assert opts.ParseFailures == {"Strike": 1, "OpenInt": 1}
+    assert len(opts.Chain) == 1  # the unparsable strike is not a contract
+    assert opts.BigDict["d"]["calls"]["Volume"].dtype == np.int64
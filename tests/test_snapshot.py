@@ -0,0 +1,78 @@
+"""Tests for options_analysis.snapshot: round trips and memory-mapped lazy reads."""
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from options_analysis import OptsAnalysis
+from options_analysis.snapshot import SnapshotStore
+from options_analysis.sources.base import build_source_result
+
+DATES = ["17/01/2025", "24/01/2025", "31/01/2025"]
+
+
+def _result(scale: int = 1):
+    big_dict = {
+        d: {
+            "calls": pd.DataFrame(
+                {"Strike": [90.0, 100.0, 110.0], "Volume": [i, 2 * scale, 3], "OpenInt": [5, 6, 7]}
+            ),
+            "puts": pd.DataFrame(
+                {"Strike": [95.0, 100.0], "Volume": [4, scale], "OpenInt": [1, 1], "ImpVol": 0.3}
+            ),
+        }
+        for i, d in enumerate(DATES)
+    }
+    return build_source_result("abc", DATES, big_dict)
+
+
+def test_snapshot_round_trip_is_memory_mapped(tmp_path) -> None:
+    store = SnapshotStore(tmp_path)
+    t0 = datetime(2025, 1, 10, 15, 30, tzinfo=UTC)
+    store.save(_result(), captured_at=t0)
+    store.save(_result(scale=10), captured_at=datetime(2025, 1, 10, 16, 0, tzinfo=UTC))
+    assert store.tickers() == ["ABC"]
+    assert store.captures("abc")[0] == t0 and len(store.captures("abc")) == 2
+
+    reopened = store.open("abc", t0)
+    chain = reopened["chain"]
+    assert chain.mapped and isinstance(chain.volume, np.memmap)
+    original = _result()["chain"]
+    for name, values in original.columns().items():
+        np.testing.assert_array_equal(getattr(chain, name), values, err_msg=name)
+    assert reopened["dates"] == DATES
+
+    latest = store.open("ABC")  # newest capture by default
+    assert int(latest["chain"].volume.sum()) > int(chain.volume.sum())
+
+    with pytest.raises(FileExistsError):
+        store.save(_result(), captured_at=t0)
+    with pytest.raises(FileNotFoundError):
+        store.open("XYZ")
+
+
+def test_opts_analysis_on_snapshot_matches_fresh_load(tmp_path) -> None:
+    fresh = OptsAnalysis()
+    fresh.load_from_source(_result())
+    path = fresh.SaveSnapshot(tmp_path, captured_at=datetime(2025, 1, 10, 15, 30))
+    assert path.parent.name == "ABC"
+
+    opts = OptsAnalysis()
+    opts.BuildFromSnapshot(tmp_path, "ABC")
+    assert opts.GetExpirationDates() == DATES
+    for dates in (DATES[:1], DATES[1:], DATES):
+        pd.testing.assert_frame_equal(opts.GetOptsDF("Both", dates), fresh.GetOptsDF("Both", dates))
+    # Windows are answered from the queried expiries, without an index over the whole file
+    assert opts._prefix is None
+    block = opts.BigDict["24/01/2025"]
+    pd.testing.assert_frame_equal(block["puts"], fresh.BigDict["24/01/2025"]["puts"])
+    assert list(opts.BigDict) == DATES
+
+
+def test_empty_snapshot(tmp_path) -> None:
+    store = SnapshotStore(tmp_path)
+    store.save(build_source_result("E", [], {}), captured_at=datetime(2025, 1, 1))
+    result = store.open("E")
+    assert len(result["chain"]) == 0 and len(result["big_dict"]) == 0
@@ -0,0 +1,168 @@
+"""Tests for the source protocol, registry and the composite (fan-out) source."""
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from options_analysis import OptsAnalysis
+from options_analysis.sources import (
+    CompositeSource,
+    OptionsSource,
+    ThreadedSource,
+    YFinanceSource,
+    create_source,
+    register_source,
+    source_names,
+)
+from options_analysis.sources.base import build_source_result
+from options_analysis.sources.lazy import LazyExpiries
+
+
+def _result(dates: list[str], loaded: list[str] | None = None, volume: int = 1):
+    big_dict = {
+        d: {
+            side: pd.DataFrame({"Strike": [100.0], "Volume": [volume], "OpenInt": [1]})
+            for side in ("calls", "puts")
+        }
+        for d in (dates if loaded is None else loaded)
+    }
+    return build_source_result("ABC", dates, big_dict)
+
+
+class _Stub(ThreadedSource):
+    """Blocking stand-in source: sleeps, then returns its result or raises."""
+
+    def __init__(self, name: str, delay: float, result=None, error: str = "") -> None:
+        self.name = name
+        self.delay = delay
+        self.result = result
+        self.error = error
+        self.started = threading.Event()
+
+    def fetch(self, key: str):
+        self.started.set()
+        time.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return self.result
+
+
+DATES = ["17/01/2025", "24/01/2025"]
+
+
+def test_fastest_complete_result_wins() -> None:
+    slow = _Stub("yahoo", 2.0, _result(DATES, volume=2))
+    fast = _Stub("yfinance", 0.05, _result(DATES))
+    composite = CompositeSource([slow, fast])
+    start = time.monotonic()
+    result = composite.fetch("ABC")
+    assert time.monotonic() - start < 1.0  # the slow source is not waited for
+    assert result["source"] == "yfinance"
+    assert composite.stats["yfinance"].wins == 1 and composite.stats["yfinance"].ok == 1
+    assert composite.stats["yahoo"].cancelled == 1 and slow.started.is_set()
+
+
+def test_failures_and_partial_results_fall_back() -> None:
+    broken = _Stub("yfinance", 0.0, error="throttled")
+    partial = _Stub("yahoo", 0.05, _result(DATES, loaded=DATES[:1]))
+    composite = CompositeSource([broken, partial])
+    result = composite.fetch("ABC")
+    assert result["source"] == "yahoo" and list(result["big_dict"]) == DATES[:1]
+    stats = composite.stats["yfinance"]
+    assert stats.failed == 1 and stats.last_error == "RuntimeError: throttled"
+
+    with pytest.raises(RuntimeError, match="Every source failed"):
+        CompositeSource([broken, _Stub("b", 0.0, error="down")]).fetch("ABC")
+
+
+def test_merge_mode_unions_expirations() -> None:
+    first = _Stub("a", 0.0, _result(DATES[1:], volume=1))
+    second = _Stub("b", 0.02, _result(["10/01/2025", *DATES[1:]], volume=5))
+    result = CompositeSource([first, second], mode="merge").fetch("ABC")
+    assert result["dates"] == ["10/01/2025", "24/01/2025"]
+    assert result["source"] == "a+b"
+    assert result["big_dict"]["24/01/2025"]["calls"]["Volume"].tolist() == [1]  # a wins
+
+
+def test_timeout_bounds_each_source() -> None:
+    hung = _Stub("hung", 5.0, _result(DATES))
+    composite = CompositeSource([hung, _Stub("ok", 0.3, _result(DATES))], timeout=0.1)
+    with pytest.raises(RuntimeError):
+        composite.fetch("ABC")
+    assert (
+        composite.stats["hung"].failed == 1 and "TimeoutError" in composite.stats["hung"].last_error
+    )
+
+
+def test_fetch_works_inside_a_running_loop() -> None:
+    composite = CompositeSource([_Stub("a", 0.0, _result(DATES))])
+
+    async def notebook_cell():
+        return composite.fetch("ABC")  # e.g. Jupyter, where a loop is already running
+
+    assert asyncio.run(notebook_cell())["source"] == "a"
+
+
+def _lazy_result(delay: float, failing: tuple[str, ...] = ()):
+    def fetch(date: str) -> dict[str, pd.DataFrame]:
+        time.sleep(delay)
+        if date in failing:
+            raise RuntimeError("throttled")
+        return _result(DATES)["big_dict"][date]
+
+    return {"ticker": "ABC", "dates": DATES, "big_dict": LazyExpiries(DATES, fetch)}
+
+
+def test_lazy_results_compete_on_loaded_expiries() -> None:
+    partial = _Stub("yfinance", 0.0, _lazy_result(0.0, failing=(DATES[1],)))
+    complete = _Stub("yahoo", 0.3, _result(DATES))
+    result = CompositeSource([partial, complete]).fetch("ABC")
+    assert result["source"] == "yahoo"
+
+    start = time.monotonic()
+    lazy = _Stub("yfinance", 0.0, _lazy_result(0.3))
+    merged = CompositeSource([lazy], mode="merge").fetch("ABC")
+    assert list(merged["big_dict"]) == DATES
+    assert time.monotonic() - start < 0.55  # the two expiries were fetched together
+
+
+def test_threaded_source_without_fetch_cannot_be_built() -> None:
+    class NoFetch(ThreadedSource):
+        name = "nofetch"
+
+    with pytest.raises(TypeError, match="fetch"):
+        NoFetch()  # type: ignore[abstract]
+
+
+def test_registry_and_build_from_source() -> None:
+    assert {"tradestation", "yahoo", "yfinance"} <= set(source_names())
+    source = create_source("yfinance", lazy=True)
+    assert isinstance(source, YFinanceSource) and source.lazy
+    assert isinstance(source, OptionsSource)
+    composite = create_source("yfinance+yahoo", mode="merge")
+    assert isinstance(composite, CompositeSource) and list(composite.sources) == [
+        "yfinance",
+        "yahoo",
+    ]
+    lazy = create_source("yfinance+yahoo", mode="merge", lazy=True, verbose=False)
+    assert isinstance(lazy, CompositeSource) and lazy.mode == "merge"
+    parts = list(lazy.sources.values())
+    assert parts[0].lazy and not parts[1].verbose  # type: ignore[attr-defined]
+    with pytest.raises(TypeError, match="'colour'"):
+        create_source("yfinance+yahoo", colour="red")
+    with pytest.raises(ValueError, match="Unknown source"):
+        create_source("nope")
+
+    register_source("stub-test", lambda: _Stub("stub", 0.0, _result(DATES)), replace=True)
+    with pytest.raises(ValueError, match="already registered"):
+        register_source("stub-test", lambda: _Stub("stub", 0.0, _result(DATES)))
+    opts = OptsAnalysis()
+    opts.BuildFromSource("stub-test", "ABC")
+    assert opts.Dates == DATES
+
+    opts = OptsAnalysis()
+    asyncio.run(opts.BuildFromSourceAsync(_Stub("s", 0.0, _result(DATES[:1])), "ABC"))
+    assert opts.Dates == DATES[:1]
@@ -0,0 +1,68 @@
+"""Tests for StockData day partitioning and correlation."""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from stock_data import DayIndex, StockData
+
+DAYS = ["01/06/2025", "01/07/2025", "01/08/2025"]
+
+
+def _write(path, seed: int, dates: list[str]) -> None:
+    rng = np.random.default_rng(seed)
+    rows = []
+    for date in dates:
+        for minute in range(5):
+            price = 100 + rng.normal()
+            rows.append([date, f"16:3{minute}", price, price + 1, price - 1, price + 0.5, 10])
+    frame = pd.DataFrame(rows, columns=["Date", "Time", "Open", "High", "Low", "Close", "Vol"])
+    frame.to_csv(path, index=False)
+
+
+def _masked(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """The per-date boolean mask split the day index replaced."""
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"], format="%m/%d/%Y").dt.strftime("%d/%m/%Y")
+    return {k: df.loc[df["Date"] == k] for k in dict.fromkeys(df["Date"])}
+
+
+def test_dates_dict_matches_mask_split(tmp_path) -> None:
+    _write(tmp_path / "XYZ_1min.csv", 0, DAYS)
+    _write(tmp_path / "REF_1min.csv", 1, DAYS[1:])
+    data = StockData("XYZ", "REF", data_dir=tmp_path)
+    expected = _masked(data.ticker_df)
+    assert list(data.ticker_dates_dict) == ["06/01/2025", "07/01/2025", "08/01/2025"]
+    for key, frame in expected.items():
+        pd.testing.assert_frame_equal(data.ticker_dates_dict[key], frame, check_dtype=False)
+    pd.testing.assert_frame_equal(
+        data.day("07/01/2025", ref=True), data.refticker_dates_dict["07/01/2025"]
+    )
+    assert "06/01/2025" not in data.refticker_dates_dict
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        corr = data.correlation_with_ref(date_analysis=False, plot=False)
+    assert list(corr) == ["07/01/2025", "08/01/2025"]
+    ref = _masked(data.refticker_df)
+    for key, value in corr.items():
+        a, b = expected[key], ref[key]
+        avg1 = (a["Open"] + a["Close"] + a["Low"] + a["High"]) / 4
+        avg2 = (b["Open"] + b["Close"] + b["Low"] + b["High"]) / 4
+        np.testing.assert_equal(value, float(avg1.corr(avg2)))  # NaN where the rows do not align
+
+
+def test_day_index_sorts_out_of_order_days_and_skips_bad_dates() -> None:
+    df = pd.DataFrame(
+        {
+            "Date": ["01/07/2025", "01/06/2025", "bad", "01/07/2025", "01/06/2025"],
+            "Close": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+    days = DayIndex(df)
+    assert days.keys == ["06/01/2025", "07/01/2025"]
+    assert days.offsets.tolist() == [0, 2, 4]
+    assert days.day("06/01/2025")["Close"].tolist() == [2.0, 5.0]  # file order within a day
+    assert days.day("07/01/2025")["Date"].tolist() == ["07/01/2025"] * 2
+    assert len(DayIndex(df.iloc[:0])) == 0
@@ -0,0 +1,71 @@
+"""Tests for the TradeStation file loader: vectorized block split and chunked streaming."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from options_analysis.sources.tradestation import iter_tradestation_csv, load_tradestation_file
+
+EXPORT = """Options export,,,,,,,,,
+Pos,Bid,Ask,Volume,Open Int,Strike,Strike,Bid,Ask,Volume
+Jan 17 25\t(3 days),,,,,,,,,
+,1.10,1.20,"1,200",3.4K,100,100,0.40,0.50,15
+Pos,n/a,0.85,7,10,105,105,0.90,1.00,-
+,,,,,,,,,
+Jan 24 25,,,,,,,,,
+,2.00,2.10,5,1,100,100,1.00,1.10,9
+,1.50,1.60,bad,2,110,110,2.00,2.10,3
+Feb 21 25,,,,,,,,,
+,3.00,3.10,8,4,95,95,0.20,0.30,1
+"""
+
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / "xyz.csv"
+    path.write_text(EXPORT)
+    return path
+
+
+def test_single_pass_loader_builds_typed_chain(export) -> None:
+    result = load_tradestation_file(export)
+    assert result["ticker"] == "XYZ"
+    assert result["dates"] == ["Jan 17 25", "Jan 24 25", "Feb 21 25"]
+    assert result["parse_failures"] == {"Volume": 1}  # "bad"; n/a and - are missing
+    chain = result["chain"]
+    assert len(chain) == 10 and chain.iv is None
+    calls = result["big_dict"]["Jan 17 25"]["calls"]
+    assert calls["Strike"].tolist() == [100.0, 105.0]
+    assert calls["Volume"].tolist() == [1200, 7] and calls["OpenInt"].tolist() == [3400, 10]
+    assert np.isnan(calls["Bid"].iloc[1])
+    puts = result["big_dict"]["Jan 17 25"]["puts"]
+    assert puts["Volume"].tolist() == [15, 0] and "OpenInt" in puts.columns
+    assert puts["OpenInt"].tolist() == [0, 0]  # puts side has no open interest column
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 4, 100])
+def test_chunked_load_matches_full_load(export, chunksize: int) -> None:
+    full = load_tradestation_file(export)
+    chunked = load_tradestation_file(export, chunksize=chunksize)
+    assert chunked["dates"] == full["dates"]
+    assert chunked["parse_failures"] == full["parse_failures"]
+    for name, values in full["chain"].columns().items():
+        np.testing.assert_array_equal(chunked["chain"].columns()[name], values)
+
+
+def test_streaming_yields_one_expiration_at_a_time(export) -> None:
+    full = load_tradestation_file(export)
+    streamed = list(iter_tradestation_csv(export, chunksize=2))
+    assert [date for date, _ in streamed] == full["dates"]
+    for date, block in streamed:
+        for side in ("calls", "puts"):
+            pd.testing.assert_frame_equal(block[side], full["big_dict"][date][side])
+
+
+def test_missing_strike_header_is_rejected(tmp_path) -> None:
+    path = tmp_path / "bad.csv"
+    path.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError, match="strike"):
+        load_tradestation_file(path)
+    with pytest.raises(ValueError, match="strike"):
+        list(iter_tradestation_csv(path))
@@ -0,0 +1,166 @@
+"""Tests for the Yahoo HTML scrape source against a stand-in session (no network)."""
+
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+
+from options_analysis import OptsAnalysis
+from options_analysis.sources.fetch import RetryPolicy
+from options_analysis.sources.yahoo_scrape import (
+    YahooScrapeSource,
+    _fast_tables,
+    _soup_tables,
+    load_yahoo_scrape,
+    parse_options_tables,
+)
+from shared.http_cache import HttpCache
+
+DATES_PAGE = b"""<html><select>
+<option value="1737072000">January 17, 2025</option>
+<option value="1737676800">January 24, 2025</option>
+<option value="1738281600">January 31, 2025</option>
+<option value="">Pick one</option>
+</select></html>"""
+
+CHAIN_PAGE = b"""<html>
+<table class="calls W(100%)"><thead><tr><th>Strike</th><th>Volume</th><th>Open Interest</th>
+<th>Implied Volatility</th></tr></thead>
+<tbody><tr><td>100.00</td><td>1,200</td><td>3.4K</td><td>45.00%</td></tr>
+<tr><td>110.00</td><td>-</td><td>7</td><td>50.00%</td></tr></tbody></table>
+<table class="puts W(100%)"><thead><tr><th>Strike</th><th>Volume</th><th>Open Interest</th>
+</tr></thead><tbody><tr><td>90.00</td><td>5</td><td>6</td></tr></tbody></table>
+</html>"""
+
+
+class _StandInSession:
+    """Answers Yahoo URLs from memory; 24 Jan is throttled once, 31 Jan is missing."""
+
+    def __init__(self) -> None:
+        self.urls: list[str] = []
+        self.timeouts: set[float | None] = set()
+        self.active = 0
+        self.peak = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def get(
+        self, url: str, timeout: float | None = None, headers: dict[str, str] | None = None
+    ) -> SimpleNamespace:
+        with self._lock:
+            self.urls.append(url)
+            self.timeouts.add(timeout)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            throttled = url.endswith("1737676800") and self.urls.count(url) == 1
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        if throttled:
+            return SimpleNamespace(ok=False, status_code=429, reason="Too Many Requests")
+        if url.endswith("1738281600"):
+            return SimpleNamespace(ok=False, status_code=404, reason="Not Found")
+        content = CHAIN_PAGE if "?date=" in url else DATES_PAGE
+        return SimpleNamespace(ok=True, status_code=200, reason="OK", content=content, headers={})
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_scrape_uses_shared_session_and_reports_errors(capsys) -> None:
+    session = _StandInSession()
+    result = load_yahoo_scrape(
+        "pltr",
+        verbose=False,
+        session=session,
+        max_workers=2,
+        timeout=3.0,
+        retry=RetryPolicy(max_attempts=2, base_delay=0.0),
+        limiter=None,
+    )
+    assert capsys.readouterr().out == ""
+    assert result["dates"] == ["17/01/2025", "24/01/2025", "31/01/2025"]
+    assert list(result["big_dict"]) == ["17/01/2025", "24/01/2025"]
+    log = {r["key"]: r for r in result["fetch_log"]}
+    assert log["24/01/2025"]["status"] == "ok" and log["24/01/2025"]["attempts"] == 2
+    assert log["31/01/2025"]["status"] == "error"
+    assert "404 Not Found" in log["31/01/2025"]["error"]
+    assert session.peak <= 2 and session.timeouts == {3.0}
+    assert not session.closed  # caller-owned sessions stay open
+
+    calls = result["big_dict"]["17/01/2025"]["calls"]
+    assert calls["Volume"].tolist() == [1200, 0] and calls["OpenInt"].tolist() == [3400, 7]
+    assert calls["ImpVol"].tolist() == [0.45, 0.5]
+
+
+def test_source_keeps_session_across_tickers(monkeypatch) -> None:
+    import options_analysis.sources.yahoo_scrape as yahoo_scrape
+
+    made: list[_StandInSession] = []
+
+    def fake_make_session(pool_size: int = 8) -> _StandInSession:
+        made.append(_StandInSession())
+        return made[-1]
+
+    monkeypatch.setattr(yahoo_scrape, "make_session", fake_make_session)
+    source = YahooScrapeSource(
+        verbose=False, retry=RetryPolicy(max_attempts=2, base_delay=0.0), limiter=None
+    )
+    opts = OptsAnalysis()
+    opts.load_from_source(source.fetch("AAA"))
+    opts.load_from_source(source.fetch("BBB"))
+    assert len(made) == 1
+    assert [r["status"] for r in opts.FetchLog] == ["ok", "ok", "error"]
+
+
+def test_rerun_is_served_from_http_cache(tmp_path) -> None:
+    retry = RetryPolicy(max_attempts=2, base_delay=0.0)
+    cache = HttpCache(tmp_path)
+    first = _StandInSession()
+    load_yahoo_scrape("pltr", False, first, retry=retry, limiter=None, cache=cache)
+    assert len(first.urls) == 6  # dates page, 17 Jan, 24 and 31 Jan twice
+
+    second = _StandInSession()
+    result = load_yahoo_scrape("pltr", False, second, retry=retry, limiter=None, cache=cache)
+    # Only the page that failed (never cached) is requested again
+    assert {u[-10:] for u in second.urls} == {"1738281600"}
+    statuses = [r["status"] for r in result["fetch_log"]]
+    assert statuses == ["cached", "cached", "error"]
+    assert list(result["big_dict"]) == ["17/01/2025", "24/01/2025"]
+
+    offline = load_yahoo_scrape(
+        "pltr", False, _StandInSession(), cache=HttpCache(tmp_path, offline=True)
+    )
+    assert [r["status"] for r in offline["fetch_log"]] == ["cached", "cached", "error"]
+    assert "offline" in offline["fetch_log"][2]["error"]
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "yahoo"
+
+
+def test_fast_tables_match_beautifulsoup() -> None:
+    content = (FIXTURES / "options_pltr.html").read_bytes()
+    fast = _fast_tables(content)
+    assert fast is not None
+    soup = _soup_tables(content)
+    for side in ("calls", "puts"):
+        pd.testing.assert_frame_equal(fast[side], soup[side])
+    assert len(fast["calls"]) == 160 and len(fast["puts"]) == 160
+
+
+def test_unrecognized_pages_fall_back_to_beautifulsoup() -> None:
+    content = (FIXTURES / "options_latin1.html").read_bytes()
+    assert _fast_tables(content) is None
+    tables = parse_options_tables(content)
+    assert len(tables["calls"]) == 2 and len(tables["puts"]) == 1
+
+
+def test_fast_tables_skip_comments_and_scripts() -> None:
+    page = CHAIN_PAGE.replace(
+        b"<html>", b"<html><!-- <table class='calls'></table> --><script>'<table>'</script>"
+    )
+    fast = _fast_tables(page)
+    assert fast is not None
+    pd.testing.assert_frame_equal(fast["calls"], _soup_tables(CHAIN_PAGE)["calls"])